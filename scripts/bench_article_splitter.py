@@ -0,0 +1,204 @@
+"""
+Article splitting benchmark and golden-output check: the single-pass splitter
+(every block rendered once, chunks assembled from the fragments) vs the previous
+implementation, which serialized the article, re-rendered tables and lists to
+size them and serialized each group again through a temporary Article.
+
+Articles are grouped from rag_docs/*.json. Besides the production chunk size,
+smaller limits are run so that most articles take the multi-chunk path. Every
+chunk must be identical (text and metadata); the report also records a digest
+of the production chunk texts so later changes can be compared against it.
+
+Usage:
+    python -m scripts.bench_article_splitter --output reports/article_splitter.md
+"""
+import argparse
+import hashlib
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from src.chunkers.article_chunker import MAX_CHUNK_SIZE, ArticleGrouper, ArticleSerializer, ArticleSplitter
+from src.chunkers.models import Article, Block, Chunk, HeadingBlock, ListBlock, ParagraphBlock, TableBlock
+from src.scrapers.doc_scraper import load_structured_documents
+
+
+class LegacyArticleSerializer(ArticleSerializer):
+    """The serializer replaced by the fragment-based one, kept as reference."""
+
+    def serialize_article(self, article: Article) -> str:
+        lines = []
+        if article.article_title:
+            lines.append(f"Article {article.article_number} – {article.article_title}")
+        else:
+            lines.append(f"Article {article.article_number}")
+        if article.section_title:
+            lines.append(f"Section: {article.section_title}")
+        lines.append(f"Source: {article.source}")
+        lines.append("")
+        for block in article.blocks:
+            if isinstance(block, ParagraphBlock):
+                lines.append(block.text)
+                lines.append("")
+            elif isinstance(block, HeadingBlock):
+                lines.append(f"## {block.text}")
+                lines.append("")
+            elif isinstance(block, TableBlock):
+                table_text = self._render_table(block)
+                if table_text:
+                    lines.append(table_text)
+                    lines.append("")
+            elif isinstance(block, ListBlock):
+                list_text = self._render_list(block)
+                if list_text:
+                    lines.append(list_text)
+                    lines.append("")
+        return "\n".join(lines).strip()
+
+    def get_article_header(self, article: Article) -> str:
+        lines = []
+        if article.article_title:
+            lines.append(f"Article {article.article_number} – {article.article_title}")
+        else:
+            lines.append(f"Article {article.article_number}")
+        if article.section_title:
+            lines.append(f"Section: {article.section_title}")
+        lines.append(f"Source: {article.source}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+class LegacyArticleSplitter(ArticleSplitter):
+    """The three-serialization splitter, kept as reference."""
+
+    def __init__(self, max_chunk_size: int = MAX_CHUNK_SIZE):
+        super().__init__(max_chunk_size=max_chunk_size)
+        self.serializer = LegacyArticleSerializer()
+
+    def _legacy_groups(self, article: Article) -> List[List[Block]]:
+        groups: List[List[Block]] = []
+        current_group: List[Block] = []
+        current_size = 0
+        header_size = len(self.serializer.get_article_header(article))
+        for block in article.blocks:
+            if isinstance(block, ParagraphBlock):
+                block_size = len(block.text) + 2
+            elif isinstance(block, TableBlock):
+                block_size = len(self.serializer._render_table(block)) + 2
+            elif isinstance(block, ListBlock):
+                block_size = len(self.serializer._render_list(block)) + 2
+            elif isinstance(block, HeadingBlock):
+                block_size = len(block.text) + 5
+            else:
+                block_size = 0
+            if header_size + current_size + block_size > self.max_chunk_size and current_group:
+                groups.append(current_group)
+                current_group = []
+                current_size = 0
+            current_group.append(block)
+            current_size += block_size
+        if current_group:
+            groups.append(current_group)
+        return groups
+
+    def split_article(self, article: Article) -> List[Chunk]:
+        full_text = self.serializer.serialize_article(article)
+        if len(full_text) <= self.max_chunk_size:
+            return [Chunk(
+                text=full_text,
+                article_number=article.article_number,
+                article_title=article.article_title,
+                source=article.source,
+                document_title=article.document_title,
+                section_title=article.section_title,
+                chunk_index=0,
+                total_chunks=1,
+                contains_table=any(isinstance(b, TableBlock) for b in article.blocks),
+            )]
+        groups = self._legacy_groups(article)
+        chunks = []
+        for i, group in enumerate(groups):
+            temp_article = Article(
+                article_number=article.article_number,
+                article_title=article.article_title,
+                blocks=group,
+                source=article.source,
+                document_title=article.document_title,
+            )
+            chunks.append(Chunk(
+                text=self.serializer.serialize_article(temp_article),
+                article_number=article.article_number,
+                article_title=article.article_title,
+                source=article.source,
+                document_title=article.document_title,
+                section_title=article.section_title,
+                chunk_index=i,
+                total_chunks=len(groups),
+                contains_table=any(isinstance(b, TableBlock) for b in group),
+            ))
+        return chunks
+
+
+def load_articles(input_dir: str) -> List[Article]:
+    grouper = ArticleGrouper()
+    return [article for doc in load_structured_documents(input_dir) for article in grouper.group_into_articles(doc)]
+
+
+def time_splitter(splitter: ArticleSplitter, articles: List[Article], repeat: int) -> Tuple[float, List[Chunk]]:
+    best = float("inf")
+    chunks: List[Chunk] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = [chunk for article in articles for chunk in splitter.split_article(article)]
+        best = min(best, time.perf_counter() - start)
+    return best, chunks
+
+
+def digest(chunks: List[Chunk]) -> str:
+    h = hashlib.sha256()
+    for chunk in chunks:
+        h.update(chunk.text.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()[:16]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="reports/article_splitter.md")
+    parser.add_argument("--input-dir", default="rag_docs/")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[MAX_CHUNK_SIZE, 800, 400, 200])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    articles = load_articles(args.input_dir)
+    lines = [
+        "# Article splitting report",
+        "",
+        f"{len(articles)} articles from {args.input_dir}. Best of {args.repeat} runs.",
+        "",
+        "| Max chunk size | Chunks | Multi-chunk articles | Previous | Single-pass | Speedup | Identical | Digest |",
+        "|---|---|---|---|---|---|---|---|",
+    ]
+    all_identical = True
+    for size in args.sizes:
+        old_s, old_chunks = time_splitter(LegacyArticleSplitter(max_chunk_size=size), articles, args.repeat)
+        new_s, new_chunks = time_splitter(ArticleSplitter(max_chunk_size=size), articles, args.repeat)
+        identical = old_chunks == new_chunks
+        all_identical &= identical
+        multi = sum(1 for chunk in new_chunks if chunk.chunk_index == 1)
+        lines.append(
+            f"| {size} | {len(new_chunks)} | {multi} | {old_s * 1000:.1f} ms | {new_s * 1000:.1f} ms | "
+            f"{old_s / new_s:.2f}x | {'yes' if identical else 'NO'} | `{digest(new_chunks)}` |"
+        )
+
+    report = "\n".join(lines) + "\n"
+    path = Path(args.output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report, encoding="utf-8")
+    print(report)
+    if not all_identical:
+        raise SystemExit("Chunk output differs from the previous splitter")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Cold-start benchmark for the EMU RAG API.
+
+Measures:
+  1. Import time of src.api.main, broken down per module (python -X importtime)
+  2. Model load time for the dense, sparse and (optional) reranker models
+  3. Time for a fresh uvicorn process to answer /health/live, /health/ready
+     and (optionally) its first /api/v1/rag/ask request
+
+Usage:
+    python -m scripts.bench_cold_start --output reports/cold_start.md
+    python -m scripts.bench_cold_start --ask "What is the minimum CGPA?"
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+
+def measure_imports(module: str = "src.api.main") -> Tuple[float, List[Tuple[str, float]]]:
+    """Return total import seconds and the slowest top-level packages (cumulative seconds)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    per_package: Dict[str, float] = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line.split("|")
+            cumulative_us = int(cumulative.strip())
+        except ValueError:
+            continue
+        raw_name = name.rstrip()
+        depth = (len(raw_name) - len(raw_name.lstrip())) // 2
+        name = raw_name.strip()
+        if name == module:
+            total = cumulative_us / 1e6
+        # Depth 0/1 entries are the imports triggered directly by the module tree
+        if depth <= 1 or name.startswith("src."):
+            top = name if name.startswith("src.") else name.split(".")[0]
+            per_package[top] = max(per_package.get(top, 0.0), cumulative_us / 1e6)
+
+    ranked = sorted(per_package.items(), key=lambda x: x[1], reverse=True)
+    return total, ranked
+
+
+def measure_model_loads(include_reranker: bool) -> Dict[str, float]:
+    from src.clients.embedding_client import EmbeddingClient
+    from src.clients.sparse_embedding_client import SparseEmbeddingClient
+
+    timings = {}
+    start = time.perf_counter()
+    dense = EmbeddingClient()
+    timings["dense load"] = time.perf_counter() - start
+    start = time.perf_counter()
+    dense.embed_query("warm-up query")
+    timings["dense first query"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sparse = SparseEmbeddingClient()
+    timings["sparse load"] = time.perf_counter() - start
+    start = time.perf_counter()
+    sparse.embed_query("warm-up query")
+    timings["sparse first query"] = time.perf_counter() - start
+
+    if include_reranker:
+        from src.clients.reranker_client import RerankerClient
+        start = time.perf_counter()
+        reranker = RerankerClient()
+        timings["reranker load"] = time.perf_counter() - start
+        start = time.perf_counter()
+        list(reranker.rerank("warm-up query", ["warm-up document"]))
+        timings["reranker first call"] = time.perf_counter() - start
+
+    return timings
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(url: str, deadline: float, expect_status: int = 200) -> Optional[float]:
+    start = time.perf_counter()
+    while time.perf_counter() - start < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code == expect_status:
+                return time.perf_counter() - start
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    return None
+
+
+def measure_server(ask: Optional[str], ready_timeout: float) -> Dict[str, Optional[float]]:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.main:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    timings: Dict[str, Optional[float]] = {}
+    try:
+        live = _wait_for(f"{base}/health/live", ready_timeout)
+        timings["liveness"] = None if live is None else time.perf_counter() - start
+        ready = _wait_for(f"{base}/health/ready", ready_timeout)
+        timings["readiness"] = None if ready is None else time.perf_counter() - start
+
+        if ask:
+            request_start = time.perf_counter()
+            with httpx.stream("POST", f"{base}/api/v1/rag/ask", params={"query": ask}, timeout=120) as response:
+                first_byte = None
+                for _ in response.iter_bytes():
+                    if first_byte is None:
+                        first_byte = time.perf_counter() - request_start
+            timings["first ask (first byte)"] = first_byte
+            timings["first ask (complete)"] = time.perf_counter() - request_start
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return timings
+
+
+def _fmt(seconds: Optional[float]) -> str:
+    return "timeout" if seconds is None else f"{seconds:.3f}s"
+
+
+def write_report(path: Path, import_total, import_ranked, models, server, top: int) -> str:
+    lines = ["# Cold-start report", ""]
+    lines.append(f"## Import `src.api.main`: {_fmt(import_total)}")
+    lines.append("")
+    lines.append("| Module | Cumulative |")
+    lines.append("|---|---|")
+    for name, seconds in import_ranked[:top]:
+        lines.append(f"| {name} | {_fmt(seconds)} |")
+    if models:
+        lines += ["", "## Model load", "", "| Step | Time |", "|---|---|"]
+        lines += [f"| {k} | {_fmt(v)} |" for k, v in models.items()]
+    if server:
+        lines += ["", "## Fresh uvicorn process (from spawn)", "", "| Milestone | Time |", "|---|---|"]
+        lines += [f"| {k} | {_fmt(v)} |" for k, v in server.items()]
+    report = "\n".join(lines) + "\n"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report, encoding="utf-8")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="reports/cold_start.md")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to list")
+    parser.add_argument("--skip-models", action="store_true")
+    parser.add_argument("--skip-server", action="store_true")
+    parser.add_argument("--reranker", action="store_true", help="Also time the cross-encoder")
+    parser.add_argument("--ask", help="Send one /ask request after readiness and time it")
+    parser.add_argument("--ready-timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    import_total, import_ranked = measure_imports()
+    models = {} if args.skip_models else measure_model_loads(args.reranker)
+    server = {} if args.skip_server else measure_server(args.ask, args.ready_timeout)
+
+    print(write_report(Path(args.output), import_total, import_ranked, models, server, args.top))
+
+
+if __name__ == "__main__":
+    main()
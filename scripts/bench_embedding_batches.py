@@ -0,0 +1,155 @@
+"""
+Embedding batching benchmark: token-budget, length-bucketed batches vs the
+previous batching, for the dense (FastEmbed) and sparse (SPLADE) models.
+
+Chunks come from rag_docs/*.json and are fed in file order, in ingestion
+batches of --batch-size, exactly as StreamingIngestor/IngestionDAG would
+without their own sorting. Previously a dense batch went through
+get_text_embedding_batch (fixed ONNX batches of 10 in input order) and a
+sparse batch through one ONNX call padded to its longest text. Now both are
+sorted by token length and cut by the padded-token budget
+(EMBED_MAX_BATCH_TOKENS / EMBED_MAX_BATCH_SIZE); results come back in input
+order and must match the previous vectors.
+
+Padded tokens = sum over ONNX calls of (texts x longest text), i.e. what the
+model actually computes. With --estimate only this padding analysis is run,
+from character-based token estimates, without loading any model.
+
+Usage:
+    python -m scripts.bench_embedding_batches --output reports/embedding_batches.md
+    python -m scripts.bench_embedding_batches --estimate
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+from src.clients.token_batching import padded_tokens, plan_batches, token_lengths
+from src.core.settings import settings
+
+LEGACY_DENSE_BATCH = 10  # llama_index BaseEmbedding.embed_batch_size default
+
+
+def build_texts(input_dir: str) -> Tuple[List[str], List[str]]:
+    """Dense texts (chunk text) and sparse texts (text with embed metadata, as Qdrant receives it)."""
+    from llama_index.core.schema import MetadataMode
+
+    from src.chunkers.article_chunker import StructuredIngestionPipeline
+    from src.scrapers.doc_scraper import load_structured_documents
+
+    pipeline = StructuredIngestionPipeline()
+    nodes = pipeline.chunks_to_nodes(pipeline.process_documents(load_structured_documents(input_dir)))
+    return [node.text for node in nodes], [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes]
+
+
+def slices(items: Sequence, size: int) -> List[Sequence]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def padding(lengths: List[int], batch_size: int, legacy_batch: int) -> Tuple[int, int]:
+    """Padded tokens (previous, bucketed) over ingestion batches of `batch_size` in file order."""
+    old = new = 0
+    for start in range(0, len(lengths), batch_size):
+        part = lengths[start:start + batch_size]
+        old += padded_tokens(part, slices(range(len(part)), legacy_batch))
+        new += padded_tokens(part, plan_batches(part))
+    return old, new
+
+
+def timed(fn: Callable[[Sequence[str]], list], texts: List[str], batch_size: int, repeat: int) -> Tuple[float, list]:
+    best, results = float("inf"), []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [result for batch in slices(texts, batch_size) for result in fn(batch)]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def sparse_diff(old: list, new: list) -> float:
+    worst = 0.0
+    for (old_idx, old_val), (new_idx, new_val) in zip(old, new):
+        a, b = dict(zip(old_idx, old_val)), dict(zip(new_idx, new_val))
+        worst = max(worst, max((abs(a.get(k, 0.0) - b.get(k, 0.0)) for k in a.keys() | b.keys()), default=0.0))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="reports/embedding_batches.md")
+    parser.add_argument("--input-dir", default="rag_docs/")
+    parser.add_argument("--batch-size", type=int, default=settings.ingest_batch_size)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=1e-3, help="Max abs difference per vector component")
+    parser.add_argument("--estimate", action="store_true", help="Padding analysis only, no models")
+    args = parser.parse_args()
+
+    dense_texts, sparse_texts = build_texts(args.input_dir)
+    lines = [
+        "# Embedding batching report",
+        "",
+        f"{len(dense_texts)} chunks from {args.input_dir}, ingestion batches of {args.batch_size}, "
+        f"budget {settings.embed_max_batch_tokens} padded tokens / {settings.embed_max_batch_size} texts.",
+        "",
+    ]
+
+    if args.estimate:
+        lines += [
+            "Token counts estimated from characters (no tokenizer loaded).",
+            "",
+            "| Model input | Real tokens | Padded, previous | Padded, bucketed | Padding saved |",
+            "|---|---|---|---|---|",
+        ]
+        for name, texts, legacy_batch in (
+            ("dense", dense_texts, LEGACY_DENSE_BATCH),
+            ("sparse", sparse_texts, args.batch_size),
+        ):
+            lengths = token_lengths(texts)
+            old, new = padding(lengths, args.batch_size, legacy_batch)
+            real = sum(lengths)
+            lines.append(f"| {name} | {real} | {old} | {new} | {(old - new) / max(old - real, 1):.0%} |")
+        mismatches = False
+    else:
+        from src.clients.embedding_client import EmbeddingClient
+        from src.clients.sparse_embedding_client import SparseEmbeddingClient
+
+        dense = EmbeddingClient()
+        sparse = SparseEmbeddingClient()
+        lines += [
+            "| Model | Padded, previous | Padded, bucketed | Previous | Bucketed | Speedup | Max abs diff |",
+            "|---|---|---|---|---|---|---|",
+        ]
+        runs = (
+            ("dense", dense.profile.model_name, dense_texts, dense.token_lengths(dense_texts), LEGACY_DENSE_BATCH,
+             dense.embed_model.get_text_embedding_batch, dense.embed_documents),
+            ("sparse", sparse.model_name, sparse_texts, sparse.token_lengths(sparse_texts), args.batch_size,
+             lambda batch: [(emb.indices.tolist(), emb.values.tolist()) for emb in sparse.model.embed(list(batch))],
+             lambda batch: list(zip(*sparse.embed_documents(batch)))),
+        )
+        mismatches = False
+        for kind, model_name, texts, lengths, legacy_batch, old_fn, new_fn in runs:
+            old_pad, new_pad = padding(lengths, args.batch_size, legacy_batch)
+            old_s, old_out = timed(old_fn, texts, args.batch_size, args.repeat)
+            new_s, new_out = timed(new_fn, texts, args.batch_size, args.repeat)
+            if kind == "dense":
+                diff = float(np.max(np.abs(np.asarray(old_out) - np.asarray(new_out)))) if texts else 0.0
+            else:
+                diff = sparse_diff(old_out, new_out)
+            mismatches |= diff > args.tolerance
+            lines.append(
+                f"| {kind} `{model_name}` | {old_pad} | {new_pad} | {len(texts) / old_s:.1f} texts/s | "
+                f"{len(texts) / new_s:.1f} texts/s | {old_s / new_s:.2f}x | {diff:.2e} |"
+            )
+
+    report = "\n".join(lines) + "\n"
+    path = Path(args.output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report, encoding="utf-8")
+    print(report)
+    if mismatches:
+        raise SystemExit(f"Bucketed embeddings differ from the previous batching by more than {args.tolerance}")
+
+
+if __name__ == "__main__":
+    main()
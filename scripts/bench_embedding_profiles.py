@@ -0,0 +1,187 @@
+"""
+Embedding profile benchmark.
+
+Compares the dense embedding profiles in src/clients/embedding_profiles.py on
+the local corpus (rag_docs/*.json, chunked with the ingestion pipeline):
+
+  - model load time and resident memory added by the model
+  - document embedding throughput and single-query latency (p50/p95)
+  - recall@k on a question set derived from article titles
+
+Each question is an article title that is unique across the corpus; a hit is
+any chunk of that article in the top k. Retrieval is exact cosine similarity in
+memory, so the numbers compare the models and not the vector index. Every
+profile runs in its own subprocess so RAM figures do not leak between models.
+
+Build the int8 profile first:
+    python -c "from src.clients.embedding_profiles import export_quantized_e5_large as e; e()"
+
+Usage:
+    python -m scripts.bench_embedding_profiles --output reports/embedding_profiles.md
+    python -m scripts.bench_embedding_profiles --profiles e5-large e5-small --k 1 5 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.clients.embedding_profiles import EMBEDDING_PROFILES
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def build_corpus(input_dir: str) -> Tuple[List[str], List[str], List[Tuple[str, set]]]:
+    """Return (chunk ids, chunk texts, [(question, relevant chunk ids)])."""
+    from src.chunkers.article_chunker import StructuredIngestionPipeline
+    from src.scrapers.doc_scraper import load_structured_documents
+
+    chunks = StructuredIngestionPipeline().process_documents(load_structured_documents(input_dir))
+    ids = [f"{c.source}_{c.article_number}_{c.chunk_index}" for c in chunks]
+    texts = [c.text for c in chunks]
+
+    by_title: Dict[str, set] = defaultdict(set)
+    articles_by_title: Dict[str, set] = defaultdict(set)
+    for chunk_id, chunk in zip(ids, chunks):
+        title = (chunk.article_title or "").strip()
+        if len(title.split()) < 2:
+            continue
+        by_title[title].add(chunk_id)
+        articles_by_title[title].add((chunk.source, chunk.article_number))
+
+    # Boilerplate titles ("Coming into Force", ...) repeat across documents and are not answerable
+    questions = [
+        (title, relevant)
+        for title, relevant in sorted(by_title.items())
+        if len(articles_by_title[title]) == 1
+    ]
+    return ids, texts, questions
+
+
+def run_profile(name: str, input_dir: str, ks: List[int], batch_size: int) -> dict:
+    from src.clients.embedding_client import EmbeddingClient
+
+    ids, texts, questions = build_corpus(input_dir)
+
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    client = EmbeddingClient(profile=name)
+    client.embed_query("warm-up query")
+    load_seconds = time.perf_counter() - start
+    model_rss = _rss_mb() - rss_before
+
+    start = time.perf_counter()
+    doc_vectors = []
+    for i in range(0, len(texts), batch_size):
+        doc_vectors.extend(client.embed_documents(texts[i:i + batch_size]))
+    embed_seconds = time.perf_counter() - start
+
+    latencies = []
+    query_vectors = []
+    for question, _ in questions:
+        start = time.perf_counter()
+        query_vectors.append(client.embed_query(question))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    docs = np.asarray(doc_vectors, dtype=np.float32)
+    docs /= np.linalg.norm(docs, axis=1, keepdims=True)
+    queries = np.asarray(query_vectors, dtype=np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    ranking = np.argsort(-(queries @ docs.T), axis=1)
+
+    recall = {}
+    for k in ks:
+        hits = sum(
+            any(ids[j] in relevant for j in ranking[qi, :k])
+            for qi, (_, relevant) in enumerate(questions)
+        )
+        recall[k] = hits / len(questions) if questions else 0.0
+
+    return {
+        "profile": name,
+        "model": client.profile.model_name,
+        "dim": docs.shape[1],
+        "load_seconds": load_seconds,
+        "model_rss_mb": model_rss,
+        "peak_rss_mb": _rss_mb(),
+        "chunks": len(texts),
+        "chunks_per_second": len(texts) / embed_seconds if embed_seconds else 0.0,
+        "questions": len(questions),
+        "query_p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "query_p95_ms": float(np.percentile(latencies, 95)) if latencies else 0.0,
+        "recall": recall,
+    }
+
+
+def run_isolated(name: str, args) -> dict:
+    command = [
+        sys.executable, "-m", "scripts.bench_embedding_profiles",
+        "--worker", name,
+        "--input-dir", args.input_dir,
+        "--batch-size", str(args.batch_size),
+        "--k", *map(str, args.k),
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"profile": name, "error": result.stderr.strip().splitlines()[-1] if result.stderr else "failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def write_report(path: Path, results: List[dict], ks: List[int]) -> str:
+    lines = ["# Embedding profile report", ""]
+    header = "| Profile | Model | Dim | Load | Model RAM | Chunks/s | Query p50 | Query p95 | " + \
+        " | ".join(f"Recall@{k}" for k in ks) + " |"
+    lines += [header, "|" + "---|" * (8 + len(ks))]
+    for r in results:
+        if "error" in r:
+            lines.append(f"| {r['profile']} | error: {r['error']} |")
+            continue
+        recall = " | ".join(f"{r['recall'][str(k)]:.3f}" for k in ks)
+        lines.append(
+            f"| {r['profile']} | {r['model']} | {r['dim']} | {r['load_seconds']:.1f}s | "
+            f"{r['model_rss_mb']:.0f} MB | {r['chunks_per_second']:.1f} | "
+            f"{r['query_p50_ms']:.1f} ms | {r['query_p95_ms']:.1f} ms | {recall} |"
+        )
+    done = [r for r in results if "error" not in r]
+    if done:
+        lines += ["", f"{done[0]['chunks']} chunks, {done[0]['questions']} questions (unique article titles)."]
+    report = "\n".join(lines) + "\n"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report, encoding="utf-8")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="reports/embedding_profiles.md")
+    parser.add_argument("--profiles", nargs="+", default=list(EMBEDDING_PROFILES))
+    parser.add_argument("--input-dir", default="rag_docs/")
+    parser.add_argument("--k", nargs="+", type=int, default=[1, 5, 10])
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_profile(args.worker, args.input_dir, args.k, args.batch_size)
+        result["recall"] = {str(k): v for k, v in result["recall"].items()}
+        print(json.dumps(result))
+        return
+
+    results = [run_isolated(name, args) for name in args.profiles]
+    print(write_report(Path(args.output), results, args.k))
+
+
+if __name__ == "__main__":
+    main()
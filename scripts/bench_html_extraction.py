@@ -0,0 +1,165 @@
+"""
+HTML block extraction benchmark: single-pass walker vs the previous
+descendants + find_parent/find implementation.
+
+Pages come from the raw HTML archive (populate it with
+`python -m src.chunkers.ingestion --scrape`). When the archive is empty, Word-like
+pages are synthesized from rag_docs/*.json (nested section divs, MsoNormal
+paragraphs, layout tables) so the benchmark still runs offline.
+
+For every page and parser backend, both extractors run on a fresh parse and
+their blocks must be identical.
+
+Usage:
+    python -m scripts.bench_html_extraction --output reports/html_extraction.md
+    python -m scripts.bench_html_extraction --parsers html.parser lxml --repeat 5
+"""
+import argparse
+import html as html_lib
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from bs4 import BeautifulSoup, NavigableString, Tag, FeatureNotFound
+
+from src.chunkers.models import Block, HeadingBlock, ListBlock, ParagraphBlock, TableBlock
+from src.scrapers.doc_scraper import HTM_LINKS, StructuredScraper, load_structured_documents
+from src.scrapers.html_archive import HtmlArchive
+
+
+def legacy_extract_blocks(scraper: StructuredScraper, soup: BeautifulSoup) -> List[Block]:
+    """The implementation replaced by the single-pass walker, kept as reference."""
+    blocks: List[Block] = []
+    for element in soup(["script", "style", "meta", "link", "o:p", "head"]):
+        element.decompose()
+    body = soup.find('body') or soup
+    for element in body.descendants:
+        if isinstance(element, NavigableString) or not isinstance(element, Tag):
+            continue
+        if element.find_parent(['table', 'ul', 'ol']):
+            continue
+        tag_name = element.name.lower() if element.name else ""
+        if tag_name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+            text = scraper._clean_text(element.get_text())
+            if text:
+                blocks.append(HeadingBlock(level=scraper._get_heading_level(element), text=text))
+        elif tag_name == 'table':
+            table_block = scraper._extract_table(element)
+            if table_block.rows:
+                blocks.append(table_block)
+        elif tag_name in ['ul', 'ol']:
+            list_block = scraper._extract_list(element)
+            if list_block.items:
+                blocks.append(list_block)
+        elif tag_name in ['p', 'div']:
+            text = scraper._clean_text(element.get_text())
+            if text and len(text) > 2:
+                if not element.find(['table', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+                    blocks.append(ParagraphBlock(text=text))
+    return blocks
+
+
+def synthesize_page(doc, depth: int = 6) -> str:
+    """Word-export-like HTML for a structured document."""
+    esc = html_lib.escape
+    parts = []
+    for block in doc.blocks:
+        if isinstance(block, HeadingBlock):
+            parts.append(f"<h{block.level}><span lang=EN-US>{esc(block.text)}<o:p></o:p></span></h{block.level}>")
+        elif isinstance(block, ParagraphBlock):
+            parts.append(f"<p class=MsoNormal style='text-align:justify'><span lang=EN-US>{esc(block.text)}</span><o:p></o:p></p>")
+        elif isinstance(block, TableBlock):
+            rows = "".join(
+                "<tr>" + "".join(f"<td valign=top><p class=MsoNormal><span>{esc(cell)}</span></p></td>" for cell in row) + "</tr>"
+                for row in block.rows
+            )
+            parts.append(f"<div align=center><table class=MsoNormalTable border=0>{rows}</table></div>")
+        elif isinstance(block, ListBlock):
+            tag = "ol" if block.ordered else "ul"
+            parts.append(f"<{tag}>" + "".join(f"<li><span>{esc(item)}</span></li>" for item in block.items) + f"</{tag}>")
+    body = "\n".join(parts)
+    for level in range(depth):
+        body = f"<div class=WordSection{level}>{body}</div>"
+    return f"<html><head><meta charset=utf-8><style>p {{margin:0}}</style></head><body lang=EN-US>{body}</body></html>"
+
+
+def load_pages(input_dir: str) -> Tuple[str, Dict[str, str]]:
+    archive = HtmlArchive()
+    pages = {link: archive.read(link) for link in HTM_LINKS}
+    pages = {link: html for link, html in pages.items() if html}
+    if pages:
+        return "archive", pages
+    return "synthesized from rag_docs", {
+        doc.source: synthesize_page(doc) for doc in load_structured_documents(input_dir)
+    }
+
+
+def bench(pages: Dict[str, str], parser: str, repeat: int) -> Dict:
+    scraper = StructuredScraper()
+    parse_s, old_s, new_s = [], [], []
+    mismatches = []
+    for link, page in pages.items():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            soup_old = BeautifulSoup(page, parser)
+            soup_new = BeautifulSoup(page, parser)
+            parse_s.append((time.perf_counter() - start) / 2)
+
+            start = time.perf_counter()
+            old = legacy_extract_blocks(scraper, soup_old)
+            old_s.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            new = scraper._extract_blocks(soup_new)
+            new_s.append(time.perf_counter() - start)
+
+        if old != new:
+            mismatches.append(link)
+    return {
+        "parser": parser,
+        "parse_ms": statistics.median(parse_s) * 1000,
+        "old_ms": sum(old_s) / repeat * 1000,
+        "new_ms": sum(new_s) / repeat * 1000,
+        "mismatches": mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="reports/html_extraction.md")
+    parser.add_argument("--input-dir", default="rag_docs/")
+    parser.add_argument("--parsers", nargs="+", default=["html.parser", "lxml"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    origin, pages = load_pages(args.input_dir)
+    lines = [
+        "# HTML block extraction report",
+        "",
+        f"{len(pages)} pages ({origin}), {args.repeat} runs each. Times are per full corpus pass.",
+        "",
+        "| Parser | Parse (median/page) | Old extract | Single-pass | Speedup | Identical output |",
+        "|---|---|---|---|---|---|",
+    ]
+    for backend in args.parsers:
+        try:
+            r = bench(pages, backend, args.repeat)
+        except FeatureNotFound:
+            lines.append(f"| {backend} | not installed | | | | |")
+            continue
+        identical = "yes" if not r["mismatches"] else f"NO: {', '.join(r['mismatches'])}"
+        lines.append(
+            f"| {backend} | {r['parse_ms']:.1f} ms | {r['old_ms']:.0f} ms | {r['new_ms']:.0f} ms | "
+            f"{r['old_ms'] / r['new_ms']:.1f}x | {identical} |"
+        )
+
+    report = "\n".join(lines) + "\n"
+    path = Path(args.output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report, encoding="utf-8")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
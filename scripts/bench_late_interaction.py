@@ -0,0 +1,145 @@
+"""
+Late-interaction (MaxSim) reranker benchmark against a cross-encoder.
+
+Uses the question set and lexical candidate lists of scripts/bench_reranker.py.
+Token vectors for the whole corpus are computed once into a temporary
+TokenVectorStore (the ingestion-time cost), then every question is reranked with:
+
+  - MaxSim over the stored token vectors (query encoding + NumPy scoring)
+  - the cross-encoder on the same candidates
+
+Usage:
+    python -m scripts.bench_late_interaction --output reports/late_interaction.md
+    python -m scripts.bench_late_interaction --model colbert-ir/colbertv2.0 --cross-encoder Xenova/ms-marco-MiniLM-L-6-v2
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from scripts.bench_embedding_profiles import build_corpus
+from scripts.bench_reranker import build_candidates, run_model, score_rankings
+from src.clients.token_vector_store import TokenVectorStore, maxsim_scores
+
+
+def run_late_interaction(model_name: str, texts, ids, questions, candidates, k: int, batch_size: int) -> Dict:
+    from src.clients.late_interaction_client import LateInteractionClient
+
+    start = time.perf_counter()
+    client = LateInteractionClient(model_name=model_name)
+    client.embed_query("warm-up query")
+    load_seconds = time.perf_counter() - start
+
+    store = TokenVectorStore(tempfile.mkdtemp(prefix="token_store_"), model_name=model_name)
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        store.add(ids[i:i + batch_size], client.embed_documents(texts[i:i + batch_size], batch_size=batch_size))
+    store.flush()
+    index_seconds = time.perf_counter() - start
+    store_mb = (store.path / TokenVectorStore.DATA_FILE).stat().st_size / 1e6
+
+    query_ms: List[float] = []
+    maxsim_ms: List[float] = []
+    rankings = []
+    for (question, _), candidate in zip(questions, candidates):
+        start = time.perf_counter()
+        query_tokens = client.embed_query(question).astype(np.float32)
+        encoded = time.perf_counter()
+        tokens, starts, found = store.gather([ids[j] for j in candidate])
+        scores = maxsim_scores(query_tokens, tokens, starts)
+        done = time.perf_counter()
+        query_ms.append((encoded - start) * 1000)
+        maxsim_ms.append((done - encoded) * 1000)
+        order = np.argsort(-scores)
+        rankings.append([candidate[found[i]] for i in order])
+
+    hit, mrr = score_rankings(rankings, ids, questions, k)
+    total = [a + b for a, b in zip(query_ms, maxsim_ms)]
+    return {
+        "model": model_name,
+        "load_seconds": load_seconds,
+        "index_seconds": index_seconds,
+        "store_mb": store_mb,
+        "query_encode_p50_ms": statistics.median(query_ms),
+        "maxsim_p50_ms": statistics.median(maxsim_ms),
+        "p50_ms": statistics.median(total),
+        "p95_ms": float(np.percentile(total, 95)),
+        "hit": hit,
+        "mrr": mrr,
+    }
+
+
+def write_report(path: Path, baseline, late: Dict, cross: Dict, args) -> str:
+    lines = [
+        "# Late-interaction reranker report",
+        "",
+        f"{args.questions} questions, {args.fetch_k} candidates each, hit@{args.k}.",
+        "",
+        f"| Reranker | Load | p50 | p95 | Hit@{args.k} | MRR |",
+        "|---|---|---|---|---|---|",
+        f"| (retrieval order) | - | - | - | {baseline[0]:.3f} | {baseline[1]:.3f} |",
+    ]
+    for name, r in ((f"MaxSim {args.model}", late), (f"Cross-encoder {args.cross_encoder}", cross)):
+        if r is None:
+            continue
+        if "error" in r:
+            lines.append(f"| {name} | error: {r['error']} |")
+            continue
+        lines.append(
+            f"| {name} | {r['load_seconds']:.1f}s | {r['p50_ms']:.1f} ms | {r['p95_ms']:.1f} ms | "
+            f"{r['hit']:.3f} | {r['mrr']:.3f} |"
+        )
+    if late and "error" not in late:
+        lines += [
+            "",
+            f"MaxSim split: query encoding p50 {late['query_encode_p50_ms']:.1f} ms, "
+            f"scoring p50 {late['maxsim_p50_ms']:.2f} ms.",
+            f"Ingestion-time token vectors: {late['index_seconds']:.1f}s for the corpus, "
+            f"{late['store_mb']:.1f} MB on disk (float16).",
+        ]
+    report = "\n".join(lines) + "\n"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report, encoding="utf-8")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="reports/late_interaction.md")
+    parser.add_argument("--model", default="answerdotai/answerai-colbert-small-v1")
+    parser.add_argument("--cross-encoder", default="jinaai/jina-reranker-v1-turbo-en", help="'' to skip")
+    parser.add_argument("--max-tokens", type=int, default=256, help="Cross-encoder token cap")
+    parser.add_argument("--input-dir", default="rag_docs/")
+    parser.add_argument("--fetch-k", type=int, default=20)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=100, help="Max questions")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    ids, texts, questions = build_corpus(args.input_dir)
+    questions = questions[:args.limit]
+    args.questions = len(questions)
+    candidates = build_candidates(texts, questions, args.fetch_k)
+    baseline = score_rankings(candidates, ids, questions, args.k)
+
+    try:
+        late = run_late_interaction(args.model, texts, ids, questions, candidates, args.k, args.batch_size)
+    except Exception as e:
+        late = {"error": str(e)[:120]}
+
+    cross = None
+    if args.cross_encoder:
+        try:
+            cross = run_model(args.cross_encoder, args.max_tokens, texts, questions, candidates, ids, args.k)
+        except Exception as e:
+            cross = {"error": str(e)[:120]}
+
+    print(write_report(Path(args.output), baseline, late, cross, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Markdown cleaner / metadata enricher benchmark and equivalence check: the
+precompiled single-pass line classifier vs the previous per-line re.search/re.sub
+implementation.
+
+Input is emu_rag_data/*.md. The cleaners must produce identical text; the
+enrichers must produce identical metadata on the nodes the legacy markdown
+pipeline creates (MarkdownNodeParser + SentenceSplitter over the cleaned text).
+Every input line is also cleaned in isolation and after a table separator, so
+the sub-clause branch is exercised on all lines, and every cleaned line (and
+pair of lines) is enriched on its own.
+
+Usage:
+    python -m scripts.bench_markdown_cleaner --output reports/markdown_cleaner.md
+"""
+import argparse
+import copy
+import re
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from llama_index.core import Document
+from llama_index.core.node_parser import MarkdownNodeParser, SentenceSplitter
+
+from src.chunkers.legacy_markdown_ingestion import MetadataEnricher, UniversalMarkdownCleaner
+
+
+def legacy_clean_text(text: str) -> str:
+    """UniversalMarkdownCleaner before the line classifier, kept as reference."""
+    new_lines = []
+    lines = text.split('\n')
+    in_header_table = False
+    for i, line in enumerate(lines):
+        if re.match(r'^\s*\|[\s\-\|]+\|?\s*$', line):
+            in_header_table = True
+            continue
+        table_match = re.search(
+            r'^\s*\|?\s*(?:(?:\*\*)?([^*]+)(?:\*\*)?)\s*\|\s*\*\*(\d+[A-Za-z]?)\.\*\*\s*\|\s*(.*)',
+            line
+        )
+        if table_match:
+            title_part = table_match.group(1).strip()
+            article_num = table_match.group(2)
+            content_part = table_match.group(3).strip()
+            new_lines.append(f"\n### Article {article_num}: {title_part}\n")
+            if content_part:
+                new_lines.append(content_part)
+            continue
+        multi_col_match = re.search(r'^\s*\|\s*\((\d+)\)\s*\|\s*(.*)', line)
+        if multi_col_match and in_header_table:
+            sub_num = multi_col_match.group(1)
+            content = multi_col_match.group(2).replace('|', ' ').strip()
+            new_lines.append(f"\n**({sub_num})** {content}")
+            continue
+        if "**Article" in line:
+            line = re.sub(r'\*\*(Article\s+\d+[A-Za-z]?:?\s*[^*]*)\*\*', r'### \1', line)
+        if "**PART" in line or "**SECTION" in line or "**CHAPTER" in line:
+            line = re.sub(r'\*\*((?:PART|SECTION|CHAPTER)\s+[A-Z0-9\s]+)\*\*', r'## \1', line)
+        if line.strip() and not line.strip().startswith('|'):
+            in_header_table = False
+        new_lines.append(line)
+    return '\n'.join(new_lines)
+
+
+def legacy_enrich(content: str, metadata: dict, i: int) -> None:
+    """MetadataEnricher before the precompiled patterns, kept as reference."""
+    article_match = re.search(r'###?\s*Article\s+(\d+[A-Za-z]?)', content)
+    if article_match:
+        metadata["article_number"] = article_match.group(1)
+        title_match = re.search(r'###?\s*Article\s+\d+[A-Za-z]?:?\s*([^\n]+)', content)
+        if title_match:
+            metadata["article_title"] = title_match.group(1).strip()
+    section_match = re.search(r'##\s*((?:PART|SECTION|CHAPTER)\s+[A-Z0-9\s]+)', content)
+    if section_match:
+        metadata["section"] = section_match.group(1).strip()
+    if "article_title" not in metadata:
+        for line in content.strip().split('\n'):
+            if line.startswith('###'):
+                metadata["title"] = line.replace('###', '').strip()
+                break
+    else:
+        metadata["title"] = metadata.get("article_title")
+    if "|---|" in content or "| " in content:
+        metadata["contains_table"] = True
+    metadata["chunk_index"] = i
+
+
+def run_one(enrich: Callable, content: str) -> dict:
+    metadata: dict = {}
+    enrich(content, metadata, 0)
+    return metadata
+
+
+def best_of(fn: Callable, repeat: int) -> Tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="reports/markdown_cleaner.md")
+    parser.add_argument("--data-dir", default="emu_rag_data")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    texts = [path.read_text(encoding="utf-8") for path in sorted(Path(args.data_dir).glob("*.md"))]
+    lines = [line for text in texts for line in text.split("\n")]
+    cleaner = UniversalMarkdownCleaner()
+    enricher = MetadataEnricher()
+
+    # Cleaner: whole documents, then every line alone and inside a table
+    old_clean_s, old_texts = best_of(lambda: [legacy_clean_text(t) for t in texts], args.repeat)
+    new_clean_s, new_texts = best_of(lambda: [cleaner.clean_text(t) for t in texts], args.repeat)
+    clean_mismatches = sum(1 for a, b in zip(old_texts, new_texts) if a != b)
+    line_mismatches = sum(
+        1 for line in lines for probe in (line, f"|---|---|\n{line}")
+        if legacy_clean_text(probe) != cleaner.clean_text(probe)
+    )
+
+    # Enricher: nodes of the legacy pipeline
+    nodes = SentenceSplitter(chunk_size=1024, chunk_overlap=100).get_nodes_from_documents(
+        MarkdownNodeParser().get_nodes_from_documents([Document(text=t) for t in new_texts])
+    )
+    contents = [node.get_content() for node in nodes]
+    base = [dict(node.metadata) for node in nodes]
+
+    def run(enrich) -> Tuple[float, List[dict]]:
+        best, metadata = float("inf"), []
+        for _ in range(args.repeat):
+            metadata = copy.deepcopy(base)
+            start = time.perf_counter()
+            for i, content in enumerate(contents):
+                enrich(content, metadata[i], i)
+            best = min(best, time.perf_counter() - start)
+        return best, metadata
+
+    old_enrich_s, old_meta = run(legacy_enrich)
+    new_enrich_s, new_meta = run(enricher.enrich)
+    meta_mismatches = sum(1 for a, b in zip(old_meta, new_meta) if a != b)
+    probes = [line for text in new_texts for line in text.split("\n")]
+    probes += [f"{a}\n{b}" for a, b in zip(probes, probes[1:])]
+    meta_mismatches += sum(1 for p in probes if run_one(legacy_enrich, p) != run_one(enricher.enrich, p))
+
+    report = "\n".join([
+        "# Markdown cleaner report",
+        "",
+        f"{len(texts)} files, {len(lines)} lines, {len(nodes)} nodes from {args.data_dir}. Best of {args.repeat} runs.",
+        "",
+        "| Stage | Previous | Precompiled | Speedup | Mismatches |",
+        "|---|---|---|---|---|",
+        f"| UniversalMarkdownCleaner | {old_clean_s * 1000:.1f} ms | {new_clean_s * 1000:.1f} ms | "
+        f"{old_clean_s / new_clean_s:.2f}x | {clean_mismatches} documents, {line_mismatches} line probes |",
+        f"| MetadataEnricher | {old_enrich_s * 1000:.1f} ms | {new_enrich_s * 1000:.1f} ms | "
+        f"{old_enrich_s / new_enrich_s:.2f}x | {meta_mismatches} nodes and line probes |",
+    ]) + "\n"
+    path = Path(args.output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report, encoding="utf-8")
+    print(report)
+    if clean_mismatches or line_mismatches or meta_mismatches:
+        raise SystemExit("Output differs from the previous implementation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Cross-encoder reranker benchmark.
+
+Compares Jina turbo against smaller cross-encoders on the local corpus, using
+the same question set as scripts/bench_embedding_profiles.py (unique article
+titles in rag_docs/). For every question a fixed candidate list of --fetch-k
+chunks is built with a cheap lexical overlap score, so all models rerank the
+same inputs. Reported per model and token cap:
+
+  - load time
+  - per-query rerank latency (p50/p95) for fetch_k pairs
+  - hit@k and MRR of the relevant article, against the unreranked baseline
+
+Usage:
+    python -m scripts.bench_reranker --output reports/reranker.md
+    python -m scripts.bench_reranker --models Xenova/ms-marco-MiniLM-L-6-v2 --max-tokens 128 256 512
+"""
+import argparse
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from scripts.bench_embedding_profiles import build_corpus
+
+DEFAULT_MODELS = [
+    "jinaai/jina-reranker-v1-turbo-en",
+    "jinaai/jina-reranker-v1-tiny-en",
+    "Xenova/ms-marco-MiniLM-L-12-v2",
+    "Xenova/ms-marco-MiniLM-L-6-v2",
+]
+
+WORD_RE = re.compile(r"\w+")
+
+
+def _terms(text: str) -> set:
+    return {w for w in WORD_RE.findall(text.lower()) if len(w) > 2}
+
+
+def build_candidates(texts: List[str], questions, fetch_k: int) -> List[List[int]]:
+    """Lexical top-fetch_k per question (stand-in for hybrid retrieval)."""
+    doc_terms = [_terms(t) for t in texts]
+    candidates = []
+    for question, _ in questions:
+        q = _terms(question)
+        overlap = [len(q & d) / (len(q) or 1) for d in doc_terms]
+        candidates.append(list(np.argsort(overlap)[::-1][:fetch_k]))
+    return candidates
+
+
+def score_rankings(rankings: List[List[int]], ids: List[str], questions, k: int) -> Tuple[float, float]:
+    hits, reciprocal = 0, 0.0
+    for ranking, (_, relevant) in zip(rankings, questions):
+        positions = [rank for rank, j in enumerate(ranking, 1) if ids[j] in relevant]
+        if positions and positions[0] <= k:
+            hits += 1
+        reciprocal += 1 / positions[0] if positions else 0.0
+    return hits / len(questions), reciprocal / len(questions)
+
+
+def run_model(model_name: str, max_tokens: Optional[int], texts, questions, candidates, ids, k: int) -> Dict:
+    from src.clients.reranker_client import RerankerClient
+
+    start = time.perf_counter()
+    client = RerankerClient(model_name=model_name, max_tokens=max_tokens)
+    client.rerank_pairs([("warm-up query", "warm-up document")])
+    load_seconds = time.perf_counter() - start
+
+    latencies, rankings = [], []
+    for (question, _), candidate in zip(questions, candidates):
+        start = time.perf_counter()
+        scores = client.rerank_pairs([(question, texts[j]) for j in candidate])
+        latencies.append((time.perf_counter() - start) * 1000)
+        order = sorted(range(len(candidate)), key=lambda i: scores[i], reverse=True)
+        rankings.append([candidate[i] for i in order])
+
+    hit, mrr = score_rankings(rankings, ids, questions, k)
+    return {
+        "model": model_name,
+        "max_tokens": max_tokens or "model max",
+        "load_seconds": load_seconds,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "hit": hit,
+        "mrr": mrr,
+    }
+
+
+def write_report(path: Path, baseline: Tuple[float, float], results: List[Dict], args) -> str:
+    lines = [
+        "# Reranker report",
+        "",
+        f"{args.questions} questions, {args.fetch_k} candidates each, hit@{args.k}.",
+        "",
+        f"| Model | Token cap | Load | p50 | p95 | Hit@{args.k} | MRR |",
+        "|---|---|---|---|---|---|---|",
+        f"| (retrieval order) | - | - | - | - | {baseline[0]:.3f} | {baseline[1]:.3f} |",
+    ]
+    for r in results:
+        if "error" in r:
+            lines.append(f"| {r['model']} | {r['max_tokens']} | error: {r['error']} |")
+            continue
+        lines.append(
+            f"| {r['model']} | {r['max_tokens']} | {r['load_seconds']:.1f}s | {r['p50_ms']:.1f} ms | "
+            f"{r['p95_ms']:.1f} ms | {r['hit']:.3f} | {r['mrr']:.3f} |"
+        )
+    report = "\n".join(lines) + "\n"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report, encoding="utf-8")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="reports/reranker.md")
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS)
+    parser.add_argument("--max-tokens", nargs="+", type=int, default=[256], help="0 = model maximum")
+    parser.add_argument("--input-dir", default="rag_docs/")
+    parser.add_argument("--fetch-k", type=int, default=20)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=100, help="Max questions")
+    args = parser.parse_args()
+
+    ids, texts, questions = build_corpus(args.input_dir)
+    questions = questions[:args.limit]
+    args.questions = len(questions)
+    candidates = build_candidates(texts, questions, args.fetch_k)
+    baseline = score_rankings(candidates, ids, questions, args.k)
+
+    results = []
+    for model_name in args.models:
+        for max_tokens in args.max_tokens:
+            try:
+                results.append(run_model(model_name, max_tokens or None, texts, questions, candidates, ids, args.k))
+            except Exception as e:
+                results.append({"model": model_name, "max_tokens": max_tokens or "model max", "error": str(e)[:120]})
+
+    print(write_report(Path(args.output), baseline, results, args))
+
+
+if __name__ == "__main__":
+    main()
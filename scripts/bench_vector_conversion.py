@@ -0,0 +1,155 @@
+"""
+Embedding hand-off benchmark: float32 arrays from the ONNX output to the Qdrant
+points vs the previous Python float lists at every stage.
+
+Previous path, per ingestion batch:
+    ONNX rows -> tolist() (FastEmbedEmbedding / SparseEmbeddingClient)
+    -> np.asarray(list) into the embedding cache
+    -> node.embedding = list (validated element by element by TextNode)
+    -> PointStruct / SparseVector from the lists
+Array path:
+    ONNX rows -> one float32 matrix / the sparse arrays as returned
+    -> cache straight from the arrays
+    -> PointStruct / SparseVector from one tolist() per vector
+
+Both a cold run (model output, cache writes) and a warm run (cache reads only)
+are timed. The model output is synthetic (normalized float32 rows of --dim,
+SPLADE-like rows of --nnz non-zeros), so no model has to be downloaded; the
+cache, TextNode and qdrant-client models are the real ones. The points built by
+both paths must be identical.
+
+Usage:
+    python -m scripts.bench_vector_conversion --output reports/vector_conversion.md
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import numpy as np
+from llama_index.core.schema import TextNode
+from qdrant_client import models
+
+from src.clients.embedding_cache import EmbeddingCache
+from src.clients.qdrant import DENSE_VECTOR_NAME, SPARSE_VECTOR_NAME
+
+Batch = Tuple[List[TextNode], List[str], List[np.ndarray], List[Tuple[np.ndarray, np.ndarray]]]
+
+
+def synthetic_batches(chunks: int, batch_size: int, dim: int, nnz: int, seed: int = 0) -> List[Batch]:
+    rng = np.random.default_rng(seed)
+    batches = []
+    for start in range(0, chunks, batch_size):
+        count = min(batch_size, chunks - start)
+        texts = [f"chunk {start + i}" for i in range(count)]
+        nodes = [TextNode(text=text, id_=f"00000000-0000-0000-0000-{start + i:012d}") for i, text in enumerate(texts)]
+        dense = rng.standard_normal((count, dim)).astype(np.float32)
+        dense /= np.linalg.norm(dense, axis=1, keepdims=True)
+        sparse = []
+        for _ in range(count):
+            indices = np.sort(rng.choice(30522, size=rng.integers(nnz // 2, nnz * 2), replace=False)).astype(np.int64)
+            sparse.append((indices, rng.random(len(indices), dtype=np.float32)))
+        # Cache round trip is float16; start from representable values so both paths agree exactly
+        dense = dense.astype(np.float16).astype(np.float32)
+        sparse = [(i, v.astype(np.float16).astype(np.float32)) for i, v in sparse]
+        batches.append((nodes, texts, list(dense), sparse))
+    return batches
+
+
+def legacy_points(cache: EmbeddingCache, batch: Batch, warm: bool) -> List[models.PointStruct]:
+    nodes, texts, dense_rows, sparse_rows = batch
+    if warm:
+        dense = [v.tolist() for v in cache.get_dense("dense", texts)]
+        sparse = [(i.tolist(), v.tolist()) for i, v in cache.get_sparse("sparse", texts)]
+    else:
+        dense = [row.tolist() for row in dense_rows]
+        sparse = [(i.tolist(), v.tolist()) for i, v in sparse_rows]
+        cache.put_dense("dense", texts, dense)
+        cache.put_sparse("sparse", texts, sparse)
+    for node, embedding in zip(nodes, dense):
+        node.embedding = embedding
+    return [
+        models.PointStruct(id=node.node_id, vector={
+            DENSE_VECTOR_NAME: node.get_embedding(),
+            SPARSE_VECTOR_NAME: models.SparseVector(indices=indices, values=values),
+        })
+        for node, (indices, values) in zip(nodes, sparse)
+    ]
+
+
+def array_points(cache: EmbeddingCache, batch: Batch, warm: bool) -> List[models.PointStruct]:
+    nodes, texts, dense_rows, sparse_rows = batch
+    if warm:
+        dense = np.stack(cache.get_dense("dense", texts))
+        sparse = cache.get_sparse("sparse", texts)
+    else:
+        dense = np.asarray(dense_rows, dtype=np.float32)
+        sparse = sparse_rows
+        cache.put_dense("dense", texts, dense)
+        cache.put_sparse("sparse", texts, sparse)
+    return [
+        models.PointStruct(id=node.node_id, vector={
+            DENSE_VECTOR_NAME: dense[i].tolist(),
+            SPARSE_VECTOR_NAME: models.SparseVector(indices=sparse[i][0].tolist(), values=sparse[i][1].tolist()),
+        })
+        for i, node in enumerate(nodes)
+    ]
+
+
+def run(build: Callable, batches: List[Batch], repeat: int) -> Tuple[float, float, List[models.PointStruct]]:
+    cold = warm = float("inf")
+    points: List[models.PointStruct] = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EmbeddingCache(path=str(Path(tmp) / "cache.sqlite"))
+            start = time.perf_counter()
+            for batch in batches:
+                build(cache, batch, False)
+            cold = min(cold, time.perf_counter() - start)
+            start = time.perf_counter()
+            points = [point for batch in batches for point in build(cache, batch, True)]
+            warm = min(warm, time.perf_counter() - start)
+            cache.close()
+    return cold, warm, points
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="reports/vector_conversion.md")
+    parser.add_argument("--chunks", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--dim", type=int, default=1024, help="1024 = e5-large")
+    parser.add_argument("--nnz", type=int, default=150, help="Typical SPLADE non-zeros per chunk")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    batches = synthetic_batches(args.chunks, args.batch_size, args.dim, args.nnz)
+    old_cold, old_warm, old_points = run(legacy_points, batches, args.repeat)
+    new_cold, new_warm, new_points = run(array_points, batches, args.repeat)
+    identical = [p.model_dump() for p in old_points] == [p.model_dump() for p in new_points]
+
+    report = "\n".join([
+        "# Embedding hand-off report",
+        "",
+        f"{args.chunks} synthetic chunks in batches of {args.batch_size}, dense dim {args.dim}, "
+        f"~{args.nnz} sparse non-zeros. Best of {args.repeat} runs; embedding cache included.",
+        "",
+        "| Run | Float lists | Float32 arrays | Speedup |",
+        "|---|---|---|---|",
+        f"| Cold (model output -> cache -> points) | {old_cold * 1000:.1f} ms | {new_cold * 1000:.1f} ms | "
+        f"{old_cold / new_cold:.2f}x |",
+        f"| Warm (cache -> points) | {old_warm * 1000:.1f} ms | {new_warm * 1000:.1f} ms | {old_warm / new_warm:.2f}x |",
+        "",
+        f"Points identical: {'yes' if identical else 'NO'}",
+    ]) + "\n"
+    path = Path(args.output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report, encoding="utf-8")
+    print(report)
+    if not identical:
+        raise SystemExit("Points differ between the list and array paths")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from src.api.selectors.user.get_user import get_user_by_email
 from typing import Optional, Annotated
 import redis.asyncio as redis
 from src.api.dependencies.clients import get_redis
+from src.core.settings import settings
 
 @lru_cache()
 def get_auth_service() -> AuthService:
@@ -56,3 +57,13 @@ async def get_current_user_optional(
 ) -> Optional[User]:
     return user
 
+
+async def get_admin_user(
+    user: Annotated[User, Depends(get_current_user_required)],
+) -> User:
+    if user.email.lower() not in settings.admin_email_set:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Forbidden",
+        )
+    return user
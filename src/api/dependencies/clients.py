@@ -1,33 +1,60 @@
-from src.clients.llm import LLMClient
-from src.clients.embedding_client import EmbeddingClient
-from src.clients.sparse_embedding_client import SparseEmbeddingClient
-from src.clients.qdrant import QdrantClientManager
-from src.clients.redis import RedisClient
-from src.clients.reranker_client import RerankerClient
+from __future__ import annotations
 from src.clients.postgres import async_session
-from src.api.services.rag_service import RAGService
-from src.api.services.chat_history_service import ChatHistoryService
-from src.api.services.reranker_service import RerankerService
 from src.core.settings import settings
 from functools import lru_cache
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import AsyncGenerator, List
-import redis.asyncio as redis
+from typing import TYPE_CHECKING, AsyncGenerator, List
+
+# Client and service modules import llama_index, fastembed and qdrant_client, so they are
+# imported inside the factories below to keep app startup (and liveness probes) fast.
+if TYPE_CHECKING:
+    import redis.asyncio as redis
+    from src.clients.llm import LLMClient
+    from src.clients.embedding_client import EmbeddingClient
+    from src.clients.sparse_embedding_client import SparseEmbeddingClient
+    from src.clients.qdrant import QdrantClientManager
+    from src.clients.redis import RedisClient
+    from src.clients.reranker_client import RerankerClient
+    from src.clients.inference_client import InferenceClient
+    from src.api.services.rag_service import RAGService
+    from src.api.services.chat_history_service import ChatHistoryService
+    from src.api.services.reranker_service import RerankerService
+    from src.api.services.singleflight_service import SingleFlightService
+    from src.api.services.job_queue_service import JobQueueService
 
 @lru_cache()
 def get_llm_client() -> LLMClient:
+    from src.clients.llm import LLMClient
     return LLMClient()
 
+@lru_cache()
+def get_inference_client() -> InferenceClient | None:
+    if not (settings.inference_url or settings.inference_socket):
+        return None
+    from src.clients.inference_client import InferenceClient
+    return InferenceClient()
+
 @lru_cache()
 def get_embedding_client() -> EmbeddingClient:
+    inference = get_inference_client()
+    if inference is not None:
+        from src.clients.inference_client import RemoteEmbeddingClient
+        return RemoteEmbeddingClient(inference)
+    from src.clients.embedding_client import EmbeddingClient
     return EmbeddingClient()
 
 @lru_cache()
 def get_sparse_embedding_client() -> SparseEmbeddingClient:
+    inference = get_inference_client()
+    if inference is not None:
+        from src.clients.inference_client import RemoteSparseEmbeddingClient
+        return RemoteSparseEmbeddingClient(inference)
+    from src.clients.sparse_embedding_client import SparseEmbeddingClient
     return SparseEmbeddingClient()
 
 @lru_cache()
 def get_qdrant_client() -> QdrantClientManager:
+    from src.clients.qdrant import QdrantClientManager
     qdrant = QdrantClientManager()
     sparse_client = get_sparse_embedding_client()
 
@@ -39,16 +66,26 @@ def get_qdrant_client() -> QdrantClientManager:
 
 @lru_cache()
 def get_redis_client() -> RedisClient:
+    from src.clients.redis import RedisClient
     return RedisClient()
 
 @lru_cache()
 def get_reranker_client() -> RerankerClient | None:
     if not settings.reranker_enabled:
         return None
+    if settings.reranker_backend == "late-interaction":
+        from src.clients.late_interaction_client import LateInteractionReranker
+        return LateInteractionReranker()
+    inference = get_inference_client()
+    if inference is not None:
+        from src.clients.inference_client import RemoteRerankerClient
+        return RemoteRerankerClient(inference, model_name=settings.reranker_model)
+    from src.clients.reranker_client import RerankerClient
     return RerankerClient(model_name=settings.reranker_model)
 
 @lru_cache()
 def get_reranker_service() -> RerankerService:
+    from src.api.services.reranker_service import RerankerService
     return RerankerService(get_reranker_client())
 
 @lru_cache()
@@ -57,8 +94,21 @@ def get_redis() -> redis.Redis:
     
 @lru_cache()
 def get_chat_history_service() -> ChatHistoryService:
+    from src.api.services.chat_history_service import ChatHistoryService
     return ChatHistoryService(get_redis_client())
 
+@lru_cache()
+def get_singleflight_service() -> SingleFlightService:
+    from src.api.services.singleflight_service import SingleFlightService
+    return SingleFlightService(get_redis())
+
+@lru_cache()
+def get_job_queue_service() -> JobQueueService:
+    from src.api.services.job_queue_service import JobQueueService
+    jobs = JobQueueService(get_redis())
+    jobs.register("persist_chat_turn", get_chat_history_service().persist_chat_turn)
+    return jobs
+
 class RAGClients:
     def __init__(self):
         self.llm = get_llm_client()
@@ -67,6 +117,8 @@ class RAGClients:
         self.redis = get_redis_client()
         self.chat_history = get_chat_history_service()
         self.reranker = get_reranker_service()
+        self.singleflight = get_singleflight_service()
+        self.jobs = get_job_queue_service()
 
 @lru_cache()
 def get_rag_clients() -> RAGClients:
@@ -74,6 +126,7 @@ def get_rag_clients() -> RAGClients:
 
 @lru_cache()
 def get_rag_service() -> RAGService:
+    from src.api.services.rag_service import RAGService
     return RAGService(get_rag_clients())
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
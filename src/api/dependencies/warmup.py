@@ -0,0 +1,68 @@
+from functools import lru_cache
+from sqlalchemy import text
+import asyncio
+from src.api.services.warmup_service import WarmupService
+from src.api.dependencies.clients import (
+    get_embedding_client,
+    get_sparse_embedding_client,
+    get_reranker_client,
+    get_llm_client,
+    get_qdrant_client,
+    get_rag_service,
+    get_redis,
+)
+from src.clients.postgres import engine
+from src.core.settings import settings
+
+WARMUP_TEXT = "What is the minimum CGPA required to graduate?"
+
+
+async def _warm_embeddings():
+    client = await asyncio.to_thread(get_embedding_client)
+    await asyncio.to_thread(client.embed_query, WARMUP_TEXT)
+    await asyncio.to_thread(client.embed_documents, [WARMUP_TEXT])
+
+async def _warm_sparse_embeddings():
+    client = await asyncio.to_thread(get_sparse_embedding_client)
+    await asyncio.to_thread(client.embed_query, WARMUP_TEXT)
+    await asyncio.to_thread(client.embed_documents, [WARMUP_TEXT])
+
+async def _warm_reranker():
+    client = await asyncio.to_thread(get_reranker_client)
+    if client is not None:
+        await asyncio.to_thread(lambda: list(client.rerank(WARMUP_TEXT, [WARMUP_TEXT])))
+
+async def _warm_llm():
+    await asyncio.to_thread(get_llm_client)
+
+async def _warm_qdrant():
+    qdrant = await asyncio.to_thread(get_qdrant_client)
+    await qdrant.client.get_collections()
+    await asyncio.to_thread(qdrant.get_retriever)
+
+async def _warm_redis():
+    await get_redis().ping()
+
+async def _warm_postgres():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+async def _warm_rag_service():
+    await asyncio.to_thread(get_rag_service)
+
+
+@lru_cache()
+def get_warmup_service() -> WarmupService:
+    warmup = WarmupService()
+    if not settings.warmup_enabled:
+        return warmup
+    warmup.add_step("embedding_model", _warm_embeddings)
+    warmup.add_step("sparse_embedding_model", _warm_sparse_embeddings)
+    if settings.reranker_enabled:
+        warmup.add_step("reranker_model", _warm_reranker)
+    warmup.add_step("llm_client", _warm_llm)
+    warmup.add_step("qdrant", _warm_qdrant)
+    warmup.add_step("redis", _warm_redis)
+    warmup.add_step("postgres", _warm_postgres)
+    warmup.add_step("rag_service", _warm_rag_service)
+    return warmup
@@ -6,16 +6,32 @@ from src.api.routers.auth_microsoft import router as auth_microsoft_router
 from src.api.routers.auth import router as auth_router
 from src.api.routers.user import router as user_router
 from src.api.routers.sessions import router as session_router
-from src.api.dependencies.clients import get_redis_client, get_redis
+from src.api.routers.health import router as health_router
+from src.api.routers.admin import router as admin_router
+from src.api.dependencies.clients import get_redis_client, get_redis, get_job_queue_service
+from src.api.dependencies.warmup import get_warmup_service
 from fastapi_limiter import FastAPILimiter
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     redis_instance = get_redis()
     await FastAPILimiter.init(redis_instance)
+
+    warmup_task = asyncio.create_task(get_warmup_service().run())
+
+    stop_jobs = asyncio.Event()
+    job_worker = asyncio.create_task(get_job_queue_service().run_worker(stop_jobs))
     yield
+    if not warmup_task.done():
+        warmup_task.cancel()
+    stop_jobs.set()
+    try:
+        await asyncio.wait_for(job_worker, timeout=10)
+    except asyncio.TimeoutError:
+        job_worker.cancel()
 
 app = FastAPI(
     title="EMU RAG API",
@@ -37,15 +53,13 @@ app.add_middleware(
 async def root():
     return {"message": "Eastern Mediterranean University RAG API"}
 
-@app.get("/health")
-async def health():
-    return {"message": "OK"}
-
+app.include_router(health_router)
 app.include_router(auth_router)
 app.include_router(auth_microsoft_router)
 app.include_router(user_router)
 app.include_router(session_router)
 app.include_router(rag_router)
+app.include_router(admin_router)
 
 
 """uvicorn.run(app, host="0.0.0.0", port=8000)"""
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from src.api.dependencies.auth import get_admin_user
+from src.api.dependencies.clients import get_qdrant_client
+from src.api.schemas.admin import IndexManifest
+
+router = APIRouter(
+    prefix="/api/v1/admin",
+    tags=["admin"],
+    dependencies=[Depends(get_admin_user)],
+)
+
+@router.get("/index/manifest", response_model=IndexManifest)
+async def index_manifest():
+    # The first get_qdrant_client() call loads the SPLADE model; keep it off the event loop
+    qdrant = await run_in_threadpool(get_qdrant_client)
+    entries = await qdrant.aget_manifest()
+    collection = await qdrant.active_collection()
+    return IndexManifest(
+        alias=qdrant.collection_name,
+        collection=collection,
+        total_sources=len(entries),
+        total_chunks=sum(entry.get("chunks", 0) for entry in entries),
+        sources=entries,
+    )
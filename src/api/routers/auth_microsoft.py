@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi_sso.sso.microsoft import MicrosoftSSO
 from sqlmodel.ext.asyncio.session import AsyncSession
+from functools import lru_cache
 import logging
 import jwt
-from typing import Annotated, Optional
+from typing import TYPE_CHECKING, Annotated, Optional
 
 from src.core.settings import settings
 from src.api.dependencies.clients import get_db
@@ -13,6 +13,9 @@ from src.api.dependencies.auth import get_auth_service
 from src.api.dependencies.rate_limit import login_rate_limiter
 from fastapi.responses import JSONResponse
 
+if TYPE_CHECKING:
+    from fastapi_sso.sso.microsoft import MicrosoftSSO
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -20,17 +23,21 @@ router = APIRouter(
     tags=["auth"]
 )
 
-microsoft_sso = MicrosoftSSO(
-    client_id=settings.microsoft_client_id,
-    client_secret=settings.microsoft_client_secret,
-    tenant="common",
-    redirect_uri=settings.microsoft_redirect_uri,
-    allow_insecure_http=True,
-    scope=["openid", "email", "profile"]
-)
+@lru_cache()
+def get_microsoft_sso() -> "MicrosoftSSO":
+    from fastapi_sso.sso.microsoft import MicrosoftSSO
+    return MicrosoftSSO(
+        client_id=settings.microsoft_client_id,
+        client_secret=settings.microsoft_client_secret,
+        tenant="common",
+        redirect_uri=settings.microsoft_redirect_uri,
+        allow_insecure_http=True,
+        scope=["openid", "email", "profile"]
+    )
 
 @router.get("/microsoft/login", dependencies=[Depends(login_rate_limiter)])
 async def microsoft_login():
+    microsoft_sso = get_microsoft_sso()
     async with microsoft_sso:
         return await microsoft_sso.get_login_redirect()
 
@@ -41,6 +48,7 @@ async def microsoft_callback(
     db: Annotated[AsyncSession, Depends(get_db)],
     auth_service: Annotated[AuthService, Depends(get_auth_service)]
 ):
+    microsoft_sso = get_microsoft_sso()
     try:
         async with microsoft_sso:
             user_data = await microsoft_sso.verify_and_process(request)
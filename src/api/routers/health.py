@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from typing import Annotated
+from src.api.dependencies.warmup import get_warmup_service
+from src.api.dependencies.clients import get_reranker_service
+from src.api.services.warmup_service import WarmupService
+from src.core.settings import settings
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"],
+)
+
+@router.get("")
+@router.get("/live")
+async def liveness():
+    return {"message": "OK"}
+
+@router.get("/ready")
+async def readiness(
+    warmup: Annotated[WarmupService, Depends(get_warmup_service)],
+):
+    status = warmup.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@router.get("/reranker")
+async def reranker_stats():
+    if not settings.reranker_enabled:
+        return {"enabled": False}
+    return get_reranker_service().stats()
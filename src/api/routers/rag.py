@@ -1,9 +1,8 @@
-from fastapi import APIRouter, Depends, Header, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, Request
 from fastapi.responses import StreamingResponse
 from typing import TYPE_CHECKING, Annotated, Optional
 import uuid
-from sqlmodel.ext.asyncio.session import AsyncSession
-from src.api.dependencies.clients import get_rag_service, get_db
+from src.api.dependencies.clients import get_rag_service
 from src.api.dependencies.auth import get_current_user_optional
 from src.api.models.user import User
 from src.api.dependencies.rate_limit import anonymous_rag_rate_limiter, authenticated_rag_rate_limiter
@@ -27,9 +26,9 @@ router = APIRouter(
 async def ask(
     request: Request,
     query: str,
+    background_tasks: BackgroundTasks,
     rag_service: Annotated["RAGService", Depends(get_rag_service)],
     user: Annotated[Optional[User], Depends(get_current_user_optional)],
-    db: Annotated[AsyncSession, Depends(get_db)],
     x_session_id: Annotated[Optional[str], Header()] = None,
 ):
     request.state.is_authenticated = user is not None
@@ -37,7 +36,9 @@ async def ask(
     
     async def generator():
         try:
-            async for event in rag_service.generate_response(query, session_id, user, db):
+            async for event in rag_service.generate_response(
+                query, session_id, user, background_tasks=background_tasks
+            ):
                 yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
         except Exception as e:
             error_event = {
@@ -49,6 +50,7 @@ async def ask(
     return StreamingResponse(
         generator(),
         media_type="text/event-stream; charset=utf-8",
+        background=background_tasks,
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, Query
-from typing import Annotated, List
+from typing import TYPE_CHECKING, Annotated, List
 from src.api.models.user import User
 from src.api.models.chat import ChatMessageRole
 from src.api.dependencies.auth import get_current_user_required, get_current_user_optional
@@ -7,23 +7,25 @@ from src.api.dependencies.clients import get_db, get_chat_history_service
 from sqlmodel.ext.asyncio.session import AsyncSession
 from src.api.selectors.chat.get_session import get_chat_sessions
 from src.api.schemas.session import ChatSessionList, ChatMessageRead
-from src.api.services.chat_history_service import ChatHistoryService
-from llama_index.core.llms import MessageRole
 import uuid
 from src.api.dependencies.rate_limit import general_rate_limiter
 
+if TYPE_CHECKING:
+    from llama_index.core.llms import MessageRole
+    from src.api.services.chat_history_service import ChatHistoryService
+
 router = APIRouter(
     prefix="/api/v1",
     tags=["sessions"],
 )
 
-def _llama_role_to_chat_role(role: MessageRole) -> ChatMessageRole:
-    mapping = {
-        MessageRole.USER: ChatMessageRole.USER,
-        MessageRole.ASSISTANT: ChatMessageRole.ASSISTANT,
-        MessageRole.SYSTEM: ChatMessageRole.SYSTEM,
-    }
-    return mapping.get(role, ChatMessageRole.USER)
+def _llama_role_to_chat_role(role: "MessageRole") -> ChatMessageRole:
+    # MessageRole shares its string values with ChatMessageRole; matching on the value
+    # avoids importing llama_index when the router is loaded.
+    try:
+        return ChatMessageRole(getattr(role, "value", role))
+    except ValueError:
+        return ChatMessageRole.USER
 
 @router.get("/sessions", response_model=List[ChatSessionList], dependencies=[Depends(general_rate_limiter)])
 async def list_sessions(
@@ -42,7 +44,7 @@ async def list_sessions(
 @router.get("/sessions/{session_id}/messages", response_model=List[ChatMessageRead], dependencies=[Depends(general_rate_limiter)])
 async def get_messages(
     session_id: uuid.UUID,
-    chat_history_service: Annotated[ChatHistoryService, Depends(get_chat_history_service)],
+    chat_history_service: Annotated["ChatHistoryService", Depends(get_chat_history_service)],
     user: Annotated[User, Depends(get_current_user_optional)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
@@ -62,7 +64,7 @@ async def get_messages(
 @router.delete("/sessions/{session_id}", dependencies=[Depends(general_rate_limiter)])
 async def delete_session(
     session_id: uuid.UUID,
-    chat_history_service: Annotated[ChatHistoryService, Depends(get_chat_history_service)],
+    chat_history_service: Annotated["ChatHistoryService", Depends(get_chat_history_service)],
     user: Annotated[User, Depends(get_current_user_required)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
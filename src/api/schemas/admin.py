@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class ManifestEntry(BaseModel):
+    source: str
+    document_title: Optional[str] = None
+    chunks: int
+    content_hash: str
+    embedding_model: str
+    ingested_at: str
+
+
+class IndexManifest(BaseModel):
+    alias: str
+    collection: str
+    total_sources: int
+    total_chunks: int
+    sources: List[ManifestEntry]
@@ -1,20 +1,20 @@
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select, delete
 from src.api.models.chat import ChatSession, ChatMessage, ChatMessageRole
-from llama_index.core.llms import ChatMessage as LlamaChatMessage, MessageRole
-from typing import List
+from typing import TYPE_CHECKING, List
 
-def llama_to_db_role(llama_role: MessageRole) -> ChatMessageRole:
-    mapping = {
-        MessageRole.USER: ChatMessageRole.USER,
-        MessageRole.ASSISTANT: ChatMessageRole.ASSISTANT,
-        MessageRole.SYSTEM: ChatMessageRole.SYSTEM,
-    }
-    return mapping.get(llama_role, ChatMessageRole.USER)
+if TYPE_CHECKING:
+    from llama_index.core.llms import ChatMessage as LlamaChatMessage, MessageRole
+
+def llama_to_db_role(llama_role: "MessageRole") -> ChatMessageRole:
+    try:
+        return ChatMessageRole(getattr(llama_role, "value", llama_role))
+    except ValueError:
+        return ChatMessageRole.USER
 
 async def save_messages_to_db(
     session: ChatSession, 
-    messages: List[LlamaChatMessage],
+    messages: List["LlamaChatMessage"],
     db: AsyncSession,
     replace_existing: bool = True
 ) -> List[ChatMessage]:
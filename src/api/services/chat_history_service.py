@@ -9,6 +9,8 @@ from src.api.selectors.chat.create_session import create_sessions
 from src.api.selectors.chat.save_messages import save_messages_to_db
 from src.api.selectors.chat.get_messages import get_chat_messages_by_session
 from src.api.selectors.chat.delete_chat_session import delete_chat_session
+from src.api.selectors.user.get_user import get_user_by_id
+from src.clients.postgres import async_session
 import uuid
 import logging
 from src.core.settings import settings
@@ -166,4 +168,14 @@ class ChatHistoryService:
             logger.warning(f"Failed to migrate anonymous session to user in Redis: {e}.")
             return None
 
-    
\ No newline at end of file
+    async def persist_chat_turn(self, payload: dict) -> None:
+        """
+        Job handler: sync the session to Postgres. The assistant reply is already in
+        Redis (written before the final stream event), so only the snapshot is deferred.
+        """
+        session_id = uuid.UUID(payload["session_id"])
+
+        async with async_session() as db:
+            user = await get_user_by_id(payload["user_id"], db) if payload.get("user_id") else None
+            if user:
+                await self.sync_to_postgres(session_id, user, db, title=payload.get("title"))
@@ -0,0 +1,131 @@
+from __future__ import annotations
+from typing import Any, Awaitable, Callable
+import asyncio
+import json
+import logging
+import time
+import uuid
+import redis.asyncio as redis
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+
+class JobQueueService:
+    """
+    Durable post-response work backed by Redis lists.
+
+    queue -> processing -> (done | delayed retry | dead letter)
+    """
+
+    QUEUE_KEY = "jobs:queue"
+    PROCESSING_KEY = "jobs:processing"
+    STARTED_KEY = "jobs:started"
+    DELAYED_KEY = "jobs:delayed"
+    DEAD_LETTER_KEY = "jobs:dead"
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        max_attempts: int = settings.job_max_attempts,
+        retry_base_delay: float = settings.job_retry_base_delay,
+        visibility_timeout: int = settings.job_visibility_timeout,
+    ):
+        self.redis = redis_client
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.visibility_timeout = visibility_timeout
+        # Stale jobs are looked for at startup and then periodically, not only on the next deploy
+        self.recover_interval = max(visibility_timeout / 2, 1)
+        self._handlers: dict[str, JobHandler] = {}
+
+    def register(self, name: str, handler: JobHandler) -> None:
+        self._handlers[name] = handler
+
+    async def enqueue(self, name: str, payload: dict[str, Any]) -> None:
+        if name not in self._handlers:
+            raise ValueError(f"No handler registered for job '{name}'")
+        job = {"id": uuid.uuid4().hex, "name": name, "payload": payload, "attempts": 0}
+        try:
+            await self.redis.lpush(self.QUEUE_KEY, json.dumps(job, ensure_ascii=False))
+        except Exception as e:
+            logger.warning(f"Failed to enqueue job '{name}': {e}. Running inline.")
+            await self._handlers[name](payload)
+
+    async def run_worker(self, stop: asyncio.Event, poll_timeout: int = 1) -> None:
+        await self._recover_stale()
+        last_recovery = time.monotonic()
+        logger.info("Job worker started")
+        while not stop.is_set():
+            try:
+                if time.monotonic() - last_recovery >= self.recover_interval:
+                    last_recovery = time.monotonic()
+                    await self._recover_stale()
+                await self._promote_due()
+                raw = await self.redis.blmove(
+                    self.QUEUE_KEY, self.PROCESSING_KEY, poll_timeout, "RIGHT", "LEFT"
+                )
+                if raw is not None:
+                    await self._process(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Job worker error: {e}")
+                await asyncio.sleep(poll_timeout)
+        logger.info("Job worker stopped")
+
+    async def _process(self, raw: str) -> None:
+        job = json.loads(raw)
+        await self.redis.hset(self.STARTED_KEY, job["id"], time.time())
+        try:
+            handler = self._handlers.get(job["name"])
+            if handler is None:
+                raise ValueError(f"No handler registered for job '{job['name']}'")
+            await handler(job["payload"])
+        except Exception as e:
+            await self._fail(job, e)
+        finally:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.lrem(self.PROCESSING_KEY, 1, raw)
+                pipe.hdel(self.STARTED_KEY, job["id"])
+                await pipe.execute()
+
+    async def _fail(self, job: dict, error: Exception) -> None:
+        job["attempts"] += 1
+        job["last_error"] = str(error)
+        if job["attempts"] >= self.max_attempts:
+            logger.error(f"Job {job['name']}:{job['id']} moved to dead letter after {job['attempts']} attempts: {error}")
+            await self.redis.lpush(self.DEAD_LETTER_KEY, json.dumps(job, ensure_ascii=False))
+            return
+        delay = self.retry_base_delay * (2 ** (job["attempts"] - 1))
+        logger.warning(f"Job {job['name']}:{job['id']} failed (attempt {job['attempts']}), retrying in {delay:.1f}s: {error}")
+        await self.redis.zadd(self.DELAYED_KEY, {json.dumps(job, ensure_ascii=False): time.time() + delay})
+
+    async def _promote_due(self) -> None:
+        due = await self.redis.zrangebyscore(self.DELAYED_KEY, "-inf", time.time())
+        for raw in due:
+            if await self.redis.zrem(self.DELAYED_KEY, raw):
+                await self.redis.lpush(self.QUEUE_KEY, raw)
+
+    async def _recover_stale(self) -> None:
+        """
+        Requeue jobs left in processing by a worker that died mid-job. A job with
+        no start time may have just been taken by another worker, so it is only
+        stamped now and requeued once that stamp is older than the visibility timeout.
+        """
+        now = time.time()
+        for raw in await self.redis.lrange(self.PROCESSING_KEY, 0, -1):
+            job_id = json.loads(raw)["id"]
+            await self.redis.hsetnx(self.STARTED_KEY, job_id, now)
+            started = await self.redis.hget(self.STARTED_KEY, job_id)
+            if started is not None and now - float(started) < self.visibility_timeout:
+                continue
+            if await self.redis.lrem(self.PROCESSING_KEY, 1, raw):
+                await self.redis.hdel(self.STARTED_KEY, job_id)
+                await self.redis.lpush(self.QUEUE_KEY, raw)
+                logger.info(f"Requeued stale job {job_id}")
+
+    async def dead_letters(self, limit: int = 50) -> list[dict]:
+        return [json.loads(raw) for raw in await self.redis.lrange(self.DEAD_LETTER_KEY, 0, limit - 1)]
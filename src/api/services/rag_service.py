@@ -1,4 +1,5 @@
 from __future__ import annotations
+from contextlib import aclosing
 from typing import TYPE_CHECKING, Optional
 import uuid
 import re
@@ -7,7 +8,7 @@ from src.api.schemas.rag import SourceDocument, RetrievalResult
 from src.core.settings import settings
 
 if TYPE_CHECKING:
-    from sqlmodel.ext.asyncio.session import AsyncSession
+    from fastapi import BackgroundTasks
     from src.api.models.user import User
     from src.api.dependencies.clients import RAGClients
 
@@ -34,14 +35,16 @@ class RAGService:
         self.clients = rag_clients
 
     async def retrieve_context(self, query: str, top_k: int = settings.retrieval_top_k) -> RetrievalResult:
-        fetch_k = settings.retrieval_top_k if self.clients.reranker.enabled else top_k
+        fetch_k = max(settings.reranker_fetch_k, top_k) if self.clients.reranker.enabled else top_k
         
         retriever = self.clients.qdrant.get_retriever(top_k=fetch_k)
         nodes = await retriever.aretrieve(query)
         
-        nodes = self.clients.reranker.rerank_items(
+        nodes = await self.clients.reranker.arerank_items(
             query, nodes, 
             key=lambda n: n.node.get_content(), 
+            id_fn=lambda n: n.node.node_id,
+            score_fn=lambda n: n.score,
             top_k=top_k
         )
         
@@ -80,20 +83,53 @@ class RAGService:
         messages.append(ChatMessage(content=query, role=MessageRole.USER))
         return messages
 
+    async def _stream_answer(
+        self,
+        query: str,
+        history: list[ChatMessage] | None,
+        top_k: int = settings.retrieval_top_k
+    ):
+        retrieval = await self.retrieve_context(query, top_k)
+        messages = self._build_messages(query, retrieval.context, history)
+
+        llm = self.clients.llm.get_llm()
+        stream = await llm.astream_chat(messages)
+
+        full_answer = ""
+        async for chunk in stream:
+            token = chunk.delta
+            full_answer += token
+            yield {"type": "token", "content": token}
+
+        yield {
+            "type": "answer",
+            "answer": full_answer,
+            "sources": [s.model_dump() for s in retrieval.sources],
+        }
+
+    async def _answer_events(self, query: str, history: list[ChatMessage], top_k: int):
+        singleflight = self.clients.singleflight
+        if history or not settings.singleflight_enabled:
+            events = self._stream_answer(query, history, top_k)
+        else:
+            collection = await self.clients.qdrant.active_collection()
+            key = f"{singleflight.make_key(query, collection)}:{top_k}"
+            events = singleflight.run(key, lambda: self._stream_answer(query, None, top_k))
+        async with aclosing(events):
+            async for event in events:
+                yield event
+
     async def generate_response(
         self, 
         query: str, 
         session_id: uuid.UUID,
         user: Optional["User"] = None,
-        db: Optional["AsyncSession"] = None,
-        top_k: int = settings.retrieval_top_k
+        top_k: int = settings.retrieval_top_k,
+        background_tasks: Optional["BackgroundTasks"] = None
     ):
         chat_history = self.clients.chat_history
         
         history = await chat_history.get_messages(session_id, user)
-        retrieval = await self.retrieve_context(query, top_k)
-        messages = self._build_messages(query, retrieval.context, history)
-
 
         await chat_history.add_message(
             session_id, 
@@ -101,25 +137,31 @@ class RAGService:
             role=MessageRole.USER), user
         )
         
-        llm = self.clients.llm.get_llm()
-        stream = await llm.astream_chat(messages)
-        
         full_answer = ""
-        async for chunk in stream:
-            token = chunk.delta
-            full_answer += token
-            yield {"type": "token", "content": token}
+        sources = []
+        async for event in self._answer_events(query, history, top_k):
+            if event["type"] == "answer":
+                full_answer = event["answer"]
+                sources = event["sources"]
+            else:
+                yield event
+
+        # Written before the final event, so the next question always sees this turn in order
+        await chat_history.add_message(session_id, ChatMessage(content=full_answer, role=MessageRole.ASSISTANT), user)
+
+        if user:
+            # Only the Postgres sync is deferred; it snapshots whatever Redis holds when it runs
+            payload = {"session_id": str(session_id), "user_id": user.id, "title": query[:100]}
+            if background_tasks is not None:
+                background_tasks.add_task(self.clients.jobs.enqueue, "persist_chat_turn", payload)
+            else:
+                await self.clients.jobs.enqueue("persist_chat_turn", payload)
 
         yield {
             "type": "final_response",
             "answer": full_answer,
-            "sources": [s.model_dump() for s in retrieval.sources], 
+            "sources": sources, 
             "query": query,
             "session_id": str(session_id),
             "has_answer": "don't know" not in full_answer.lower()
         }
-
-        await chat_history.add_message(session_id, ChatMessage(content=full_answer, role=MessageRole.ASSISTANT), user)
-
-        if user and db:
-            await chat_history.sync_to_postgres(session_id, user, db, title=query[:100])
@@ -1,37 +1,220 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, TypeVar
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, TypeVar
+import asyncio
+import hashlib
+import logging
+import math
+import time
 from src.api.schemas.rag import RerankResult
 from src.core.settings import settings
 
 if TYPE_CHECKING:
     from src.clients.reranker_client import RerankerClient
+    from src.inference.batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
 
 class RerankerService:
-    def __init__(self, client: "RerankerClient | None"):
+    def __init__(
+        self,
+        client: "RerankerClient | None",
+        deadline_ms: float = settings.reranker_deadline_ms,
+        cache_size: int = settings.reranker_cache_size,
+        max_batch: int = settings.reranker_max_batch,
+    ):
         self.client = client
         self.enabled = client is not None and settings.reranker_enabled
-    
+        self.deadline = deadline_ms / 1000
+        self.cache_size = cache_size
+        self.max_batch = max_batch
+        # (query hash, chunk id, text hash): point ids are stable across re-chunking, the text is not
+        self._cache: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+        self._batcher: "MicroBatcher | None" = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._latencies_ms: deque[float] = deque(maxlen=1000)
+        self._counters = {
+            "requests": 0, "timeouts": 0, "errors": 0, "cache_hits": 0, "cache_misses": 0,
+            "gate_skipped": 0, "gate_applied": 0,
+        }
+
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        return hashlib.sha256(" ".join(query.lower().split()).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # One thread: ONNX Runtime already parallelises within a batch
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reranker")
+        return self._executor
+
+    def _get_batcher(self) -> "MicroBatcher":
+        # Created lazily: the batcher worker must start inside the running event loop
+        if self._batcher is None:
+            from src.inference.batcher import MicroBatcher
+            self._batcher = MicroBatcher(
+                self.client.rerank_pairs,
+                self._get_executor(),
+                max_batch=self.max_batch,
+                max_wait_ms=settings.inference_max_wait_ms,
+                name="reranker",
+            )
+            self._batcher.start()
+        return self._batcher
+
+    def _cache_get(self, key: tuple[str, str, str]) -> float | None:
+        score = self._cache.get(key)
+        if score is not None:
+            self._cache.move_to_end(key)
+        return score
+
+    def _cache_put(self, key: tuple[str, str, str], score: float) -> None:
+        self._cache[key] = score
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _store_scores(self, keys: list[tuple[str, str, str]], future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        for key, score in zip(keys, future.result()):
+            self._cache_put(key, float(score))
+
+    async def _compute(self, query: str, texts: list[str], ids: list[str]) -> list[float]:
+        if hasattr(self.client, "score_chunks"):
+            # Late interaction: MaxSim over stored token vectors is cheap, no cross-request batching needed
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), self.client.score_chunks, query, ids, texts)
+        return await self._get_batcher().submit(list(zip([query] * len(texts), texts)))
+
+    async def _score(self, query: str, texts: list[str], ids: list[str]) -> list[float] | None:
+        """Cross-encoder scores for each text, or None if the deadline was missed."""
+        query_hash = self._query_hash(query)
+        keys = [(query_hash, chunk_id, self._text_hash(text)) for chunk_id, text in zip(ids, texts)]
+        scores = [self._cache_get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+        self._counters["cache_hits"] += len(keys) - len(missing)
+        self._counters["cache_misses"] += len(missing)
+        if not missing:
+            return scores
+
+        missing_keys = [keys[i] for i in missing]
+        task = asyncio.ensure_future(self._compute(query, [texts[i] for i in missing], [ids[i] for i in missing]))
+        # Late results still land in the cache, so a retry of the same query is free
+        task.add_done_callback(lambda f: self._store_scores(missing_keys, f))
+        try:
+            fresh = await asyncio.wait_for(asyncio.shield(task), timeout=self.deadline)
+        except asyncio.TimeoutError:
+            self._counters["timeouts"] += 1
+            logger.warning(f"Reranker missed {self.deadline * 1000:.0f}ms deadline, keeping retrieval order")
+            return None
+
+        for i, score in zip(missing, fresh):
+            scores[i] = float(score)
+        return scores
+
+    @staticmethod
+    def score_confidence(scores: list[float], temperature: float = settings.reranker_gate_temperature) -> tuple[float, float]:
+        """Top-1 margin and normalized softmax entropy (0 = one clear winner, 1 = flat) of retrieval scores."""
+        ranked = sorted(scores, reverse=True)
+        margin = ranked[0] - ranked[1] if len(ranked) > 1 else math.inf
+        if len(ranked) < 2:
+            return margin, 0.0
+        weights = [math.exp((s - ranked[0]) / temperature) for s in ranked]
+        total = sum(weights)
+        entropy = -sum((w / total) * math.log(w / total) for w in weights if w > 0)
+        return margin, entropy / math.log(len(ranked))
+
+    def _is_ambiguous(self, scores: list[float]) -> bool:
+        margin, entropy = self.score_confidence(scores)
+        return margin < settings.reranker_gate_min_margin or entropy > settings.reranker_gate_max_entropy
+
+    async def arerank_items(
+        self,
+        query: str,
+        items: list[T],
+        key: Callable[[T], str],
+        id_fn: Callable[[T], str],
+        top_k: int = settings.reranker_top_k,
+        score_fn: Callable[[T], float | None] | None = None,
+    ) -> list[T]:
+        """
+        Rerank off the event loop; falls back to the fused retrieval order on timeout or error.
+        With score_fn, the cross-encoder only runs when the retrieval ranking is ambiguous.
+        """
+        if not self.enabled or not items:
+            return items[:top_k]
+
+        if score_fn is not None and settings.reranker_gate_enabled:
+            retrieval_scores = [score_fn(item) for item in items]
+            # Without a score for every item the gate cannot decide; rerank without counting it
+            if all(s is not None for s in retrieval_scores):
+                if not self._is_ambiguous(retrieval_scores):
+                    self._counters["gate_skipped"] += 1
+                    return items[:top_k]
+                self._counters["gate_applied"] += 1
+
+        self._counters["requests"] += 1
+        start = time.perf_counter()
+        try:
+            scores = await self._score(query, [key(item) for item in items], [id_fn(item) for item in items])
+        except Exception as e:
+            self._counters["errors"] += 1
+            logger.warning(f"Reranking failed, keeping retrieval order: {e}")
+            scores = None
+        finally:
+            self._latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        if scores is None:
+            return items[:top_k]
+        ranked = sorted(range(len(items)), key=lambda i: scores[i], reverse=True)
+        return [items[i] for i in ranked[:top_k]]
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies_ms)
+
+        def percentile(p: float) -> float | None:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 2)
+
+        return {
+            "enabled": self.enabled,
+            "model": getattr(self.client, "model_name", None),
+            "deadline_ms": self.deadline * 1000,
+            "gate_enabled": settings.reranker_gate_enabled,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "cache_entries": len(self._cache),
+            **self._counters,
+        }
+
     def rerank_texts(self, query: str, texts: list[str], top_k: int = settings.reranker_top_k) -> list[RerankResult]:
         if not self.enabled or not texts:
             return [RerankResult(text=t, score=1.0, index=i) for i, t in enumerate(texts[:top_k])]
-        
+
         results = list(self.client.rerank(query, texts))
-        
+
         scored = []
         for i, r in enumerate(results):
             score = r.score if hasattr(r, 'score') else (r.relevance_score if hasattr(r, 'relevance_score') else float(r))
             doc = r.document if hasattr(r, 'document') else texts[i]
             scored.append(RerankResult(text=doc, score=score, index=i))
-        
+
         return sorted(scored, key=lambda x: x.score, reverse=True)[:top_k]
-    
+
     def rerank_items(self, query: str, items: list[T], key: callable, top_k: int = settings.reranker_top_k) -> list[T]:
         if not self.enabled or not items:
             return items[:top_k]
-        
+
         texts = [key(item) for item in items]
         results = list(self.client.rerank(query, texts))
 
@@ -41,6 +224,6 @@ class RerankerService:
             if hasattr(r, 'relevance_score'):
                 return r.relevance_score
             return float(r)
-        
+
         scored = sorted(enumerate(results), key=lambda x: get_score(x[1]), reverse=True)
         return [items[i] for i, _ in scored[:top_k]]
@@ -0,0 +1,239 @@
+from __future__ import annotations
+from typing import AsyncIterator, Awaitable, Callable, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import uuid
+import redis.asyncio as redis
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+EventFactory = Callable[[], AsyncIterator[dict]]
+
+DONE_EVENT = "flight_done"
+ERROR_EVENT = "flight_error"
+
+
+class SingleFlightError(RuntimeError):
+    pass
+
+
+class _Flight:
+    """In-process broadcaster: every subscriber replays the full event log."""
+
+    def __init__(self):
+        self.events: list[dict] = []
+        self.done = False
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self.channel: Optional[str] = None  # Redis channel while this worker leads
+        self._cond = asyncio.Condition()
+
+    async def publish(self, event: dict) -> None:
+        async with self._cond:
+            self.events.append(event)
+            if event["type"] in (DONE_EVENT, ERROR_EVENT):
+                self.done = True
+            self._cond.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[dict]:
+        position = 0
+        while True:
+            async with self._cond:
+                await self._cond.wait_for(lambda: position < len(self.events))
+                batch = self.events[position:]
+            position += len(batch)
+            for event in batch:
+                if event["type"] == DONE_EVENT:
+                    return
+                if event["type"] == ERROR_EVENT:
+                    raise SingleFlightError(event.get("error", "Generation failed"))
+                yield event
+
+
+class SingleFlightService:
+    LOCK_PREFIX = "singleflight:lock:"
+    EVENTS_PREFIX = "singleflight:events:"
+    CHANNEL_PREFIX = "singleflight:channel:"
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis],
+        lock_ttl: int = settings.singleflight_lock_ttl,
+        wait_timeout: float = settings.singleflight_wait_timeout,
+    ):
+        self.redis = redis_client
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self._flights: dict[str, _Flight] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        query = re.sub(r"\s+", " ", query).strip().lower()
+        return query.rstrip("?!. ")
+
+    def make_key(self, query: str, collection: str) -> str:
+        """
+        `collection` is the physical collection the answer is retrieved from (the
+        alias target), so flights, locks and event logs rotate with a reindex swap.
+        """
+        digest = hashlib.sha256(self.normalize_query(query).encode("utf-8")).hexdigest()
+        return f"{collection}:{digest}"
+
+    async def run(self, key: str, factory: EventFactory) -> AsyncIterator[dict]:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            self._flights[key] = flight
+            flight.task = self._spawn(self._drive(key, flight, factory))
+        else:
+            logger.info(f"Joined in-flight generation {key}")
+
+        flight.subscribers += 1
+        try:
+            async for event in flight.subscribe():
+                yield event
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                self._spawn(self._abandon(key, flight))
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _abandon(self, key: str, flight: _Flight) -> None:
+        """
+        Every local subscriber disconnected. Nothing is cached from a flight, so the
+        generation is cancelled unless followers on other workers still relay it.
+        """
+        if flight.channel is not None and self.redis is not None:
+            try:
+                [(_, remote)] = await self.redis.pubsub_numsub(flight.channel)
+                if remote:
+                    return
+            except Exception as e:
+                logger.warning(f"Could not count single-flight followers: {e}")
+        if flight.subscribers == 0 and not flight.done and flight.task is not None:
+            logger.info(f"Cancelling abandoned generation {key}")
+            flight.task.cancel()
+
+    async def _drive(self, key: str, flight: _Flight, factory: EventFactory) -> None:
+        try:
+            flight_id = await self._acquire_or_follow(key, flight)
+            if flight_id is not None:
+                await self._lead(key, flight_id, flight, factory)
+        except Exception as e:
+            logger.exception(f"Single-flight generation {key} failed: {e}")
+            if not flight.done:
+                await flight.publish({"type": ERROR_EVENT, "error": str(e)})
+        finally:
+            self._flights.pop(key, None)
+
+    async def _acquire_or_follow(self, key: str, flight: _Flight) -> Optional[str]:
+        """Return a flight id when this worker leads, or None after relaying a remote leader."""
+        flight_id = uuid.uuid4().hex
+        if self.redis is None:
+            return flight_id
+
+        lock_key = f"{self.LOCK_PREFIX}{key}"
+        for _ in range(3):
+            try:
+                if await self.redis.set(lock_key, flight_id, nx=True, ex=self.lock_ttl):
+                    return flight_id
+                remote_id = await self.redis.get(lock_key)
+            except Exception as e:
+                logger.warning(f"Single-flight lock unavailable: {e}. Generating locally.")
+                return flight_id
+
+            if remote_id and await self._follow(key, remote_id, flight):
+                return None
+        return flight_id
+
+    async def _lead(self, key: str, flight_id: str, flight: _Flight, factory: EventFactory) -> None:
+        events_key = f"{self.EVENTS_PREFIX}{key}:{flight_id}"
+        channel = f"{self.CHANNEL_PREFIX}{key}:{flight_id}"
+        remote = self.redis is not None
+        flight.channel = channel
+
+        async def emit(event: dict) -> None:
+            nonlocal remote
+            await flight.publish(event)
+            if not remote:
+                return
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.rpush(events_key, json.dumps(event, ensure_ascii=False))
+                    pipe.expire(events_key, self.lock_ttl)
+                    pipe.publish(channel, "1")
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Single-flight broadcast to Redis failed: {e}. Serving local subscribers only.")
+                remote = False
+
+        try:
+            async for event in factory():
+                await emit(event)
+            await emit({"type": DONE_EVENT})
+        except asyncio.CancelledError:
+            # Followers that joined in the meantime stop instead of waiting on the lock
+            await emit({"type": ERROR_EVENT, "error": "Generation cancelled"})
+            raise
+        except Exception as e:
+            await emit({"type": ERROR_EVENT, "error": str(e)})
+            raise
+        finally:
+            if self.redis is not None:
+                try:
+                    lock_key = f"{self.LOCK_PREFIX}{key}"
+                    if await self.redis.get(lock_key) == flight_id:
+                        await self.redis.delete(lock_key)
+                except Exception as e:
+                    logger.warning(f"Failed to release single-flight lock: {e}")
+
+    async def _follow(self, key: str, flight_id: str, flight: _Flight) -> bool:
+        """Relay a leader on another worker. Returns False if it vanished before emitting anything."""
+        events_key = f"{self.EVENTS_PREFIX}{key}:{flight_id}"
+        channel = f"{self.CHANNEL_PREFIX}{key}:{flight_id}"
+        pubsub = self.redis.pubsub()
+        position = 0
+        try:
+            await pubsub.subscribe(channel)
+            while True:
+                raw_events = await self.redis.lrange(events_key, position, -1)
+                position += len(raw_events)
+                for raw in raw_events:
+                    event = json.loads(raw)
+                    await flight.publish(event)
+                    if event["type"] in (DONE_EVENT, ERROR_EVENT):
+                        return True
+
+                message = await self._wait_for_message(pubsub)
+                if message is None and not await self._leader_alive(key, flight_id):
+                    if position == 0:
+                        return False
+                    raise SingleFlightError("Generation on another worker stopped responding")
+        finally:
+            try:
+                await pubsub.unsubscribe(channel)
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    async def _wait_for_message(self, pubsub) -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(
+                pubsub.get_message(ignore_subscribe_messages=True, timeout=self.wait_timeout),
+                timeout=self.wait_timeout + 1,
+            )
+        except asyncio.TimeoutError:
+            return None
+
+    async def _leader_alive(self, key: str, flight_id: str) -> bool:
+        return await self.redis.get(f"{self.LOCK_PREFIX}{key}") == flight_id
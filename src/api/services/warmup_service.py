@@ -0,0 +1,88 @@
+from typing import Awaitable, Callable, Optional
+import asyncio
+import logging
+import time
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+WarmupStep = Callable[[], Awaitable[object]]
+
+
+class WarmupService:
+    """
+    Runs the warm-up steps at boot. Failed steps (a dependency not up yet, a
+    model download hiccup) are retried with exponential backoff until
+    `retry_deadline` seconds after the start; only then is the warm-up finished.
+    """
+
+    def __init__(
+        self,
+        retry_deadline: float = settings.warmup_retry_deadline,
+        retry_base_delay: float = settings.warmup_retry_base_delay,
+        retry_max_delay: float = 30.0,
+    ):
+        self.retry_deadline = retry_deadline
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._steps: list[tuple[str, WarmupStep]] = []
+        self.results: dict[str, dict] = {}
+        self.started = False
+        self.finished = False
+        self.total_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.finished and all(r["ok"] for r in self.results.values())
+
+    def add_step(self, name: str, step: WarmupStep) -> None:
+        self._steps.append((name, step))
+
+    async def _run_step(self, name: str, step: WarmupStep, attempt: int) -> bool:
+        step_start = time.perf_counter()
+        try:
+            await step()
+            self.results[name] = {
+                "ok": True,
+                "seconds": round(time.perf_counter() - step_start, 3),
+                "attempts": attempt,
+            }
+            logger.info(f"Warm-up step '{name}' finished in {self.results[name]['seconds']}s")
+            return True
+        except Exception as e:
+            self.results[name] = {
+                "ok": False,
+                "seconds": round(time.perf_counter() - step_start, 3),
+                "attempts": attempt,
+                "error": str(e),
+            }
+            logger.error(f"Warm-up step '{name}' failed (attempt {attempt}): {e}")
+            return False
+
+    async def run(self) -> bool:
+        self.started = True
+        started_at = time.perf_counter()
+        pending = list(self._steps)
+        attempt = 0
+        while pending:
+            attempt += 1
+            pending = [(name, step) for name, step in pending if not await self._run_step(name, step, attempt)]
+            remaining = self.retry_deadline - (time.perf_counter() - started_at)
+            if not pending or remaining <= 0:
+                break
+            delay = min(self.retry_base_delay * 2 ** (attempt - 1), self.retry_max_delay, remaining)
+            logger.warning(f"Retrying {len(pending)} warm-up steps in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        self.total_seconds = round(time.perf_counter() - started_at, 3)
+        self.finished = True
+        logger.info(f"Warm-up finished in {self.total_seconds}s (ready={self.ready})")
+        return self.ready
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "finished": self.finished,
+            "total_seconds": self.total_seconds,
+            "steps": self.results,
+        }
@@ -11,9 +11,10 @@ Output: List of Chunk objects ready for embedding
 """
 import re
 import logging
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -36,8 +37,15 @@ from src.chunkers.models import (
     TableBlock,
     ListBlock,
 )
-from src.scrapers.structured_scraper import detect_article_boundary
-from src.api.dependencies.clients import get_embedding_client, get_qdrant_client
+from src.scrapers.doc_scraper import detect_article_boundary
+from src.chunkers.index_diff import (
+    IndexDiff, SourceManifest, diff_against_index, point_id, stamp_content_hash, text_hash
+)
+from src.api.dependencies.clients import get_embedding_client, get_qdrant_client, get_sparse_embedding_client
+from src.core.settings import settings
+from src.clients.embedding_profiles import get_embedding_profile
+from src.clients.qdrant import QdrantClientManager
+from src.core.parallel import process_map
 
 logger = logging.getLogger(__name__)
 
@@ -198,61 +206,45 @@ class ArticleSerializer:
                 lines.append(f"• {item}")
         return "\n".join(lines)
     
-    def serialize_article(self, article: Article) -> str:
-        """Convert Article to clean text for embedding."""
-        lines = []
-        
-        # Header
-        if article.article_title:
-            lines.append(f"Article {article.article_number} – {article.article_title}")
-        else:
-            lines.append(f"Article {article.article_number}")
-        
-        # Include section context if available
-        if article.section_title:
-            lines.append(f"Section: {article.section_title}")
-        
-        lines.append(f"Source: {article.source}")
-        lines.append("")  # Blank line after header
-        
-        # Content
-        for block in article.blocks:
+    def render_blocks(self, blocks: List[Block]) -> List[Optional[str]]:
+        """Text of each block as it appears in a chunk; None for blocks that render to nothing."""
+        fragments: List[Optional[str]] = []
+        for block in blocks:
             if isinstance(block, ParagraphBlock):
-                lines.append(block.text)
-                lines.append("")  # Blank line between paragraphs
+                fragments.append(block.text)
             elif isinstance(block, HeadingBlock):
                 # Sub-heading within article
-                lines.append(f"## {block.text}")
-                lines.append("")
+                fragments.append(f"## {block.text}")
             elif isinstance(block, TableBlock):
-                table_text = self._render_table(block)
-                if table_text:
-                    lines.append(table_text)
-                    lines.append("")
+                fragments.append(self._render_table(block) or None)
             elif isinstance(block, ListBlock):
-                list_text = self._render_list(block)
-                if list_text:
-                    lines.append(list_text)
-                    lines.append("")
-        
-        return "\n".join(lines).strip()
+                fragments.append(self._render_list(block) or None)
+            else:
+                fragments.append(None)
+        return fragments
     
-    def get_article_header(self, article: Article) -> str:
-        """Get just the header portion for chunk repetition."""
-        lines = []
-        
+    def assemble(self, header: str, fragments: List[Optional[str]]) -> str:
+        """Join a header and pre-rendered block fragments, each followed by a blank line."""
+        # header ends with "\n"; the trailing separator is stripped like the rest of the final whitespace
+        parts = [header[:-1], *fragments]
+        if None in fragments:
+            parts = [part for part in parts if part is not None]
+        return "\n\n".join(parts).strip()
+    
+    def serialize_article(self, article: Article) -> str:
+        """Convert Article to clean text for embedding."""
+        return self.assemble(self.get_article_header(article), self.render_blocks(article.blocks))
+    
+    def get_article_header(self, article: Article, include_section: bool = True) -> str:
+        """Get just the header portion for chunk repetition (ends with a newline)."""
         if article.article_title:
-            lines.append(f"Article {article.article_number} – {article.article_title}")
+            title = f"Article {article.article_number} – {article.article_title}"
         else:
-            lines.append(f"Article {article.article_number}")
-        
-        if article.section_title:
-            lines.append(f"Section: {article.section_title}")
+            title = f"Article {article.article_number}"
         
-        lines.append(f"Source: {article.source}")
-        lines.append("")  # Trailing newline for consistency
-        
-        return "\n".join(lines)
+        # Include section context if available
+        section = f"Section: {article.section_title}\n" if include_section and article.section_title else ""
+        return f"{title}\n{section}Source: {article.source}\n"
 
 
 class ArticleSplitter:
@@ -266,6 +258,9 @@ class ArticleSplitter:
     - Never split mid-sentence
     - Repeat article header in every sub-chunk
     - Tables stay intact (never split)
+    
+    Every block is rendered once; the length check, the grouping and the
+    sub-chunk texts all reuse those fragments.
     """
     
     def __init__(
@@ -277,48 +272,36 @@ class ArticleSplitter:
         self.min_chunk_size = min_chunk_size
         self.serializer = ArticleSerializer()
     
-    def _split_into_paragraph_groups(self, article: Article) -> List[List[Block]]:
-        """Split article blocks into groups that fit within chunk size."""
-        groups: List[List[Block]] = []
-        current_group: List[Block] = []
+    def _split_into_paragraph_groups(self, header_size: int, sizes: List[int]) -> List[Tuple[int, int]]:
+        """Split block sizes into consecutive (start, end) ranges that fit within chunk size."""
+        groups: List[Tuple[int, int]] = []
+        start = 0
         current_size = 0
-        header_size = len(self.serializer.get_article_header(article))
         
-        for block in article.blocks:
-            # Calculate block size
-            if isinstance(block, ParagraphBlock):
-                block_size = len(block.text) + 2  # +2 for newlines
-            elif isinstance(block, TableBlock):
-                block_size = len(self.serializer._render_table(block)) + 2
-            elif isinstance(block, ListBlock):
-                block_size = len(self.serializer._render_list(block)) + 2
-            elif isinstance(block, HeadingBlock):
-                block_size = len(block.text) + 5  # +5 for ## and newlines
-            else:
-                block_size = 0
-            
+        for i, block_size in enumerate(sizes):
             # Check if adding this block would exceed max size
             projected_size = header_size + current_size + block_size
             
-            if projected_size > self.max_chunk_size and current_group:
+            if projected_size > self.max_chunk_size and i > start:
                 # Save current group and start new one
-                groups.append(current_group)
-                current_group = []
+                groups.append((start, i))
+                start = i
                 current_size = 0
             
             # Tables never split - if table alone exceeds max, it still gets its own chunk
-            current_group.append(block)
             current_size += block_size
         
         # Don't forget last group
-        if current_group:
-            groups.append(current_group)
+        if start < len(sizes):
+            groups.append((start, len(sizes)))
         
         return groups
     
     def split_article(self, article: Article) -> List[Chunk]:
         """Split article into chunks, preserving structure."""
-        full_text = self.serializer.serialize_article(article)
+        fragments = self.serializer.render_blocks(article.blocks)
+        header = self.serializer.get_article_header(article)
+        full_text = self.serializer.assemble(header, fragments)
         
         # If article fits in one chunk, return as-is
         if len(full_text) <= self.max_chunk_size:
@@ -335,23 +318,20 @@ class ArticleSplitter:
                 contains_table=contains_table
             )]
         
-        # Split into paragraph groups
-        groups = self._split_into_paragraph_groups(article)
-        header = self.serializer.get_article_header(article)
+        # Split into paragraph groups, sized from the rendered fragments (+2 for newlines).
+        # Empty tables and lists render to nothing but still count their newlines.
+        sizes = [
+            len(fragment) + 2 if fragment is not None else (2 if isinstance(block, (TableBlock, ListBlock)) else 0)
+            for block, fragment in zip(article.blocks, fragments)
+        ]
+        groups = self._split_into_paragraph_groups(len(header), sizes)
+        # Sub-chunk texts have always repeated the header without the section line
+        sub_header = self.serializer.get_article_header(article, include_section=False)
         
         chunks = []
-        for i, group in enumerate(groups):
-            # Create a temporary article with just this group's blocks
-            temp_article = Article(
-                article_number=article.article_number,
-                article_title=article.article_title,
-                blocks=group,
-                source=article.source,
-                document_title=article.document_title
-            )
-            
-            chunk_text = self.serializer.serialize_article(temp_article)
-            contains_table = any(isinstance(b, TableBlock) for b in group)
+        for i, (start, end) in enumerate(groups):
+            chunk_text = self.serializer.assemble(sub_header, fragments[start:end])
+            contains_table = any(isinstance(b, TableBlock) for b in article.blocks[start:end])
             
             chunks.append(Chunk(
                 text=chunk_text,
@@ -397,6 +377,34 @@ class GarbageFilter:
         return filtered
 
 
+_worker_pipeline: Optional["StructuredIngestionPipeline"] = None
+
+
+def _get_worker_pipeline() -> "StructuredIngestionPipeline":
+    global _worker_pipeline
+    if _worker_pipeline is None:
+        _worker_pipeline = StructuredIngestionPipeline()
+    return _worker_pipeline
+
+
+def _process_document(doc: StructuredDocument) -> List[Chunk]:
+    """Process pool entry point (module level so it pickles)."""
+    logger.info(f"Processing: {doc.source}")
+    return _get_worker_pipeline().process_document(doc)
+
+
+def group_document(doc: StructuredDocument) -> List[Article]:
+    """Process pool entry point for the group stage alone (ingestion --until group)."""
+    return _get_worker_pipeline().group_document(doc)
+
+
+def group_and_split(doc: StructuredDocument) -> Tuple[List[Article], List[Chunk]]:
+    """Process pool entry point returning both stage outputs (used by the ingestion DAG)."""
+    pipeline = _get_worker_pipeline()
+    articles = pipeline.group_document(doc)
+    return articles, pipeline.split_articles(articles)
+
+
 class StructuredIngestionPipeline:
     """
     Complete pipeline: StructuredDocument -> embedded chunks in Qdrant.
@@ -404,21 +412,43 @@ class StructuredIngestionPipeline:
     Combines Steps 3-6 and adds embedding + storage.
     """
     
-    def __init__(self):
+    def __init__(self, qdrant_manager: Optional[QdrantClientManager] = None):
+        # Defaults to the live collection (alias); reindex.py passes a versioned one
+        self.qdrant_manager = qdrant_manager
         self.grouper = ArticleGrouper()
         self.splitter = ArticleSplitter()
         self.filter = GarbageFilter()
+        self._late_client = None
+        self._token_store = None
+        self._embedding_cache = None
+        # Set by `ingestion --force embed`: recompute every vector, overwriting the embedding cache
+        self.refresh_embeddings = False
     
     def process_document(self, doc: StructuredDocument) -> List[Chunk]:
         """Process a single document through the full pipeline."""
-        # Step 3: Group into articles
+        return self.split_articles(self.group_document(doc))
+    
+    def group_document(self, doc: StructuredDocument) -> List[Article]:
+        """Step 3: Group into articles."""
         articles = self.grouper.group_into_articles(doc)
         logger.info(f"  Grouped into {len(articles)} articles")
-        
+        return articles
+    
+    def split_articles(self, articles: List[Article]) -> List[Chunk]:
+        """Steps 4-6: serialize, split and filter the articles of one document."""
         # Step 4 & 5: Serialize and split
         all_chunks = []
+        occurrences = {}
         for article in articles:
             chunks = self.splitter.split_article(article)
+            # Point ids derive from the article number, so repeated numbers need a stable suffix
+            seen = occurrences.get(article.article_number, 0)
+            occurrences[article.article_number] = seen + 1
+            article_key = article.article_number if seen == 0 else f"{article.article_number}.{seen}"
+            article_hash = text_hash("\n".join(chunk.text for chunk in chunks))
+            for chunk in chunks:
+                chunk.article_hash = article_hash
+                chunk.article_key = article_key
             all_chunks.extend(chunks)
         
         logger.info(f"  Split into {len(all_chunks)} chunks")
@@ -429,13 +459,15 @@ class StructuredIngestionPipeline:
         
         return filtered_chunks
     
-    def process_documents(self, documents: List[StructuredDocument]) -> List[Chunk]:
-        """Process multiple documents."""
+    def process_documents(self, documents: List[StructuredDocument], workers: Optional[int] = None) -> List[Chunk]:
+        """
+        Process multiple documents. Documents are independent, so they are fanned
+        out to a process pool (see process_map); results are merged in input
+        order, giving the same chunks and point ids as a serial run.
+        """
         all_chunks = []
         
-        for doc in documents:
-            logger.info(f"Processing: {doc.source}")
-            chunks = self.process_document(doc)
+        for chunks in process_map(_process_document, documents, workers):
             all_chunks.extend(chunks)
         
         logger.info(f"\nTotal chunks: {len(all_chunks)}")
@@ -443,52 +475,54 @@ class StructuredIngestionPipeline:
     
     def chunks_to_nodes(self, chunks: List[Chunk]) -> List[TextNode]:
         """Convert Chunk objects to LlamaIndex TextNode for embedding."""
-        nodes = []
-        
-        for i, chunk in enumerate(chunks):
-            metadata = {
-                "source": chunk.source,
-                "article_number": chunk.article_number,
-                "chunk_index": chunk.chunk_index,
-                "total_chunks": chunk.total_chunks,
-                "contains_table": chunk.contains_table,
-            }
-            
-            if chunk.article_title:
-                metadata["article_title"] = chunk.article_title
-                metadata["title"] = f"Article {chunk.article_number}: {chunk.article_title}"
-            else:
-                metadata["title"] = f"Article {chunk.article_number}"
-            
-            if chunk.document_title:
-                metadata["document_title"] = chunk.document_title
-            
-            if chunk.section_title:
-                metadata["section_title"] = chunk.section_title
-            
-            # Determine document type from source filename
-            source_lower = chunk.source.lower()
-            if "statute" in source_lower:
-                metadata["type"] = "statute"
-            elif "regulation" in source_lower:
-                metadata["type"] = "regulation"
-            elif "rules" in source_lower:
-                metadata["type"] = "rules"
-            elif "principle" in source_lower:
-                metadata["type"] = "principles"
-            elif "bylaw" in source_lower:
-                metadata["type"] = "bylaw"
-            else:
-                metadata["type"] = "regulation"
-            
-            node = TextNode(
-                text=chunk.text,
-                metadata=metadata,
-                id_=f"{chunk.source}_{chunk.article_number}_{chunk.chunk_index}"
-            )
-            nodes.append(node)
+        return [self.chunk_to_node(chunk) for chunk in chunks]
+    
+    def chunk_to_node(self, chunk: Chunk) -> TextNode:
+        """Convert a single Chunk to a TextNode (used lazily by streaming ingestion)."""
+        metadata = {
+            "source": chunk.source,
+            "article_number": chunk.article_number,
+            "chunk_index": chunk.chunk_index,
+            "total_chunks": chunk.total_chunks,
+            "contains_table": chunk.contains_table,
+        }
+        
+        if chunk.article_title:
+            metadata["article_title"] = chunk.article_title
+            metadata["title"] = f"Article {chunk.article_number}: {chunk.article_title}"
+        else:
+            metadata["title"] = f"Article {chunk.article_number}"
+        
+        if chunk.document_title:
+            metadata["document_title"] = chunk.document_title
+        
+        if chunk.section_title:
+            metadata["section_title"] = chunk.section_title
+        
+        if chunk.article_hash:
+            metadata["article_hash"] = chunk.article_hash
+        
+        # Determine document type from source filename
+        source_lower = chunk.source.lower()
+        if "statute" in source_lower:
+            metadata["type"] = "statute"
+        elif "regulation" in source_lower:
+            metadata["type"] = "regulation"
+        elif "rules" in source_lower:
+            metadata["type"] = "rules"
+        elif "principle" in source_lower:
+            metadata["type"] = "principles"
+        elif "bylaw" in source_lower:
+            metadata["type"] = "bylaw"
+        else:
+            metadata["type"] = "regulation"
         
-        return nodes
+        node = TextNode(
+            text=chunk.text,
+            metadata=metadata,
+            id_=point_id(chunk.source, chunk.article_key or chunk.article_number, chunk.chunk_index)
+        )
+        return stamp_content_hash(node)
     
     @retry(
         stop=stop_after_attempt(3),
@@ -497,121 +531,178 @@ class StructuredIngestionPipeline:
         before_sleep=before_sleep_log(logger, logging.WARNING),
         after=after_log(logger, logging.INFO)
     )
-    def _embed_batch(self, nodes: List[TextNode], embed_model) -> List[TextNode]:
-        """Embed a batch of nodes with retry logic."""
+    def _embed_batch(self, nodes: List[TextNode], embed_client) -> np.ndarray:
+        """
+        Embed a batch of nodes with retry logic; cached texts skip the model and
+        the rest are embedded in token-length buckets (see token_batching.py).
+        
+        Returns a (len(nodes), dim) float32 matrix in node order. It is not copied
+        onto `node.embedding`: TextNode validates assignments element by element.
+        """
         texts = [node.text for node in nodes]
-        embeddings = embed_model.get_text_embedding_batch(texts)
+        cache = self._get_embedding_cache()
+        if cache is None:
+            return embed_client.embed_document_arrays(texts)
+        
+        model_name = get_embedding_profile(settings.embedding_profile).model_name
+        embeddings = [None] * len(texts) if self.refresh_embeddings else cache.get_dense(model_name, texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            fresh = embed_client.embed_document_arrays(missing_texts)
+            for i, embedding in zip(missing, fresh):
+                embeddings[i] = embedding
+            cache.put_dense(model_name, missing_texts, fresh)
+        
+        return np.stack(embeddings)
+    
+    def _sparse_batch(self, texts: List[str], sparse_client) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Sparse (SPLADE) counterpart of _embed_batch, consulting the same cache: (indices, values) arrays per text."""
+        cache = self._get_embedding_cache()
+        if cache is None:
+            return sparse_client.embed_document_arrays(texts)
+        
+        vectors = [None] * len(texts) if self.refresh_embeddings else cache.get_sparse(sparse_client.model_name, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            indices, values = sparse_client.embed_document_arrays(missing_texts)
+            fresh = list(zip(indices, values))
+            for i, vector in zip(missing, fresh):
+                vectors[i] = vector
+            cache.put_sparse(sparse_client.model_name, missing_texts, fresh)
+        
+        return ([indices for indices, _ in vectors], [values for _, values in vectors])
+    
+    def _get_embedding_cache(self):
+        if self._embedding_cache is None and settings.embedding_cache_enabled:
+            from src.clients.embedding_cache import EmbeddingCache
+            self._embedding_cache = EmbeddingCache()
+        return self._embedding_cache
+    
+    def store_token_vectors(self, nodes: List[TextNode], batch_size: int = 32) -> int:
+        """
+        Compute per-token (late interaction) embeddings once at ingestion and
+        append them to the memory-mapped token store used by the MaxSim reranker.
+        """
+        if self._late_client is None:
+            from src.clients.late_interaction_client import LateInteractionClient
+            self._late_client = LateInteractionClient(model_name=settings.late_interaction_model)
+        token_store = self._get_token_store()
         
-        for node, embedding in zip(nodes, embeddings):
-            node.embedding = embedding
+        for batch_idx in range(0, len(nodes), batch_size):
+            batch = nodes[batch_idx:batch_idx + batch_size]
+            vectors = self._late_client.embed_documents([node.text for node in batch], batch_size=batch_size)
+            token_store.add([node.node_id for node in batch], vectors)
         
-        return nodes
+        return len(nodes)
+    
+    def _get_token_store(self):
+        """One store per pipeline, so removals and additions share the in-memory index (flushed per committed batch)."""
+        if self._token_store is None:
+            from src.clients.token_vector_store import TokenVectorStore
+            self._token_store = TokenVectorStore(settings.token_store_path, model_name=settings.late_interaction_model)
+        return self._token_store
     
     def ingest_to_qdrant(
         self, 
-        chunks: List[Chunk], 
-        batch_size: int = 10
+        chunks: Iterable[Chunk], 
+        batch_size: int = settings.ingest_batch_size,
+        checkpoint_path: Optional[str] = None,
     ) -> int:
-        """Embed chunks and store in Qdrant."""
-        qdrant_manager = get_qdrant_client()
-        embed_client = get_embedding_client()
-        embed_model = embed_client.get_embed_model()
-        vector_store = qdrant_manager.get_vector_store(enable_hybrid=True, use_async=False)
-        
+        """Embed chunks and stream them into Qdrant (no diffing, see sync_to_qdrant)."""
+        manifest = SourceManifest()
+        nodes = manifest.track(self.chunk_to_node(chunk) for chunk in chunks)
+        count = self._stream_nodes(nodes, batch_size, checkpoint_path)
+        self._write_manifest(manifest)
+        return count
+    
+    def sync_to_qdrant(
+        self, chunks: List[Chunk], sources: Optional[Iterable[str]] = None, full: bool = False,
+    ) -> IndexDiff:
+        """
+        Incremental reindex of the given sources.
+        
+        Only new or changed chunks (by content hash) are embedded and upserted
+        (every chunk with full=True); points of these sources that the current
+        chunking no longer produces (removed or renumbered articles) are deleted.
+        """
+        qdrant_manager = self.qdrant_manager or get_qdrant_client()
         nodes = self.chunks_to_nodes(chunks)
-        
-        logger.info(f"\nIngesting {len(nodes)} nodes to Qdrant...")
-        logger.info(f"Collection: {qdrant_manager.collection_name}")
-        
-        # Process in batches
-        total_batches = (len(nodes) + batch_size - 1) // batch_size
-        embedded_nodes = []
-        
-        for batch_idx in range(0, len(nodes), batch_size):
-            batch = nodes[batch_idx:batch_idx + batch_size]
-            batch_num = (batch_idx // batch_size) + 1
-            
-            logger.info(f"Embedding batch {batch_num}/{total_batches}...")
-            
-            embedded_batch = self._embed_batch(batch, embed_model)
-            embedded_nodes.extend(embedded_batch)
-        
-        # Add to vector store
-        logger.info("Adding to Qdrant...")
-        vector_store.add(embedded_nodes)
-        
-        logger.info(f"[OK] Ingested {len(embedded_nodes)} nodes")
-        return len(embedded_nodes)
-
+        sources = set(sources) if sources is not None else {chunk.source for chunk in chunks}
+        
+        diff = diff_against_index(nodes, qdrant_manager.get_indexed_hashes(sources), sources)
+        if full:
+            diff.to_upsert = list(nodes)
+            diff.changed, diff.unchanged = diff.changed + diff.unchanged, 0
+        logger.info(f"Index diff: {diff.summary()}")
+        
+        qdrant_manager.delete_points(diff.stale_ids)
+        if diff.stale_ids and settings.reranker_backend == "late-interaction":
+            self._get_token_store().remove(diff.stale_ids)
+        
+        if diff.to_upsert:
+            self._stream_nodes(diff.to_upsert)
+        if self._token_store is not None:
+            self._token_store.flush()
+        
+        manifest = SourceManifest()
+        for node in nodes:
+            manifest.add(node)
+        self._write_manifest(manifest, removed_sources=sources - set(manifest.sources))
+        return diff
+    
+    def _write_manifest(self, manifest: SourceManifest, removed_sources: Iterable[str] = ()) -> None:
+        qdrant_manager = self.qdrant_manager or get_qdrant_client()
+        model_name = get_embedding_profile(settings.embedding_profile).model_name
+        qdrant_manager.write_manifest(manifest.entries(model_name), removed_sources)
+    
+    def _stream_nodes(
+        self,
+        nodes: Iterable[TextNode],
+        batch_size: int = settings.ingest_batch_size,
+        checkpoint_path: Optional[str] = None,
+    ) -> int:
+        """
+        Dense + sparse embedding and upserts run as concurrent, bounded stages
+        (see streaming_ingestion.py): batches become searchable as soon as they
+        are committed, and an interrupted run resumes from its checkpoint.
+        """
+        from src.chunkers.streaming_ingestion import StreamingIngestor
+        
+        qdrant_manager = self.qdrant_manager or get_qdrant_client()
+        embed_client = get_embedding_client()
+        sparse_client = get_sparse_embedding_client()
+        
+        logger.info(f"\nStreaming chunks to Qdrant collection: {qdrant_manager.collection_name}")
+        
+        late_interaction = settings.reranker_backend == "late-interaction"
+        ingestor = StreamingIngestor(
+            qdrant_manager,
+            embed_fn=lambda batch: self._embed_batch(batch, embed_client),
+            sparse_fn=lambda texts: self._sparse_batch(texts, sparse_client),
+            batch_size=batch_size,
+            queue_depth=settings.ingest_queue_depth,
+            upsert_workers=settings.ingest_upsert_workers,
+            checkpoint_path=checkpoint_path or f"{settings.ingest_checkpoint_dir}/{qdrant_manager.collection_name}.jsonl",
+            on_embedded=self.store_token_vectors if late_interaction else None,
+            # A checkpointed batch always has its token vectors in the published index
+            on_committed=(lambda batch: self._get_token_store().flush()) if late_interaction else None,
+        )
+        try:
+            stats = ingestor.run(nodes)
+        finally:
+            # Token vectors of committed batches stay usable after an interrupted run
+            if self._token_store is not None:
+                self._token_store.flush()
+        
+        logger.info(f"[OK] Ingested {stats.chunks} nodes ({stats.chunks_per_second:.1f} chunks/s)")
+        return stats.chunks + stats.skipped
 
 def main():
-    """Main ingestion script."""
-    logging.basicConfig(level=logging.INFO)
-    logger.info("=" * 60)
-    logger.info("EMU RAG - Structured HTML Ingestion Pipeline")
-    logger.info("=" * 60)
-    
-    # Import scraper
-    from src.scrapers.structured_scraper import StructuredScraper, save_structured_documents
-    
-    # Step 1-2: Scrape and extract structure
-    scraper = StructuredScraper()
-    documents = scraper.scrape_all()
-    
-    if not documents:
-        logger.error("[ERROR] No documents scraped")
-        return
-    
-    # Save structured JSON for inspection
-    save_structured_documents(documents)
-    
-    # Check what's already indexed
-    qdrant = get_qdrant_client()
-    indexed_sources = qdrant.get_indexed_sources()
-    
-    logger.info(f"\nAlready indexed: {len(indexed_sources)} sources")
-    
-    # Filter to new documents only
-    new_docs = [
-        doc for doc in documents 
-        if doc.source not in indexed_sources
-    ]
-    
-    if not new_docs:
-        logger.info("[OK] All documents already indexed. Nothing to do.")
-        return
-    
-    logger.info(f"\nNew documents to process: {len(new_docs)}")
-    for doc in new_docs:
-        logger.info(f"  → {doc.source}")
-    
-    # Steps 3-6: Process and ingest
-    pipeline = StructuredIngestionPipeline()
-    chunks = pipeline.process_documents(new_docs)
-    
-    if not chunks:
-        logger.error("[ERROR] No chunks generated")
-        return
-    
-    # Show sample
-    logger.info("\nSample chunk:")
-    logger.info("-" * 40)
-    sample = chunks[0]
-    logger.info(f"Article: {sample.article_number}")
-    logger.info(f"Title: {sample.article_title}")
-    logger.info(f"Source: {sample.source}")
-    logger.info(f"Length: {len(sample.text)} chars")
-    logger.info(f"Text preview: {sample.text[:200]}...")
-    logger.info("-" * 40)
-    
-    # Ingest to Qdrant
-    count = pipeline.ingest_to_qdrant(chunks)
-    
-    logger.info("\n" + "=" * 60)
-    logger.info("[OK] INGESTION COMPLETE")
-    logger.info(f"Documents processed: {len(new_docs)}")
-    logger.info(f"Chunks ingested: {count}")
-    logger.info("=" * 60)
+    """Main ingestion script (cached DAG, offline from rag_docs/ by default; see ingestion.py)."""
+    from src.chunkers.ingestion import main as ingestion_main
+    return ingestion_main()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+"""
+Incremental reindexing helpers.
+
+Point ids are derived deterministically from (source, article, chunk index), so a
+re-run addresses the same Qdrant points. Each chunk carries a content hash in its
+payload. Comparing freshly chunked nodes with what is indexed yields:
+
+  - nodes that are new or whose content changed  -> embed + upsert
+  - nodes whose hash is unchanged                -> skip (no model inference)
+  - indexed points of the processed sources that
+    the new chunking no longer produces          -> delete
+
+After a run, a per-source manifest entry (chunk count, combined content hash,
+embedding model, timestamp) is written next to the collection, so listing what
+is indexed does not require scrolling every point.
+"""
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from llama_index.core.schema import BaseNode
+
+logger = logging.getLogger(__name__)
+
+# Fixed namespace: changing it would orphan every existing point
+POINT_ID_NAMESPACE = uuid.UUID("6f1c3f0e-6d0b-5c63-9a0e-2f4a8f0b7a41")
+
+HASH_KEYS = ("content_hash", "article_hash")
+
+
+def point_id(source: str, article_number: Optional[str], chunk_index: int) -> str:
+    """Deterministic Qdrant point id (UUIDv5) for a chunk."""
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{source}|{article_number or ''}|{chunk_index}"))
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def content_hash(node: BaseNode) -> str:
+    """Hash of everything that ends up in the point: text and metadata."""
+    metadata = {k: v for k, v in node.metadata.items() if k not in HASH_KEYS}
+    return text_hash(node.get_content() + "\x00" + json.dumps(metadata, sort_keys=True, default=str))
+
+
+def stamp_content_hash(node: BaseNode) -> BaseNode:
+    node.metadata["content_hash"] = content_hash(node)
+    # Hashes are bookkeeping, keep them out of the embedded and LLM-visible text
+    for key in HASH_KEYS:
+        if key not in node.excluded_embed_metadata_keys:
+            node.excluded_embed_metadata_keys.append(key)
+        if key not in node.excluded_llm_metadata_keys:
+            node.excluded_llm_metadata_keys.append(key)
+    return node
+
+
+@dataclass
+class IndexDiff:
+    to_upsert: List[BaseNode] = field(default_factory=list)
+    unchanged: int = 0
+    stale_ids: List[str] = field(default_factory=list)
+    new: int = 0
+    changed: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.new} new, {self.changed} changed, {self.unchanged} unchanged, "
+            f"{len(self.stale_ids)} stale"
+        )
+
+
+def diff_against_index(
+    nodes: Iterable[BaseNode],
+    indexed: Dict[str, Tuple[Optional[str], Optional[str]]],
+    sources: Optional[Iterable[str]] = None,
+) -> IndexDiff:
+    """
+    Compare nodes (with content_hash metadata) against `indexed`
+    ({point_id: (source, content_hash)}). Only points whose source is in `sources`
+    (default: the sources of `nodes`) can become stale.
+    """
+    diff = IndexDiff()
+    seen_ids = set()
+    seen_sources = set()
+
+    for node in nodes:
+        seen_ids.add(node.node_id)
+        seen_sources.add(node.metadata.get("source"))
+        current = indexed.get(node.node_id)
+        if current is None:
+            diff.new += 1
+            diff.to_upsert.append(node)
+        elif current[1] != node.metadata.get("content_hash"):
+            diff.changed += 1
+            diff.to_upsert.append(node)
+        else:
+            diff.unchanged += 1
+
+    scope = set(sources) if sources is not None else seen_sources
+    diff.stale_ids = [
+        pid for pid, (source, _) in indexed.items()
+        if source in scope and pid not in seen_ids
+    ]
+    return diff
+
+
+class SourceManifest:
+    """Accumulates per-source manifest entries from the nodes of a run."""
+
+    def __init__(self):
+        self._hashes: Dict[str, List[str]] = {}
+        self._titles: Dict[str, Optional[str]] = {}
+
+    def add(self, node: BaseNode) -> BaseNode:
+        source = node.metadata.get("source")
+        self._hashes.setdefault(source, []).append(node.metadata.get("content_hash") or content_hash(node))
+        self._titles.setdefault(source, node.metadata.get("document_title"))
+        return node
+
+    def track(self, nodes: Iterable[BaseNode]) -> Iterable[BaseNode]:
+        """Pass-through generator so lazily produced nodes are recorded as they stream by."""
+        for node in nodes:
+            yield self.add(node)
+
+    @property
+    def sources(self) -> List[str]:
+        return list(self._hashes)
+
+    def entries(self, embedding_model: str) -> List[dict]:
+        ingested_at = datetime.now(timezone.utc).isoformat()
+        return [
+            {
+                "source": source,
+                "document_title": self._titles.get(source),
+                "chunks": len(hashes),
+                # Order-independent hash of the source's chunks
+                "content_hash": text_hash("\n".join(sorted(hashes))),
+                "embedding_model": embedding_model,
+                "ingested_at": ingested_at,
+            }
+            for source, hashes in sorted(self._hashes.items())
+        ]
@@ -0,0 +1,365 @@
+"""
+Structured ingestion CLI, modelled as a DAG of cached stages:
+
+    scrape -> normalize -> group -> split -> embed -> upsert
+     (html)   (rag_docs/)  (articles) (chunks)  (vectors)  (Qdrant)
+
+Every stage runs per document and its output is cached on disk under
+`settings.ingest_cache_dir/<stage>/<key>.pkl`. The key of a stage is a hash of
+its input key and a fingerprint of the code implementing it. Editing a rag_docs
+file or the chunker therefore invalidates exactly the stages downstream of
+the change, and everything else is a cache hit.
+
+rag_docs/*.json is the normalize stage's output. It is checked in, so by default
+the DAG starts there and runs fully offline. With `--store` the normalized
+documents are read from (and scrapes written to) the compact document store
+instead; its blocks are decoded lazily, so documents whose chunks are cached are
+never loaded and the others are read by the worker that chunks them. `--scrape` re-fetches the HTML and
+rewrites the rag_docs files whose content changed; pages are fetched with
+conditional GETs into the raw HTML archive, which `--replay` re-parses offline.
+
+The last two stages have their own incremental caches:
+  - embed:  the on-disk embedding cache (per normalized chunk text)
+  - upsert: the index manifest (per source content hash) and, within a stale
+            source, the per-chunk content-hash diff of sync_to_qdrant. Sources
+            in the manifest that no longer have a document are deleted.
+
+Usage:
+    python -m src.chunkers.ingestion                  # offline, from rag_docs/
+    python -m src.chunkers.ingestion --until split    # no models, no Qdrant
+    python -m src.chunkers.ingestion --scrape         # refresh from the live site
+    python -m src.chunkers.ingestion --replay         # re-parse the archived HTML offline
+    python -m src.chunkers.ingestion --store doc_store/  # read the compact document store
+    python -m src.chunkers.ingestion --force group    # re-run group and everything after it
+    python -m src.chunkers.ingestion --force embed    # re-embed past the embedding cache, re-upsert every chunk
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import logging
+import pickle
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.chunkers.models import Article, Chunk, StructuredDocument
+from src.core.parallel import process_map
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("scrape", "normalize", "group", "split", "embed", "upsert")
+
+
+def _hash(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _code_fingerprint(*objects) -> str:
+    """Hash of the source of the modules implementing a stage."""
+    return _hash(*(inspect.getsource(inspect.getmodule(obj)) for obj in objects))
+
+
+class StageCache:
+    """Pickled stage outputs on disk, keyed by (stage, input key)."""
+
+    def __init__(self, root: str = settings.ingest_cache_dir):
+        self.root = Path(root)
+        self.stats: Dict[str, Counter] = {stage: Counter() for stage in STAGES}
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.root / stage / f"{key}.pkl"
+
+    def has(self, stage: str, key: str) -> bool:
+        return self._path(stage, key).exists()
+
+    def get_or_compute(self, stage: str, key: str, compute: Callable, force: bool = False):
+        path = self._path(stage, key)
+        if not force and path.exists():
+            try:
+                with open(path, "rb") as f:
+                    value = pickle.load(f)
+                self.stats[stage]["hit"] += 1
+                return value
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+
+        value = compute()
+        self.stats[stage]["miss"] += 1
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+        return value
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{stage} {counts['hit']} cached/{counts['miss']} run"
+            + (f"/{counts['error']} failed" if counts["error"] else "")
+            for stage, counts in self.stats.items() if counts
+        )
+
+
+class IngestionDAG:
+    """Runs the per-document stages with caching; see the module docstring."""
+
+    def __init__(
+        self,
+        input_dir: str = "rag_docs/",
+        cache: Optional[StageCache] = None,
+        force_from: Optional[str] = None,
+        workers: Optional[int] = None,
+        store_dir: Optional[str] = None,
+    ):
+        from src.chunkers.article_chunker import StructuredIngestionPipeline
+        from src.scrapers import doc_scraper
+
+        self.input_dir = input_dir
+        self.cache = cache or StageCache()
+        self.force_from = STAGES.index(force_from) if force_from else len(STAGES)
+        self.workers = workers
+        self.store_dir = store_dir
+        self.pipeline = StructuredIngestionPipeline()
+        # Set when a scrape could not produce every page, so missing sources are not treated as removed
+        self.partial = False
+        self._fingerprints = {
+            "normalize": _code_fingerprint(doc_scraper),
+            # Grouping calls doc_scraper.detect_article_boundary
+            "group": _code_fingerprint(StructuredIngestionPipeline, Article, doc_scraper),
+            "split": _code_fingerprint(StructuredIngestionPipeline, Chunk),
+        }
+
+    def _forced(self, stage: str) -> bool:
+        return STAGES.index(stage) >= self.force_from
+
+    def _key(self, stage: str, input_key: str) -> str:
+        return _hash(stage, self._fingerprints[stage], input_key)
+
+    # --- scrape + normalize ---------------------------------------------------
+
+    def scrape(self, replay: bool = False) -> List[Tuple[str, StructuredDocument]]:
+        """
+        Fetch every page (conditional GET into the HTML archive, or replay the
+        archive offline) and rewrite rag_docs/ where the normalized output changed.
+        """
+        from src.scrapers.doc_scraper import (
+            HTM_LINKS, StructuredScraper, _parse_page, document_filename, document_to_dict, save_structured_document,
+        )
+
+        scraper = StructuredScraper()
+        pages = scraper.fetch_all(HTM_LINKS, replay=replay)
+        self.partial = len(pages) < len(HTM_LINKS)
+        not_modified = sum(1 for result in scraper.fetch_results if result.status == "not-modified")
+        errors = [result for result in scraper.fetch_results if result.status == "error"]
+        self.cache.stats["scrape"]["hit"] += len(pages) if replay else not_modified
+        self.cache.stats["scrape"]["miss"] += sum(1 for result in scraper.fetch_results if result.downloaded)
+        self.cache.stats["scrape"]["error"] += len(errors)
+        if errors:
+            logger.warning(
+                f"{len(errors)} pages failed to fetch, using their archived copy if any: "
+                + ", ".join(result.link for result in errors)
+            )
+
+        # Normalize cache misses are parsed in parallel
+        keys = {link: self._key("normalize", _hash(link, html)) for link, html in pages.items()}
+        misses = {
+            link: html for link, html in pages.items()
+            if self._forced("normalize") or not self.cache.has("normalize", keys[link])
+        }
+        parsed = dict(zip(misses, process_map(_parse_page, [(scraper.base_url, l, h) for l, h in misses.items()], self.workers)))
+
+        documents = []
+        for link in pages:
+            doc = self.cache.get_or_compute(
+                "normalize", keys[link], lambda: parsed[link], force=link in parsed,
+            )
+            if doc is None:
+                continue
+            path = Path(self.input_dir) / document_filename(doc.source)
+            serialized = json.dumps(document_to_dict(doc), ensure_ascii=False, indent=2)
+            if not path.exists() or path.read_text(encoding="utf-8") != serialized:
+                save_structured_document(doc, self.input_dir)
+            documents.append((_hash(serialized), doc))
+
+        if self.store_dir:
+            from src.scrapers.document_store import DocumentStore
+            DocumentStore(self.store_dir).write(doc for _, doc in documents)
+        return documents
+
+    def load_normalized(self) -> List[Tuple[str, StructuredDocument]]:
+        """rag_docs/*.json keyed by file content, or the store's lazy documents keyed by their content hash."""
+        from src.scrapers.doc_scraper import document_from_dict
+
+        if self.store_dir:
+            from src.scrapers.document_store import DocumentStore
+            stored = DocumentStore(self.store_dir).documents()
+            self.cache.stats["normalize"]["hit"] += len(stored)
+            return [(doc.content_hash, doc) for doc in stored]
+
+        documents = []
+        for path in sorted(Path(self.input_dir).glob("*.json")):
+            raw = path.read_text(encoding="utf-8")
+            # Same key as scrape(), which hashes the serialized form it writes
+            documents.append((_hash(raw), document_from_dict(json.loads(raw))))
+            self.cache.stats["normalize"]["hit"] += 1
+        return documents
+
+    # --- group + split --------------------------------------------------------
+
+    def chunk_documents(self, documents: List[Tuple[str, StructuredDocument]]) -> List[Chunk]:
+        """
+        Group + split with caching. Documents whose split output is not cached are
+        processed in a process pool; results are merged in document order.
+        """
+        from src.chunkers.article_chunker import group_and_split
+
+        keys = []
+        for doc_key, _ in documents:
+            group_key = self._key("group", doc_key)
+            keys.append((group_key, self._key("split", group_key)))
+
+        misses = [
+            i for i, (group_key, split_key) in enumerate(keys)
+            if self._forced("split") or not (self.cache.has("group", group_key) and self.cache.has("split", split_key))
+        ]
+        computed = dict(zip(misses, process_map(group_and_split, [documents[i][1] for i in misses], self.workers)))
+
+        chunks = []
+        for i, (group_key, split_key) in enumerate(keys):
+            fresh = computed.get(i)
+            self.cache.get_or_compute("group", group_key, lambda: fresh[0], force=fresh is not None)
+            chunks.extend(self.cache.get_or_compute("split", split_key, lambda: fresh[1], force=fresh is not None))
+        return chunks
+
+    def group_documents(self, documents: List[Tuple[str, StructuredDocument]]) -> int:
+        """Group stage alone (--until group): fills its cache, returns the number of articles."""
+        from src.chunkers.article_chunker import group_document
+
+        keys = [self._key("group", doc_key) for doc_key, _ in documents]
+        misses = [i for i, key in enumerate(keys) if self._forced("group") or not self.cache.has("group", key)]
+        computed = dict(zip(misses, process_map(group_document, [documents[i][1] for i in misses], self.workers)))
+        return sum(
+            len(self.cache.get_or_compute("group", key, lambda: computed.get(i), force=i in computed))
+            for i, key in enumerate(keys)
+        )
+
+    def chunk_all(
+        self, scrape: bool = False, replay: bool = False, until: str = "split",
+    ) -> Tuple[List[StructuredDocument], List[Chunk]]:
+        """Documents and their chunks; with `until` normalize or group, the chunks are [] and split is not run."""
+        documents = self.scrape(replay=replay) if scrape or replay else self.load_normalized()
+        if until == "normalize":
+            logger.info(f"{len(documents)} documents ({self.cache.summary()})")
+            return [doc for _, doc in documents], []
+        if until == "group":
+            articles = self.group_documents(documents)
+            logger.info(f"{len(documents)} documents -> {articles} articles ({self.cache.summary()})")
+            return [doc for _, doc in documents], []
+        chunks = self.chunk_documents(documents)
+        logger.info(f"{len(documents)} documents -> {len(chunks)} chunks ({self.cache.summary()})")
+        return [doc for _, doc in documents], chunks
+
+    # --- embed + upsert -------------------------------------------------------
+
+    def embed(self, chunks: List[Chunk]) -> int:
+        """Fill the embedding cache without touching Qdrant."""
+        from src.api.dependencies.clients import get_embedding_client, get_sparse_embedding_client
+        from llama_index.core.schema import MetadataMode
+
+        embed_client = get_embedding_client()
+        sparse_client = get_sparse_embedding_client()
+        self.pipeline.refresh_embeddings = self._forced("embed")
+        # Order only matters to padding here: similar lengths end up in the same batches
+        nodes = sorted(self.pipeline.chunks_to_nodes(chunks), key=lambda node: len(node.text))
+        for i in range(0, len(nodes), settings.ingest_batch_size):
+            batch = nodes[i:i + settings.ingest_batch_size]
+            self.pipeline._embed_batch(batch, embed_client)
+            self.pipeline._sparse_batch([node.get_content(metadata_mode=MetadataMode.EMBED) for node in batch], sparse_client)
+        return len(nodes)
+
+    def upsert(self, chunks: List[Chunk], sources: List[str]) -> None:
+        """
+        Sync only the sources whose manifest content hash (or embedding model)
+        changed, and delete the indexed sources missing from `sources`.
+        """
+        from src.api.dependencies.clients import get_qdrant_client
+        from src.chunkers.index_diff import SourceManifest
+        from src.clients.embedding_profiles import get_embedding_profile
+
+        model_name = get_embedding_profile(settings.embedding_profile).model_name
+        manifest = SourceManifest()
+        for node in self.pipeline.chunks_to_nodes(chunks):
+            manifest.add(node)
+        current = {entry["source"]: (entry["content_hash"], entry["embedding_model"]) for entry in manifest.entries(model_name)}
+        indexed = {
+            entry["source"]: (entry.get("content_hash"), entry.get("embedding_model"))
+            for entry in get_qdrant_client().get_manifest()
+        }
+
+        stale = [
+            source for source in sources
+            if self._forced("upsert") or current.get(source) != indexed.get(source)
+        ]
+        removed = sorted(set(indexed) - set(sources))
+        if removed and self.partial:
+            logger.warning(f"Keeping {len(removed)} indexed sources: the scrape did not produce every page")
+            removed = []
+        self.cache.stats["upsert"]["hit"] += len(sources) - len(stale)
+        self.cache.stats["upsert"]["miss"] += len(stale)
+        if not stale and not removed:
+            logger.info("[OK] Index is up to date")
+            return
+
+        stale_set = set(stale)
+        self.pipeline.refresh_embeddings = self._forced("embed")
+        # Removed sources have no chunks: sync_to_qdrant deletes their points and manifest entries.
+        # Forced runs upsert every chunk of the stale sources instead of only changed ones.
+        diff = self.pipeline.sync_to_qdrant(
+            [c for c in chunks if c.source in stale_set], sources=stale + removed, full=self._forced("upsert"),
+        )
+        logger.info(f"Upserted {len(stale)} stale sources, removed {len(removed)}: {diff.summary()}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input-dir", default="rag_docs/")
+    parser.add_argument("--cache-dir", default=settings.ingest_cache_dir)
+    parser.add_argument("--scrape", action="store_true", help="Fetch from the live site instead of starting at rag_docs/")
+    parser.add_argument("--replay", action="store_true", help="Re-parse the raw HTML archive offline (implies the scrape stage)")
+    parser.add_argument("--store", help="Compact document store to use instead of --input-dir (see src.scrapers.document_store)")
+    parser.add_argument("--workers", type=int, help="Parse/chunk processes (default INGEST_WORKERS, 0 = one per core)")
+    parser.add_argument("--until", choices=STAGES[1:], default="upsert", help="Last stage to run")
+    parser.add_argument("--force", choices=STAGES[1:], help="Ignore caches from this stage on")
+    args = parser.parse_args(argv)
+
+    dag = IngestionDAG(
+        args.input_dir, StageCache(args.cache_dir), force_from=args.force, workers=args.workers, store_dir=args.store,
+    )
+    documents, chunks = dag.chunk_all(scrape=args.scrape, replay=args.replay, until=args.until)
+    if args.until in ("normalize", "group"):
+        logger.info(f"[OK] Stages: {dag.cache.summary()}")
+        return 0
+    if not chunks:
+        logger.error("[ERROR] No chunks generated")
+        return 1
+
+    last = STAGES.index(args.until)
+    if last == STAGES.index("embed"):
+        dag.embed(chunks)
+    elif last == STAGES.index("upsert"):
+        dag.upsert(chunks, [doc.source for doc in documents])
+
+    logger.info(f"[OK] Stages: {dag.cache.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
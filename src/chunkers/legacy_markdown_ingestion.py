@@ -5,7 +5,7 @@ Handles both text-style and table-style article formats.
 import re
 import time
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from tenacity import (
     retry,
@@ -23,92 +23,106 @@ from llama_index.core.ingestion import IngestionPipeline
 from llama_index.core.schema import BaseNode, TransformComponent
 
 from src.api.dependencies.clients import get_embedding_client, get_qdrant_client
+from src.chunkers.index_diff import SourceManifest, diff_against_index, point_id, stamp_content_hash
+from src.clients.embedding_profiles import get_embedding_profile
+from src.core.settings import settings
 
 logger = logging.getLogger(__name__)
 
 
+# Structural table lines, tried in this order (first alternative that matches wins):
+#   sep:     table separator (|---|---|)
+#   article: table-style article, **Title** | **1.** | Content
+#   clause:  multi-column sub-clause row, | (1) | To... | Content |
+# All three need a "|", so lines without one skip the match entirely.
+TABLE_LINE_RE = re.compile(
+    r'(?P<sep>^\s*\|[\s\-\|]+\|?\s*$)'
+    r'|(?P<article>^\s*\|?\s*(?:(?:\*\*)?(?P<title>[^*]+)(?:\*\*)?)\s*\|\s*\*\*(?P<number>\d+[A-Za-z]?)\.\*\*\s*\|\s*(?P<content>.*))'
+    r'|(?P<clause>^\s*\|\s*\((?P<sub_num>\d+)\)\s*\|\s*(?P<rest>.*))'
+)
+BOLD_ARTICLE_RE = re.compile(r'\*\*(Article\s+\d+[A-Za-z]?:?\s*[^*]*)\*\*')
+BOLD_PART_RE = re.compile(r'\*\*((?:PART|SECTION|CHAPTER)\s+[A-Z0-9\s]+)\*\*')
+
+ARTICLE_NUMBER_RE = re.compile(r'###?\s*Article\s+(\d+[A-Za-z]?)')
+ARTICLE_TITLE_RE = re.compile(r'###?\s*Article\s+\d+[A-Za-z]?:?\s*([^\n]+)')
+SECTION_RE = re.compile(r'##\s*((?:PART|SECTION|CHAPTER)\s+[A-Z0-9\s]+)')
+
+
+def _first_h3_line(text: str) -> Optional[str]:
+    """First line of text starting with ###, found with str.find instead of splitting every line."""
+    if text.startswith('###'):
+        start = 0
+    else:
+        start = text.find('\n###') + 1
+        if start == 0:
+            return None
+    end = text.find('\n', start)
+    return text[start:] if end == -1 else text[start:end]
+
+
 class UniversalMarkdownCleaner(TransformComponent):
     """
     Standardizes inconsistent EMU regulations into clean Markdown headers.
     Handles both text-style (Article X) and table-style (| **X.** |) formats.
+    
+    Each line is classified once with the precompiled TABLE_LINE_RE; bold
+    article/part markers are rewritten only on lines that contain them.
     """
     
-    def __call__(self, documents: List[Document], **kwargs) -> List[Document]:
-        cleaned_documents = []
+    def clean_text(self, text: str) -> str:
+        new_lines = []
+        in_header_table = False  # Track if we're in the table header
         
-        for doc in documents:
-            text = doc.text
-            new_lines = []
-            
-            lines = text.split('\n')
-            in_header_table = False  # Track if we're in the table header
-            
-            for i, line in enumerate(lines):
+        for line in text.split('\n'):
+            match = TABLE_LINE_RE.match(line) if '|' in line else None
+            if match:
                 # Skip table separator lines (|---|---|)
-                if re.match(r'^\s*\|[\s\-\|]+\|?\s*$', line):
+                if match.group('sep') is not None:
                     in_header_table = True
                     continue
                 
                 # --- STRATEGY 1: Handle Table-Style Articles ---
-                # Pattern: **Title** | **1.** | Content
-                # or: **Brief Name** | **1.** | Eastern Mediterranean...
-                table_match = re.search(
-                    r'^\s*\|?\s*(?:(?:\*\*)?([^*]+)(?:\*\*)?)\s*\|\s*\*\*(\d+[A-Za-z]?)\.\*\*\s*\|\s*(.*)',
-                    line
-                )
-                
-                if table_match:
-                    title_part = table_match.group(1).strip()
-                    article_num = table_match.group(2)
-                    content_part = table_match.group(3).strip()
-                    
-                    # Convert to: ### Article X: Title
-                    new_lines.append(f"\n### Article {article_num}: {title_part}\n")
+                # Convert to: ### Article X: Title
+                if match.group('article') is not None:
+                    new_lines.append(f"\n### Article {match.group('number')}: {match.group('title').strip()}\n")
+                    content_part = match.group('content').strip()
                     if content_part:
                         new_lines.append(content_part)
                     continue
                 
                 # --- STRATEGY 2: Handle Multi-column Table Rows ---
-                # Pattern: | (1) | To... | Content | More |
-                multi_col_match = re.search(
-                    r'^\s*\|\s*\((\d+)\)\s*\|\s*(.*)',
-                    line
-                )
-                if multi_col_match and in_header_table:
-                    sub_num = multi_col_match.group(1)
-                    content = multi_col_match.group(2).replace('|', ' ').strip()
-                    new_lines.append(f"\n**({sub_num})** {content}")
+                if in_header_table:
+                    content = match.group('rest').replace('|', ' ').strip()
+                    new_lines.append(f"\n**({match.group('sub_num')})** {content}")
                     continue
-                
-                # --- STRATEGY 3: Handle Bold-Style Articles (EMU_Statute) ---
-                # Pattern: **Article 1: Title**
-                if "**Article" in line:
-                    line = re.sub(
-                        r'\*\*(Article\s+\d+[A-Za-z]?:?\s*[^*]*)\*\*',
-                        r'### \1',
-                        line
-                    )
-                
-                # --- STRATEGY 4: Handle Part/Section Headers ---
-                # Pattern: **PART ONE** -> ## PART ONE
-                if "**PART" in line or "**SECTION" in line or "**CHAPTER" in line:
-                    line = re.sub(
-                        r'\*\*((?:PART|SECTION|CHAPTER)\s+[A-Z0-9\s]+)\*\*',
-                        r'## \1',
-                        line
-                    )
-                
-                # Reset table tracking if we hit a non-table line
-                if line.strip() and not line.strip().startswith('|'):
-                    in_header_table = False
-                
-                new_lines.append(line)
             
+            # --- STRATEGY 3: Handle Bold-Style Articles (EMU_Statute) ---
+            # Pattern: **Article 1: Title**
+            if "**Article" in line:
+                line = BOLD_ARTICLE_RE.sub(r'### \1', line)
+            
+            # --- STRATEGY 4: Handle Part/Section Headers ---
+            # Pattern: **PART ONE** -> ## PART ONE
+            if "**PART" in line or "**SECTION" in line or "**CHAPTER" in line:
+                line = BOLD_PART_RE.sub(r'## \1', line)
+            
+            # Reset table tracking if we hit a non-table line
+            stripped = line.strip()
+            if stripped and not stripped.startswith('|'):
+                in_header_table = False
+            
+            new_lines.append(line)
+        
+        return '\n'.join(new_lines)
+    
+    def __call__(self, documents: List[Document], **kwargs) -> List[Document]:
+        cleaned_documents = []
+        
+        for doc in documents:
             # Create NEW document instead of modifying existing one
             # (Document.text is read-only in LlamaIndex)
-            cleaned_text = '\n'.join(new_lines)
             new_doc = Document(
-                text=cleaned_text,
+                text=self.clean_text(doc.text),
                 metadata=doc.metadata.copy(),
                 id_=doc.id_
             )
@@ -123,48 +137,63 @@ class MetadataEnricher(TransformComponent):
     Adds: article_number, title, section for source citations.
     """
     
+    def enrich(self, content: str, metadata: Dict, index: int) -> None:
+        # 1. Extract Article Number (now standardized to "Article X")
+        article_match = ARTICLE_NUMBER_RE.search(content)
+        if article_match:
+            metadata["article_number"] = article_match.group(1)
+            
+            # Extract article title (text after colon). A title match is always an
+            # article match too, so the search can start at the first article.
+            title_match = ARTICLE_TITLE_RE.search(content, article_match.start())
+            if title_match:
+                metadata["article_title"] = title_match.group(1).strip()
+        
+        # 2. Extract Section/Part/Chapter
+        section_match = SECTION_RE.search(content)
+        if section_match:
+            metadata["section"] = section_match.group(1).strip()
+        
+        # 3. Use first header as title if article_title not found
+        if "article_title" not in metadata:
+            header = _first_h3_line(content.strip())
+            if header is not None:
+                metadata["title"] = header.replace('###', '').strip()
+        else:
+            # Use article title as general title
+            metadata["title"] = metadata.get("article_title")
+        
+        # 4. Detect tables
+        if "|---|" in content or "| " in content:
+            metadata["contains_table"] = True
+        
+        # 5. Add chunk index
+        metadata["chunk_index"] = index
+    
     def __call__(self, nodes: List[BaseNode], **kwargs) -> List[BaseNode]:
         for i, node in enumerate(nodes):
-            content = node.get_content()
-            
-            # 1. Extract Article Number (now standardized to "Article X")
-            article_match = re.search(r'###?\s*Article\s+(\d+[A-Za-z]?)', content)
-            if article_match:
-                node.metadata["article_number"] = article_match.group(1)
-                
-                # Extract article title (text after colon)
-                title_match = re.search(
-                    r'###?\s*Article\s+\d+[A-Za-z]?:?\s*([^\n]+)',
-                    content
-                )
-                if title_match:
-                    node.metadata["article_title"] = title_match.group(1).strip()
-            
-            # 2. Extract Section/Part/Chapter
-            section_match = re.search(
-                r'##\s*((?:PART|SECTION|CHAPTER)\s+[A-Z0-9\s]+)',
-                content
-            )
-            if section_match:
-                node.metadata["section"] = section_match.group(1).strip()
-            
-            # 3. Use first header as title if article_title not found
-            if "article_title" not in node.metadata:
-                lines = content.strip().split('\n')
-                for line in lines:
-                    if line.startswith('###'):
-                        node.metadata["title"] = line.replace('###', '').strip()
-                        break
-            else:
-                # Use article title as general title
-                node.metadata["title"] = node.metadata.get("article_title")
-            
-            # 4. Detect tables
-            if "|---|" in content or "| " in content:
-                node.metadata["contains_table"] = True
+            self.enrich(node.get_content(), node.metadata, i)
+        
+        return nodes
+
+
+class ContentHasher(TransformComponent):
+    """
+    Assigns deterministic point ids from (source, article, chunk index) and
+    stamps a content hash, so re-runs can skip unchanged chunks.
+    """
+    
+    def __call__(self, nodes: List[BaseNode], **kwargs) -> List[BaseNode]:
+        counters = {}
+        
+        for node in nodes:
+            source = node.metadata.get("source", "")
+            article = node.metadata.get("article_number")
+            index = counters.get((source, article), 0)
+            counters[(source, article)] = index + 1
             
-            # 5. Add chunk index
-            node.metadata["chunk_index"] = i
+            node.id_ = point_id(source, article, index)
+            stamp_content_hash(node)
         
         return nodes
 
@@ -179,7 +208,7 @@ class EMUMarkdownProcessor:
         """Load all markdown files from data directory with metadata."""
         documents = []
         
-        for md_file in self.data_dir.glob("*.md"):
+        for md_file in sorted(self.data_dir.glob("*.md")):
             print(f"Loading: {md_file.name}")
             
             with open(md_file, "r", encoding="utf-8") as f:
@@ -236,13 +265,10 @@ class EMUMarkdownProcessor:
         1. UniversalMarkdownCleaner - standardizes both formats
         2. MarkdownNodeParser - splits by headers
         3. MetadataEnricher - adds article/section metadata
-        4. Embedding model - embeds chunks
-        """
-        qdrant_manager = get_qdrant_client()
-        # use_async=False for sync pipeline.run()
-        vector_store = qdrant_manager.get_vector_store(enable_hybrid=True, use_async=False)
-        embed_model = get_embedding_client().get_embed_model()
+        4. ContentHasher - deterministic ids + content hashes
         
+        Embedding happens afterwards, only for chunks the index diff marks as new or changed.
+        """
         pipeline = IngestionPipeline(
             transformations=[
                 # Step 1: Fix inconsistent markdown formats
@@ -253,10 +279,9 @@ class EMUMarkdownProcessor:
                 SentenceSplitter(chunk_size=1024, chunk_overlap=100),
                 # Step 4: Extract metadata for citations
                 MetadataEnricher(),
-                # Step 5: Embed (must be last)
-                embed_model,
+                # Step 5: Stable ids for incremental reindexing
+                ContentHasher(),
             ],
-            vector_store=vector_store,
         )
         
         return pipeline
@@ -287,8 +312,14 @@ class EMUMarkdownProcessor:
         return nodes
     
     def ingest_documents(self, documents: List[Document], batch_size: int = 10) -> List[BaseNode]:
-        """Ingest documents into Qdrant using the pipeline in batches."""
+        """
+        Incrementally ingest documents into Qdrant in batches: new or changed chunks
+        are embedded and upserted, chunks that vanished from a document are deleted.
+        """
         qdrant_manager = get_qdrant_client()
+        # use_async=False for sync add()
+        vector_store = qdrant_manager.get_vector_store(enable_hybrid=True, use_async=False)
+        embed_model = get_embedding_client().get_embed_model()
         
         logging.info("\nStarting ingestion pipeline...")
         logging.info(f"Target collection: {qdrant_manager.collection_name}")
@@ -311,64 +342,57 @@ class EMUMarkdownProcessor:
                     batch_num=batch_num,
                     total_batches=total_batches
                 )
-                all_nodes.extend(nodes)
-                    
             except Exception as e:
                 print(f"\n✗ Batch {batch_num} failed: {e}")
                 raise
+            
+            sources = [doc.metadata["source"] for doc in batch]
+            diff = diff_against_index(nodes, qdrant_manager.get_indexed_hashes(sources), sources)
+            logging.info(f"Batch {batch_num} diff: {diff.summary()}")
+            
+            qdrant_manager.delete_points(diff.stale_ids)
+            if diff.to_upsert:
+                vector_store.add(embed_model(diff.to_upsert))
+            all_nodes.extend(diff.to_upsert)
+            
+            manifest = SourceManifest()
+            for node in nodes:
+                manifest.add(node)
+            qdrant_manager.write_manifest(
+                manifest.entries(get_embedding_profile(settings.embedding_profile).model_name),
+                removed_sources=set(sources) - set(manifest.sources),
+            )
         
-        logging.info(f"\n[OK] Successfully ingested {len(all_nodes)} total nodes")
+        logging.info(f"\n[OK] Successfully ingested {len(all_nodes)} new or changed nodes")
         return all_nodes
 
-
 def main():
-    """Main ingestion script with upsert logic - only processes new documents."""
+    """Main ingestion script with upsert logic - only re-embeds new or changed chunks."""
     logging.basicConfig(level=logging.INFO)
     logging.info("=" * 60)
     logging.info("EMU RAG - Universal Markdown Ingestion Pipeline")
     logging.info("=" * 60)
     
     processor = EMUMarkdownProcessor()
-    all_documents = processor.load_markdown_files()
-    
-    if not all_documents:
-        logging.error("[ERROR] No markdown files found in emu_rag_data/")
-        return
-    
-    # Check which documents are already indexed
-    qdrant = get_qdrant_client()
-    indexed_sources = qdrant.get_indexed_sources()
-    
-    logging.info(f"\nAlready indexed: {len(indexed_sources)} source files")
-    if indexed_sources:
-        for src in sorted(indexed_sources):
-            logging.info(f"  ✓ {src}")
-    
-    # Filter to only new documents
-    documents = [
-        doc for doc in all_documents 
-        if doc.metadata['source'] not in indexed_sources
-    ]
+    documents = processor.load_markdown_files()
     
     if not documents:
-        logging.info("\n[OK] All documents already indexed. Nothing to do.")
+        logging.error("[ERROR] No markdown files found in emu_rag_data/")
         return
     
-    logging.info(f"\nNew documents to process: {len(documents)}")
+    logging.info(f"\nDocuments to sync: {len(documents)}")
     for doc in documents:
         logging.info(f"  → {doc.metadata['source']}")
         logging.info(f"    Type: {doc.metadata.get('type', 'unknown')}")
         if 'document_title' in doc.metadata:
             logging.info(f"    Title: {doc.metadata['document_title'][:50]}...")
     
-
     try:
         nodes = processor.ingest_documents(documents, batch_size=10)
         
         logging.info("\n[OK] INGESTION COMPLETE")
-        logging.info(f"New documents processed: {len(documents)}")
-        logging.info(f"New chunks created: {len(nodes)}")
-        logging.info(f"Total indexed sources: {len(indexed_sources) + len(documents)}")
+        logging.info(f"Documents processed: {len(documents)}")
+        logging.info(f"New or changed chunks: {len(nodes)}")
         
         # Show sample metadata
         if nodes:
@@ -1,6 +1,8 @@
 """
 Data models for the structured HTML ingestion pipeline.
 Defines block types and Article objects for regulation documents.
+All models use __slots__: a crawl holds one object per block, so dropping the
+per-instance __dict__ matters when whole corpora are chunked in memory.
 """
 from dataclasses import dataclass, field
 from typing import List, Optional, Literal, Union
@@ -15,7 +17,7 @@ class BlockType(str, Enum):
     LIST = "list"
 
 
-@dataclass
+@dataclass(slots=True)
 class HeadingBlock:
     """A heading element (h1-h6)."""
     type: Literal["heading"] = "heading"
@@ -23,14 +25,14 @@ class HeadingBlock:
     text: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ParagraphBlock:
     """A paragraph element."""
     type: Literal["paragraph"] = "paragraph"
     text: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class TableBlock:
     """A table element with rows as list of lists."""
     type: Literal["table"] = "table"
@@ -38,7 +40,7 @@ class TableBlock:
     has_header: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ListBlock:
     """A list element (ul/ol)."""
     type: Literal["list"] = "list"
@@ -50,7 +52,7 @@ class ListBlock:
 Block = Union[HeadingBlock, ParagraphBlock, TableBlock, ListBlock]
 
 
-@dataclass
+@dataclass(slots=True)
 class StructuredDocument:
     """
     A document parsed from HTML with preserved structure.
@@ -61,7 +63,7 @@ class StructuredDocument:
     blocks: List[Block] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Article:
     """
     A grouped article from a regulation document.
@@ -80,7 +82,7 @@ class Article:
     section_title: Optional[str] = None  # e.g., "I. GENERAL PROVISIONS"
 
 
-@dataclass
+@dataclass(slots=True)
 class Chunk:
     """
     A chunk ready for embedding.
@@ -97,4 +99,6 @@ class Chunk:
     chunk_index: int = 0
     total_chunks: int = 1
     contains_table: bool = False
+    article_hash: Optional[str] = None  # content hash of the whole article, for incremental reindexing
+    article_key: Optional[str] = None  # article number, suffixed when a document repeats it (annexes)
 
@@ -0,0 +1,147 @@
+"""
+Blue/green reindex behind a Qdrant collection alias.
+
+The API reads `settings.qdrant_collection` (per embedding profile), which is an
+alias. A rebuild never touches the collection the alias points at:
+
+  1. build a fresh versioned collection, e.g. emu_regulations_v3
+  2. run a smoke-test query set against it (point count + expected sources)
+  3. atomically repoint the alias to the new version
+  4. garbage-collect old versions, keeping the newest `--keep`
+
+Retrieval keeps serving the previous version until step 3, and a failed build
+or smoke test leaves the alias untouched. Since embeddings are cached on disk,
+rebuilding unchanged chunks costs no model inference.
+
+Usage:
+    python -m src.chunkers.reindex                       # rebuild from rag_docs/
+    python -m src.chunkers.reindex --scrape              # scrape first
+    python -m src.chunkers.reindex --drop-legacy         # first run on a pre-alias deployment
+    python -m src.chunkers.reindex --rollback            # repoint to the previous version
+    python -m src.chunkers.reindex --gc-only --keep 2
+"""
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional, Tuple
+
+from src.api.dependencies.clients import get_embedding_client, get_sparse_embedding_client
+from src.chunkers.article_chunker import StructuredIngestionPipeline
+from src.clients.qdrant import DENSE_VECTOR_NAME, QdrantClientManager
+
+logger = logging.getLogger(__name__)
+
+# (query, substring expected in the source of one of the top hits)
+DEFAULT_SMOKE_QUERIES: List[Tuple[str, str]] = [
+    ("How are tuition fees paid?", "TutionFees"),
+    ("Can I take courses in the summer semester?", "Summer_Semester"),
+    ("Requirements for a double major programme", "Doublemajor"),
+    ("Disciplinary penalties for students", "disciplinary"),
+    ("Who can stay in the student dormitories?", "Dormitories"),
+]
+
+
+def build_manager(collection_name: Optional[str] = None) -> QdrantClientManager:
+    manager = QdrantClientManager(collection_name)
+    sparse_client = get_sparse_embedding_client()
+    manager.set_sparse_embed_fn(lambda texts: sparse_client.embed_documents(texts))
+    return manager
+
+
+def smoke_test(
+    manager: QdrantClientManager,
+    expected_points: int,
+    queries: List[Tuple[str, str]],
+    top_k: int = 5,
+) -> List[str]:
+    """Returns the list of failures (empty when the collection is good to serve)."""
+    failures = []
+    count = manager.sync_client.count(manager.collection_name, exact=True).count
+    if count != expected_points:
+        failures.append(f"point count {count} != {expected_points} chunks")
+
+    embed_model = get_embedding_client().get_embed_model()
+    for query, expected in queries:
+        hits = manager.sync_client.query_points(
+            manager.collection_name,
+            query=embed_model.get_query_embedding(query),
+            using=DENSE_VECTOR_NAME,
+            limit=top_k,
+            with_payload=["source"],
+        ).points
+        sources = [(hit.payload or {}).get("source", "") for hit in hits]
+        if not any(expected.lower() in source.lower() for source in sources):
+            failures.append(f"'{query}': expected '{expected}' in top {top_k}, got {sources}")
+    return failures
+
+
+def load_smoke_queries(path: Optional[str]) -> List[Tuple[str, str]]:
+    if not path:
+        return DEFAULT_SMOKE_QUERIES
+    with open(path, "r", encoding="utf-8") as f:
+        return [(item["query"], item["expected_source"]) for item in json.load(f)]
+
+
+def rebuild(args) -> int:
+    from src.chunkers.ingestion import IngestionDAG
+
+    live = build_manager()
+    target = build_manager(live.next_version_name())
+    logger.info(f"Building {target.collection_name} (alias {live.collection_name} -> {live.resolve_alias()})")
+
+    # Scrape/normalize/group/split come from the stage cache when unchanged
+    dag = IngestionDAG(args.input_dir)
+    _, chunks = dag.chunk_all(scrape=args.scrape)
+    if not chunks:
+        logger.error("[ERROR] No chunks generated")
+        return 1
+    pipeline = StructuredIngestionPipeline(qdrant_manager=target)
+    pipeline.ingest_to_qdrant(chunks)
+
+    failures = smoke_test(target, len(chunks), load_smoke_queries(args.smoke_queries), args.smoke_top_k)
+    if failures:
+        for failure in failures:
+            logger.error(f"[SMOKE] {failure}")
+        logger.error(f"[ERROR] Smoke test failed; alias unchanged, {target.collection_name} kept for inspection")
+        return 1
+
+    live.swap_alias(target.collection_name, drop_legacy=args.drop_legacy)
+    live.gc_versions(keep=args.keep)
+    return 0
+
+
+def rollback(live: QdrantClientManager) -> int:
+    current = live.resolve_alias()
+    versions = [name for _, name in live.list_versions()]
+    older = versions[:versions.index(current)] if current in versions else []
+    if not older:
+        logger.error(f"[ERROR] No version older than {current} to roll back to")
+        return 1
+    live.swap_alias(older[-1])
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input-dir", default="rag_docs/")
+    parser.add_argument("--scrape", action="store_true", help="Scrape the documents instead of reading --input-dir")
+    parser.add_argument("--keep", type=int, default=2, help="Versions to keep when garbage-collecting")
+    parser.add_argument("--smoke-queries", help="JSON list of {query, expected_source}")
+    parser.add_argument("--smoke-top-k", type=int, default=5)
+    parser.add_argument("--drop-legacy", action="store_true", help="Replace a regular collection named like the alias")
+    parser.add_argument("--gc-only", action="store_true")
+    parser.add_argument("--rollback", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.gc_only:
+        build_manager().gc_versions(keep=args.keep)
+        return 0
+    if args.rollback:
+        return rollback(build_manager())
+    return rebuild(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Bounded streaming ingestion: nodes -> dense + sparse embeddings -> Qdrant upserts.
+
+Each stage runs in its own thread and the stages are connected by bounded
+queues. The producer can get at most `queue_depth` batches ahead of the
+embedder, and the embedder at most `queue_depth` batches ahead of the upsert
+workers. Memory therefore stays flat regardless of corpus size, and points
+become searchable batch by batch instead of after one final `add`.
+
+Nodes are grouped in windows of `bucket_window` batches and sorted by length
+before being cut into batches. Similar-length texts share a batch, so less
+compute is spent on padding.
+
+Embeddings stay float32 NumPy arrays from the model (or embedding cache) until
+the points are built. qdrant-client's pydantic models validate vectors element
+by element and are ~100x slower on an ndarray than on a list, so each batch is
+converted there with one `ndarray.tolist()` per vector (a C loop), rather than
+through Python float lists at every stage.
+
+Every committed (upserted) batch is appended to a checkpoint file as
+(node id, content hash) pairs. An interrupted run resumes by skipping nodes
+that were already committed with the same content: point ids are stable across
+edits, so a changed chunk under a committed id is embedded again. The
+checkpoint is removed once a run finishes cleanly.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+from llama_index.core.schema import MetadataMode, TextNode
+from llama_index.core.vector_stores.utils import node_to_metadata_dict
+from qdrant_client import models
+
+from src.clients.qdrant import DENSE_VECTOR_NAME, SPARSE_VECTOR_NAME, QdrantClientManager
+
+logger = logging.getLogger(__name__)
+
+CommitKey = Tuple[str, Optional[str]]  # (node id, content hash)
+
+_DONE = object()
+
+
+@dataclass
+class IngestionStats:
+    """Counters reported at the end of a streaming run."""
+    chunks: int = 0
+    skipped: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+
+def commit_key(node: TextNode) -> CommitKey:
+    return (node.node_id, node.metadata.get("content_hash"))
+
+
+class IngestionCheckpoint:
+    """Append-only JSON Lines log of committed (node id, content hash) pairs (one line per batch)."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+
+    def load(self) -> Set[CommitKey]:
+        committed: Set[CommitKey] = set()
+        if self.path is None or not self.path.exists():
+            return committed
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line means that batch was not confirmed; redo it
+                    continue
+                # Checkpoints written before hashes were recorded hold bare ids and never match
+                committed.update(tuple(entry) for entry in entries if isinstance(entry, list))
+        return committed
+
+    def commit(self, keys: List[CommitKey]) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(keys) + "\n")
+
+    def clear(self) -> None:
+        if self.path is not None and self.path.exists():
+            self.path.unlink()
+
+
+class StreamingIngestor:
+    """
+    Runs the chunk -> embed -> upsert stages concurrently with backpressure.
+
+    embed_fn returns the dense (len(batch), dim) float32 matrix of a batch of
+    nodes, sparse_fn returns (indices, values) arrays for a list of texts,
+    on_embedded is an optional hook run on every embedded batch (e.g.
+    late-interaction token vectors) and on_committed one run after each batch is
+    upserted, just before it is checkpointed (e.g. flushing those token vectors).
+    """
+
+    def __init__(
+        self,
+        qdrant_manager: QdrantClientManager,
+        embed_fn: Callable[[List[TextNode]], np.ndarray],
+        sparse_fn: Optional[Callable[[List[str]], Tuple[List[np.ndarray], List[np.ndarray]]]] = None,
+        batch_size: int = 64,
+        bucket_window: int = 4,
+        queue_depth: int = 4,
+        upsert_workers: int = 2,
+        checkpoint_path: Optional[str] = None,
+        on_embedded: Optional[Callable[[List[TextNode]], None]] = None,
+        on_committed: Optional[Callable[[List[TextNode]], None]] = None,
+    ):
+        self.qdrant = qdrant_manager
+        self.embed_fn = embed_fn
+        self.sparse_fn = sparse_fn
+        self.batch_size = batch_size
+        self.bucket_window = bucket_window
+        self.queue_depth = queue_depth
+        self.upsert_workers = upsert_workers
+        self.checkpoint = IngestionCheckpoint(checkpoint_path)
+        self.on_embedded = on_embedded
+        self.on_committed = on_committed
+
+        self._error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._collection_ready = False
+
+    def _fail(self, error: BaseException) -> None:
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Blocking put that gives up once another stage has failed."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _bucketed_batches(self, nodes: Iterable[TextNode], committed: Set[CommitKey], stats: IngestionStats) -> Iterator[List[TextNode]]:
+        window: List[TextNode] = []
+        window_size = self.batch_size * self.bucket_window
+
+        def flush():
+            window.sort(key=lambda node: len(node.text))
+            for i in range(0, len(window), self.batch_size):
+                yield window[i:i + self.batch_size]
+            window.clear()
+
+        for node in nodes:
+            if commit_key(node) in committed:
+                stats.skipped += 1
+                continue
+            window.append(node)
+            if len(window) >= window_size:
+                yield from flush()
+        if window:
+            yield from flush()
+
+    def _build_points(self, nodes: List[TextNode], dense: np.ndarray, sparse) -> List[models.PointStruct]:
+        points = []
+        for i, node in enumerate(nodes):
+            vector = {DENSE_VECTOR_NAME: dense[i].tolist()}
+            if sparse is not None:
+                indices, values = sparse
+                vector[SPARSE_VECTOR_NAME] = models.SparseVector(indices=indices[i].tolist(), values=values[i].tolist())
+            points.append(models.PointStruct(
+                id=node.node_id,
+                vector=vector,
+                payload=node_to_metadata_dict(node, remove_text=False, flat_metadata=False),
+            ))
+        return points
+
+    def _embed_stage(self, inbox: queue.Queue, outbox: queue.Queue) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    batch = inbox.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if batch is _DONE:
+                    break
+
+                dense = self.embed_fn(batch)
+                sparse = None
+                if self.sparse_fn is not None:
+                    # Same text QdrantVectorStore feeds its sparse_doc_fn
+                    sparse = self.sparse_fn([node.get_content(metadata_mode=MetadataMode.EMBED) for node in batch])
+                if self.on_embedded is not None:
+                    self.on_embedded(batch)
+
+                if not self._collection_ready:
+                    self.qdrant.ensure_collection(vector_size=dense.shape[1])
+                    self._collection_ready = True
+
+                if not self._put(outbox, (batch, self._build_points(batch, dense, sparse))):
+                    break
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            for _ in range(self.upsert_workers):
+                self._put(outbox, _DONE)
+
+    def _upsert_stage(self, inbox: queue.Queue, stats: IngestionStats) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    item = inbox.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if item is _DONE:
+                    break
+
+                nodes, points = item
+                self.qdrant.upsert_points(points)
+                if self.on_committed is not None:
+                    self.on_committed(nodes)
+                self.checkpoint.commit([commit_key(node) for node in nodes])
+                with self._stats_lock:
+                    stats.chunks += len(nodes)
+                    stats.batches += 1
+                    if stats.batches % 10 == 0:
+                        logger.info(f"Committed {stats.chunks} chunks ({stats.batches} batches)")
+        except BaseException as e:
+            self._fail(e)
+
+    def run(self, nodes: Iterable[TextNode]) -> IngestionStats:
+        stats = IngestionStats()
+        committed = self.checkpoint.load()
+        if committed:
+            logger.info(f"Resuming: {len(committed)} chunks already committed")
+
+        to_embed: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        to_upsert: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        workers = [threading.Thread(target=self._embed_stage, args=(to_embed, to_upsert), name="ingest-embed")]
+        workers += [
+            threading.Thread(target=self._upsert_stage, args=(to_upsert, stats), name=f"ingest-upsert-{i}")
+            for i in range(self.upsert_workers)
+        ]
+
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        try:
+            for batch in self._bucketed_batches(nodes, committed, stats):
+                if not self._put(to_embed, batch):
+                    break
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put(to_embed, _DONE)
+            for worker in workers:
+                worker.join()
+        stats.seconds = time.perf_counter() - start
+
+        if self._error is not None:
+            logger.error(f"[ERROR] Ingestion stopped after {stats.chunks} chunks; rerun to resume")
+            raise self._error
+
+        self.checkpoint.clear()
+        logger.info(
+            f"[OK] Ingested {stats.chunks} chunks in {stats.seconds:.1f}s "
+            f"({stats.chunks_per_second:.1f} chunks/s, {stats.skipped} resumed from checkpoint)"
+        )
+        return stats
@@ -1,8 +1,21 @@
-from src.clients.llm import LLMClient
-from src.clients.embedding_client import EmbeddingClient
-from src.clients.sparse_embedding_client import SparseEmbeddingClient
-from src.clients.qdrant import QdrantClientManager
-from src.clients.redis import RedisClient
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.clients.llm import LLMClient
+    from src.clients.embedding_client import EmbeddingClient
+    from src.clients.sparse_embedding_client import SparseEmbeddingClient
+    from src.clients.qdrant import QdrantClientManager
+    from src.clients.redis import RedisClient
+
+# Clients pull in llama_index, fastembed and qdrant_client; resolve them on first access only.
+_LAZY_IMPORTS = {
+    "LLMClient": "src.clients.llm",
+    "EmbeddingClient": "src.clients.embedding_client",
+    "SparseEmbeddingClient": "src.clients.sparse_embedding_client",
+    "QdrantClientManager": "src.clients.qdrant",
+    "RedisClient": "src.clients.redis",
+}
 
 __all__ = [
     "LLMClient",
@@ -11,3 +24,9 @@ __all__ = [
     "QdrantClientManager",
     "RedisClient",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        return getattr(import_module(_LAZY_IMPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,168 @@
+from typing import List, Optional, Sequence, Tuple
+from src.core.settings import settings
+import numpy as np
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+SparseVector = Tuple[np.ndarray, np.ndarray]  # int32 indices, float32 values
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache (SQLite) keyed by (model name, normalized text hash).
+
+    Dense vectors are stored as float16; sparse vectors as int32 indices plus
+    float16 values. Lookups return float32 NumPy arrays. The cache is bounded by `max_mb`: once exceeded, the least
+    recently used entries are evicted. Safe to share between threads.
+
+    Writes keep a running size total instead of summing the table on every put;
+    the total is recounted from the table only when it crosses the budget, which
+    also absorbs writes made by other processes.
+    """
+
+    def __init__(self, path: str = settings.embedding_cache_path, max_mb: int = settings.embedding_cache_max_mb):
+        self.path = path
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                data BLOB NOT NULL,
+                aux BLOB,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self._total: Optional[int] = None  # bytes in the table, counted on first write
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+    def _get_rows(self, model: str, texts: Sequence[str]) -> List[Optional[Tuple[bytes, Optional[bytes]]]]:
+        hashes = [self.text_hash(text) for text in texts]
+        found = {}
+        with self._lock:
+            # SQLite caps bound parameters; query in slices
+            for i in range(0, len(hashes), 500):
+                part = hashes[i:i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, data, aux FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *part],
+                ).fetchall()
+                found.update({text_hash: (data, aux) for text_hash, data, aux in rows})
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, text_hash) for text_hash in found],
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return [found.get(h) for h in hashes]
+
+    def _table_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+    def _replaced_size(self, model: str, hashes: Sequence[str]) -> int:
+        """Bytes of the existing rows an INSERT OR REPLACE of `hashes` overwrites (primary key lookups)."""
+        replaced = 0
+        for i in range(0, len(hashes), 500):
+            part = hashes[i:i + 500]
+            placeholders = ",".join("?" * len(part))
+            replaced += self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                [model, *part],
+            ).fetchone()[0]
+        return replaced
+
+    def _put_rows(self, model: str, texts: Sequence[str], rows: Sequence[Tuple[bytes, Optional[bytes]]]) -> None:
+        now = time.time()
+        records = [
+            (model, self.text_hash(text), data, aux, len(data) + len(aux or b""), now)
+            for text, (data, aux) in zip(texts, rows)
+        ]
+        with self._lock:
+            if self._total is None:
+                self._total = self._table_size()
+            replaced = self._replaced_size(model, list({record[1] for record in records}))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, data, aux, size, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                records,
+            )
+            self._conn.commit()
+            self._total += sum({record[1]: record[4] for record in records}.values()) - replaced
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Recount: other processes may have written or evicted since the total was taken
+        total = self._table_size()
+        self._total = total
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until 90% of the budget is left
+        target = int(self.max_bytes * 0.9)
+        freed = 0
+        victims = []
+        for text_model, text_hash, size in self._conn.execute(
+            "SELECT model, text_hash, size FROM embeddings ORDER BY last_used"
+        ):
+            if total - freed <= target:
+                break
+            victims.append((text_model, text_hash))
+            freed += size
+        self._conn.executemany("DELETE FROM embeddings WHERE model = ? AND text_hash = ?", victims)
+        self._conn.commit()
+        self._total = total - freed
+        logger.info(f"Embedding cache evicted {len(victims)} entries ({freed / 1e6:.1f} MB)")
+
+    def get_dense(self, model: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        return [
+            None if row is None else np.frombuffer(row[0], dtype=np.float16).astype(np.float32)
+            for row in self._get_rows(model, texts)
+        ]
+
+    def put_dense(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        self._put_rows(model, texts, [(np.asarray(v, dtype=np.float16).tobytes(), None) for v in vectors])
+
+    def get_sparse(self, model: str, texts: Sequence[str]) -> List[Optional[SparseVector]]:
+        return [
+            None if row is None else (
+                np.frombuffer(row[0], dtype=np.int32),
+                np.frombuffer(row[1], dtype=np.float16).astype(np.float32),
+            )
+            for row in self._get_rows(model, texts)
+        ]
+
+    def put_sparse(self, model: str, texts: Sequence[str], vectors: Sequence[SparseVector]) -> None:
+        self._put_rows(model, texts, [
+            (np.asarray(indices, dtype=np.int32).tobytes(), np.asarray(values, dtype=np.float16).tobytes())
+            for indices, values in vectors
+        ])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,26 +1,57 @@
 from llama_index.embeddings.fastembed import FastEmbedEmbedding
 from llama_index.core import Settings as LlamaSettings
 from src.core.settings import settings
+from src.clients.embedding_profiles import MODEL_CACHE_DIR, get_embedding_profile, register_profile_model
+from src.clients.token_batching import embed_bucketed, token_lengths
+from typing import Optional
+import numpy as np
 import time
 import logging
 
 class EmbeddingClient:
-    def __init__(self):
-        logging.info("Initializing FastEmbed embeddings...")
+    def __init__(self, profile: Optional[str] = None):
+        self.profile = get_embedding_profile(profile or settings.embedding_profile)
+        logging.info(f"Initializing FastEmbed embeddings (profile: {self.profile.name})...")
+        register_profile_model(self.profile)
+        model_kwargs = {}
+        if self.profile.local_dir:
+            # Locally exported models (e.g. int8 quantized) are loaded from disk, never downloaded
+            model_kwargs["specific_model_path"] = self.profile.local_dir
         self.embed_model = FastEmbedEmbedding(
-            #model_name="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
-            model_name="intfloat/multilingual-e5-large",
-            cache_dir="./model_cache",
+            model_name=self.profile.model_name,
+            cache_dir=MODEL_CACHE_DIR,
+            **model_kwargs,
             )
         LlamaSettings.embed_model = self.embed_model
         logging.info("Embedding model loaded successfully")
 
     def embed_documents(self, documents: list[str]) -> list[list[float]]:
-        return self.embed_model.get_text_embedding_batch(documents)
+        return self.embed_document_arrays(documents).tolist()
+
+    def embed_document_arrays(self, documents: list[str]) -> np.ndarray:
+        """
+        (len(documents), dim) float32 matrix straight from the ONNX output; one call
+        per token-budget batch instead of get_text_embedding_batch's fixed batches of 10.
+        """
+        return np.asarray(
+            embed_bucketed(documents, self._embed_onnx, self.embed_model._model.model.tokenizer), dtype=np.float32
+        )
+
+    def _embed_onnx(self, batch: list[str]) -> list[np.ndarray]:
+        # FastEmbedEmbedding._get_text_embeddings without its per-vector tolist()
+        if self.embed_model.doc_embed_type == "passage":
+            return list(self.embed_model._model.passage_embed(batch, batch_size=len(batch)))
+        return list(self.embed_model._model.embed(batch, batch_size=len(batch)))
+
+    def token_lengths(self, documents: list[str]) -> list[int]:
+        return token_lengths(documents, self.embed_model._model.model.tokenizer)
 
     def embed_query(self, query: str) -> list[float]:
         return self.embed_model.get_query_embedding(query)
 
+    def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        # Batched counterpart of embed_query; FastEmbedEmbedding only exposes single queries.
+        return [embedding.tolist() for embedding in self.embed_model._model.query_embed(queries)]
+
     def get_embed_model(self) -> FastEmbedEmbedding:
         return self.embed_model
-
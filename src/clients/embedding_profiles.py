@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import logging
+import shutil
+
+logger = logging.getLogger(__name__)
+
+MODEL_CACHE_DIR = "./model_cache"
+
+
+@dataclass(frozen=True)
+class EmbeddingProfile:
+    name: str
+    model_name: str
+    dim: int
+    collection_suffix: str = ""
+    # Set for models fastembed does not ship natively; registered via add_custom_model
+    hf_source: Optional[str] = None
+    model_file: str = "onnx/model.onnx"
+    # Directory holding a locally exported model (e.g. the int8 quantized e5-large)
+    local_dir: Optional[str] = None
+
+    def collection_name(self, base: str) -> str:
+        return f"{base}{self.collection_suffix}"
+
+
+EMBEDDING_PROFILES = {
+    "e5-large": EmbeddingProfile(
+        name="e5-large",
+        model_name="intfloat/multilingual-e5-large",
+        dim=1024,
+    ),
+    "e5-base": EmbeddingProfile(
+        name="e5-base",
+        model_name="intfloat/multilingual-e5-base",
+        dim=768,
+        collection_suffix="_e5_base",
+        hf_source="intfloat/multilingual-e5-base",
+    ),
+    "e5-small": EmbeddingProfile(
+        name="e5-small",
+        model_name="intfloat/multilingual-e5-small",
+        dim=384,
+        collection_suffix="_e5_small",
+        hf_source="intfloat/multilingual-e5-small",
+    ),
+    "e5-large-int8": EmbeddingProfile(
+        name="e5-large-int8",
+        model_name="emu/multilingual-e5-large-int8",
+        dim=1024,
+        collection_suffix="_e5_large_int8",
+        hf_source="qdrant/multilingual-e5-large-onnx",
+        model_file="model_quantized.onnx",
+        local_dir=f"{MODEL_CACHE_DIR}/multilingual-e5-large-int8",
+    ),
+}
+
+
+def get_embedding_profile(name: str) -> EmbeddingProfile:
+    try:
+        return EMBEDDING_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown embedding profile '{name}'. Available: {', '.join(EMBEDDING_PROFILES)}")
+
+
+def register_profile_model(profile: EmbeddingProfile) -> None:
+    """Register non-builtin models with fastembed (idempotent)."""
+    if profile.hf_source is None:
+        return
+    from fastembed import TextEmbedding
+    from fastembed.common.model_description import ModelSource, PoolingType
+
+    if any(m["model"] == profile.model_name for m in TextEmbedding.list_supported_models()):
+        return
+    TextEmbedding.add_custom_model(
+        model=profile.model_name,
+        pooling=PoolingType.MEAN,
+        normalization=True,
+        sources=ModelSource(hf=profile.hf_source),
+        dim=profile.dim,
+        model_file=profile.model_file,
+    )
+
+
+def export_quantized_e5_large(cache_dir: str = MODEL_CACHE_DIR) -> Path:
+    """
+    Build the e5-large-int8 profile: dynamic int8 quantization of the fastembed
+    e5-large ONNX export. Requires `onnx` and `onnxruntime` (quantization tools).
+    """
+    from fastembed import TextEmbedding
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    profile = EMBEDDING_PROFILES["e5-large-int8"]
+    output_dir = Path(profile.local_dir)
+    output_path = output_dir / profile.model_file
+    if output_path.exists():
+        return output_dir
+
+    # Make sure the fp32 model is in the cache, then locate its files
+    TextEmbedding(model_name=EMBEDDING_PROFILES["e5-large"].model_name, cache_dir=cache_dir)
+    repo_dir = f"models--{profile.hf_source.replace('/', '--')}"
+    candidates = sorted(Path(cache_dir).glob(f"**/{repo_dir}/**/model.onnx")) or sorted(
+        Path(cache_dir).glob("**/fast-multilingual-e5-large/model.onnx")
+    )
+    if not candidates:
+        raise FileNotFoundError(f"Could not find the e5-large ONNX model under {cache_dir}")
+    source_dir = candidates[0].parent
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for path in source_dir.iterdir():
+        if path.is_file() and not path.name.startswith("model.onnx"):
+            shutil.copy(path, output_dir / path.name)
+
+    logger.info(f"Quantizing {candidates[0]} -> {output_path}")
+    quantize_dynamic(
+        model_input=str(candidates[0]),
+        model_output=str(output_path),
+        weight_type=QuantType.QInt8,
+        use_external_data_format=False,
+    )
+    return output_dir
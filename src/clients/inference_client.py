@@ -0,0 +1,156 @@
+from typing import Any, List, Optional, Tuple
+from pydantic import PrivateAttr
+from llama_index.core.embeddings import BaseEmbedding
+from src.core.settings import settings
+import httpx
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceClient:
+    """HTTP client for the shared inference server (src/inference/server.py)."""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = settings.inference_url,
+        socket_path: Optional[str] = settings.inference_socket,
+        timeout: float = settings.inference_timeout,
+    ):
+        if socket_path:
+            transport = httpx.HTTPTransport(uds=socket_path)
+            async_transport = httpx.AsyncHTTPTransport(uds=socket_path)
+            base_url = "http://inference"
+        elif base_url:
+            transport = async_transport = None
+        else:
+            raise ValueError("Set INFERENCE_URL or INFERENCE_SOCKET to use the inference server")
+
+        self.client = httpx.Client(base_url=base_url, transport=transport, timeout=timeout)
+        self.aclient = httpx.AsyncClient(base_url=base_url, transport=async_transport, timeout=timeout)
+        logger.info(f"Using shared inference server at {socket_path or base_url}")
+
+    def post(self, path: str, payload: dict) -> dict:
+        response = self.client.post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def apost(self, path: str, payload: dict) -> dict:
+        response = await self.aclient.post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+
+class RemoteEmbedding(BaseEmbedding):
+    """llama_index embedding model backed by the inference server."""
+
+    _inference: InferenceClient = PrivateAttr()
+
+    def __init__(self, inference: InferenceClient, **kwargs: Any):
+        super().__init__(model_name="remote-inference", **kwargs)
+        self._inference = inference
+
+    def _embed(self, texts: List[str], kind: str) -> List[List[float]]:
+        return self._inference.post("/embed/dense", {"texts": texts, "kind": kind})["embeddings"]
+
+    async def _aembed(self, texts: List[str], kind: str) -> List[List[float]]:
+        return (await self._inference.apost("/embed/dense", {"texts": texts, "kind": kind}))["embeddings"]
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed([query], "query")[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return (await self._aembed([query], "query"))[0]
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed([text], "document")[0]
+
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        return (await self._aembed([text], "document"))[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, "document")
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return await self._aembed(texts, "document")
+
+
+class RemoteEmbeddingClient:
+    """Drop-in replacement for EmbeddingClient that defers to the inference server."""
+
+    def __init__(self, inference: InferenceClient):
+        from llama_index.core import Settings as LlamaSettings
+        self.embed_model = RemoteEmbedding(inference)
+        LlamaSettings.embed_model = self.embed_model
+
+    def embed_documents(self, documents: list[str]) -> list[list[float]]:
+        # One request; the server buckets the texts by token length
+        return self.embed_model._embed(documents, "document")
+
+    def embed_document_arrays(self, documents: list[str]) -> np.ndarray:
+        return np.asarray(self.embed_documents(documents), dtype=np.float32)
+
+    def embed_query(self, query: str) -> list[float]:
+        return self.embed_model.get_query_embedding(query)
+
+    def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        return self.embed_model._embed(queries, "query")
+
+    def get_embed_model(self) -> RemoteEmbedding:
+        return self.embed_model
+
+
+class RemoteSparseEmbeddingClient:
+    """Drop-in replacement for SparseEmbeddingClient that defers to the inference server."""
+
+    def __init__(self, inference: InferenceClient, model_name: str = "prithivida/Splade_PP_en_v1"):
+        self.inference = inference
+        self.model_name = model_name
+
+    def _embed(self, texts: List[str], kind: str) -> Tuple[List[List[int]], List[List[float]]]:
+        result = self.inference.post("/embed/sparse", {"texts": texts, "kind": kind})
+        return (result["indices"], result["values"])
+
+    def embed_documents(self, documents: List[str]) -> Tuple[List[List[int]], List[List[float]]]:
+        return self._embed(documents, "document")
+
+    def embed_document_arrays(self, documents: List[str]) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        indices, values = self.embed_documents(documents)
+        return ([np.asarray(row, dtype=np.int32) for row in indices], [np.asarray(row, dtype=np.float32) for row in values])
+
+    def embed_query(self, query: str) -> Tuple[List[int], List[float]]:
+        indices, values = self._embed([query], "query")
+        return (indices[0], values[0])
+
+    def embed_queries(self, queries: List[str]) -> Tuple[List[List[int]], List[List[float]]]:
+        return self._embed(queries, "query")
+
+    async def aembed_documents(self, documents: List[str]) -> Tuple[List[List[int]], List[List[float]]]:
+        result = await self.inference.apost("/embed/sparse", {"texts": documents, "kind": "document"})
+        return (result["indices"], result["values"])
+
+
+class RemoteRerankerClient:
+    """Drop-in replacement for RerankerClient that defers to the inference server."""
+
+    def __init__(self, inference: InferenceClient, model_name: Optional[str] = None):
+        self.inference = inference
+        self.model_name = model_name or settings.reranker_model
+
+    def rerank(self, query: str, documents: list[str]) -> list[float]:
+        return self.inference.post("/rerank", {"query": query, "documents": documents})["scores"]
+
+    async def arerank(self, query: str, documents: list[str]) -> list[float]:
+        return (await self.inference.apost("/rerank", {"query": query, "documents": documents}))["scores"]
+
+    def rerank_pairs(self, pairs: list[tuple[str, str]]) -> list[float]:
+        # The server batches across callers, so one request per distinct query is enough
+        by_query: dict[str, list[int]] = {}
+        for i, (query, _) in enumerate(pairs):
+            by_query.setdefault(query, []).append(i)
+        scores = [0.0] * len(pairs)
+        for query, positions in by_query.items():
+            for i, score in zip(positions, self.rerank(query, [pairs[i][1] for i in positions])):
+                scores[i] = score
+        return scores
@@ -0,0 +1,64 @@
+from fastembed import LateInteractionTextEmbedding
+from typing import List, Optional
+from src.core.settings import settings
+from src.clients.token_vector_store import TokenVectorStore, maxsim_scores
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LateInteractionClient:
+    """Token-level (ColBERT-style) embeddings via fastembed."""
+
+    DEFAULT_MODEL = "answerdotai/answerai-colbert-small-v1"
+
+    def __init__(self, model_name: Optional[str] = None, cache_dir: str = "./model_cache"):
+        self.model_name = model_name or self.DEFAULT_MODEL
+        logger.info(f"Loading late-interaction model: {self.model_name}")
+        self.model = LateInteractionTextEmbedding(model_name=self.model_name, cache_dir=cache_dir)
+        logger.info("Late-interaction model ready")
+
+    def embed_documents(self, documents: List[str], batch_size: int = 32) -> List[np.ndarray]:
+        return list(self.model.passage_embed(documents, batch_size=batch_size))
+
+    def embed_query(self, query: str) -> np.ndarray:
+        return next(iter(self.model.query_embed(query)))
+
+
+class LateInteractionReranker:
+    """
+    Reranker backend that scores candidates with MaxSim over precomputed token
+    vectors. Chunks missing from the store (e.g. ingested before the store existed)
+    are encoded on the fly.
+    """
+
+    def __init__(
+        self,
+        client: Optional[LateInteractionClient] = None,
+        store_path: str = settings.token_store_path,
+    ):
+        self.client = client or LateInteractionClient(model_name=settings.late_interaction_model)
+        self.model_name = self.client.model_name
+        self.store = TokenVectorStore(store_path, model_name=self.model_name)
+
+    def rerank(self, query: str, documents: List[str]) -> List[float]:
+        # Without chunk ids every document is encoded at query time
+        return self.score_chunks(query, [None] * len(documents), documents)
+
+    def score_chunks(self, query: str, chunk_ids: List[str], texts: List[str]) -> List[float]:
+        query_tokens = self.client.embed_query(query).astype(np.float32)
+        tokens, starts, found = self.store.gather(chunk_ids)
+
+        scores = np.zeros(len(chunk_ids), dtype=np.float32)
+        scores[found] = maxsim_scores(query_tokens, tokens, starts)
+
+        missing = sorted(set(range(len(chunk_ids))) - set(found))
+        if missing:
+            logger.debug(f"{len(missing)} candidates not in token store, encoding at query time")
+            encoded = self.client.embed_documents([texts[i] for i in missing])
+            lengths = [len(t) for t in encoded]
+            starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            scores[missing] = maxsim_scores(query_tokens, np.concatenate(encoded).astype(np.float32), starts)
+
+        return scores.tolist()
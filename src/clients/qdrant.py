@@ -1,14 +1,26 @@
-from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 from llama_index.vector_stores.qdrant import QdrantVectorStore
 from llama_index.core import StorageContext, VectorStoreIndex
 from llama_index.core.schema import Document
 from llama_index.core.vector_stores.types import VectorStoreQueryMode
-from typing import Optional, List, Callable
+from typing import Optional, List, Callable, Dict, Iterable, Tuple
 from src.core.settings import settings
+from src.clients.embedding_profiles import get_embedding_profile
 import logging
+import re
+import time
+import uuid
+
+# Vector names used by QdrantVectorStore hybrid collections; the streaming ingestion
+# writes points directly, so both sides must agree on them explicitly.
+DENSE_VECTOR_NAME = "text-dense"
+SPARSE_VECTOR_NAME = "text-sparse-new"
+
+# Manifest points are keyed by (physical collection, source)
+MANIFEST_NAMESPACE = uuid.UUID("0b7e4d52-3c1a-5f0e-8d2b-6a9c1e4f7d30")
 
 class QdrantClientManager:
-    def __init__(self, collection_name: str = "emu_regulations"):
+    def __init__(self, collection_name: Optional[str] = None):
         self.client = AsyncQdrantClient(
             url=settings.qdrant_url, 
             api_key=settings.qdrant_api_key
@@ -17,9 +29,13 @@ class QdrantClientManager:
             url=settings.qdrant_url, 
             api_key=settings.qdrant_api_key
         )
-        self.collection_name = collection_name
+        # Each embedding profile has its own collection since vector sizes differ
+        self.collection_name = collection_name or get_embedding_profile(
+            settings.embedding_profile
+        ).collection_name(settings.qdrant_collection)
         self._sparse_embed_fn: Optional[Callable] = None
         self.retrieval_top_k = settings.retrieval_top_k
+        self._active_collection: Optional[Tuple[str, float]] = None  # (collection, monotonic expiry)
 
     def set_sparse_embed_fn(self, sparse_embed_fn: Callable):
         self._sparse_embed_fn = sparse_embed_fn
@@ -31,6 +47,7 @@ class QdrantClientManager:
             
             if exists:
                 await self.client.delete_collection(self.collection_name)
+                self._delete_manifest_entries(self.collection_name)
                 logging.info(f"[OK] Deleted collection: {self.collection_name}")
             else:
                 logging.info(f"Collection '{self.collection_name}' does not exist yet")
@@ -47,6 +64,7 @@ class QdrantClientManager:
             
             if exists:
                 self.sync_client.delete_collection(self.collection_name)
+                self._delete_manifest_entries(self.collection_name)
                 logging.info(f"[OK] Deleted collection: {self.collection_name}")
             else:
                 logging.info(f"Collection '{self.collection_name}' does not exist yet")
@@ -62,10 +80,134 @@ class QdrantClientManager:
             **client_arg,
                 collection_name=self.collection_name,
                 enable_hybrid=enable_hybrid,
+                dense_vector_name=DENSE_VECTOR_NAME,
+                sparse_vector_name=SPARSE_VECTOR_NAME,
                 sparse_doc_fn=self._sparse_embed_fn if self._sparse_embed_fn else None,
                 sparse_query_fn=self._sparse_embed_fn if self._sparse_embed_fn else None,
             )
 
+    def exists(self) -> bool:
+        """True if collection_name is a collection or an alias pointing to one."""
+        if self.sync_client.collection_exists(self.collection_name):
+            return True
+        return self.resolve_alias() is not None
+
+    def resolve_alias(self, alias: Optional[str] = None) -> Optional[str]:
+        alias = alias or self.collection_name
+        for description in self.sync_client.get_aliases().aliases:
+            if description.alias_name == alias:
+                return description.collection_name
+        return None
+
+    async def active_collection(self) -> str:
+        """
+        Physical collection reads are served from right now (the alias target), via
+        the async client. Cached for `alias_cache_ttl` seconds: a swap made by
+        another process (reindex CLI) is picked up within that window.
+        """
+        if self._active_collection is not None and self._active_collection[1] > time.monotonic():
+            return self._active_collection[0]
+        collection = self.collection_name
+        for description in (await self.client.get_aliases()).aliases:
+            if description.alias_name == self.collection_name:
+                collection = description.collection_name
+                break
+        self._active_collection = (collection, time.monotonic() + settings.alias_cache_ttl)
+        return collection
+
+    def list_versions(self) -> List[Tuple[int, str]]:
+        """Versioned collections behind this alias, e.g. [(1, 'emu_regulations_v1'), ...], oldest first."""
+        pattern = re.compile(rf"^{re.escape(self.collection_name)}_v(\d+)$")
+        versions = []
+        for collection in self.sync_client.get_collections().collections:
+            match = pattern.match(collection.name)
+            if match:
+                versions.append((int(match.group(1)), collection.name))
+        return sorted(versions)
+
+    def next_version_name(self) -> str:
+        versions = self.list_versions()
+        return f"{self.collection_name}_v{versions[-1][0] + 1 if versions else 1}"
+
+    def swap_alias(self, target_collection: str, drop_legacy: bool = False) -> Optional[str]:
+        """
+        Atomically point the alias (collection_name) at target_collection.
+        Returns the previously aliased collection, if any.
+
+        A pre-alias deployment has a regular collection under the alias name; it
+        is only deleted (one-off, brief gap) when drop_legacy is set.
+        """
+        alias = self.collection_name
+        previous = self.resolve_alias(alias)
+        if previous is None and self.sync_client.collection_exists(alias):
+            if not drop_legacy:
+                raise RuntimeError(
+                    f"'{alias}' is a regular collection, not an alias. "
+                    f"Rerun with --drop-legacy to replace it with the versioned collection."
+                )
+            self.sync_client.delete_collection(alias)
+            logging.info(f"[OK] Deleted legacy collection: {alias}")
+        operations = []
+        if previous is not None:
+            operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias)))
+        operations.append(models.CreateAliasOperation(
+            create_alias=models.CreateAlias(collection_name=target_collection, alias_name=alias)
+        ))
+        # Both operations are applied in one request, so readers never see a missing alias
+        self.sync_client.update_collection_aliases(change_aliases_operations=operations)
+        self._active_collection = None
+        logging.info(f"[OK] Alias {alias}: {previous} -> {target_collection}")
+        return previous
+
+    def gc_versions(self, keep: int = 2) -> List[str]:
+        """Delete old versioned collections, keeping the newest `keep` and the aliased one."""
+        live = self.resolve_alias()
+        versions = [name for _, name in self.list_versions()]
+        doomed = [name for name in versions[:-keep] if name != live] if keep > 0 else [
+            name for name in versions if name != live
+        ]
+        for name in doomed:
+            self.sync_client.delete_collection(name)
+            self._delete_manifest_entries(name)
+            logging.info(f"[OK] Deleted old collection version: {name}")
+        return doomed
+
+    def ensure_collection(self, vector_size: int) -> bool:
+        """Create the hybrid collection (same layout as QdrantVectorStore) if missing."""
+        if self.exists():
+            # Collections from before the manifest may lack the source index that facets need
+            if "source" not in (self.sync_client.get_collection(self.collection_name).payload_schema or {}):
+                self.sync_client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name="source",
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+            return False
+        self.sync_client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config={
+                DENSE_VECTOR_NAME: models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+            },
+            sparse_vectors_config={
+                SPARSE_VECTOR_NAME: models.SparseVectorParams(index=models.SparseIndexParams()),
+            },
+        )
+        self.sync_client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name="doc_id",
+            field_schema=models.PayloadSchemaType.KEYWORD,
+        )
+        self.sync_client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name="source",
+            field_schema=models.PayloadSchemaType.KEYWORD,
+        )
+        logging.info(f"[OK] Created collection: {self.collection_name}")
+        return True
+
+    def upsert_points(self, points: List[models.PointStruct]) -> None:
+        self.sync_client.upsert(collection_name=self.collection_name, points=points, wait=True)
+
     def get_storage_context(self) -> StorageContext:
         vector_store = self.get_vector_store()
         return StorageContext.from_defaults(vector_store=vector_store)
@@ -85,7 +227,7 @@ class QdrantClientManager:
         
         return index.as_query_engine()
 
-    def get_retriever(self, hybrid: bool = True, alpha: float = 0.7):
+    def get_retriever(self, hybrid: bool = True, alpha: float = 0.7, top_k: Optional[int] = None):
         storage_context = self.get_storage_context()
         index = VectorStoreIndex.from_vector_store(
             self.get_vector_store(enable_hybrid=hybrid),
@@ -94,41 +236,162 @@ class QdrantClientManager:
         query_mode = VectorStoreQueryMode.HYBRID if hybrid else VectorStoreQueryMode.DEFAULT
 
         return index.as_retriever(
-            similarity_top_k=self.retrieval_top_k,
+            similarity_top_k=top_k or self.retrieval_top_k,
             vector_store_query_mode=query_mode,
             alpha=alpha,
         )
 
     def get_indexed_sources(self) -> set:
+        """Indexed sources, from the manifest (one point per source) instead of scrolling every chunk."""
         try:
-            collections = self.sync_client.get_collections().collections
-            if not any(c.name == self.collection_name for c in collections):
+            if not self.exists():
                 return set()
             
-            info = self.sync_client.get_collection(self.collection_name)
-            if info.points_count == 0:
-                return set()
-            
-            indexed_sources = set()
-            offset = None
-            
-            while True:
-                results, offset = self.sync_client.scroll(
-                    collection_name=self.collection_name,
-                    limit=100,
-                    offset=offset,
-                    with_payload=["source"],
-                )
-                
-                for point in results:
-                    if point.payload and "source" in point.payload:
-                        indexed_sources.add(point.payload["source"])
-                
-                if offset is None:
-                    break
+            manifest = self.get_manifest()
+            if manifest:
+                return {entry["source"] for entry in manifest}
             
-            return indexed_sources
+            # Collections ingested before the manifest existed: facet over the source
+            # index (created by ensure_collection at ingestion, never on this read path)
+            facet = self.sync_client.facet(self.collection_name, key="source", limit=10_000, exact=True)
+            return {hit.value for hit in facet.hits}
             
         except Exception as e:
             logging.warning(f"Could not get indexed sources: {e}")
-            return set()
\ No newline at end of file
+            return set()
+
+    def _physical_name(self) -> str:
+        return self.resolve_alias() or self.collection_name
+
+    def _manifest_filter(self, collection: str, sources: Optional[Iterable[str]] = None) -> models.Filter:
+        conditions = [models.FieldCondition(key="collection", match=models.MatchValue(value=collection))]
+        if sources is not None:
+            conditions.append(models.FieldCondition(key="source", match=models.MatchAny(any=list(sources))))
+        return models.Filter(must=conditions)
+
+    def write_manifest(self, entries: List[dict], removed_sources: Iterable[str] = ()) -> None:
+        """Upsert per-source manifest entries for the collection this manager writes to."""
+        manifest = settings.qdrant_manifest_collection
+        if not self.sync_client.collection_exists(manifest):
+            # Payload-only collection: a handful of points, one per (collection, source)
+            self.sync_client.create_collection(collection_name=manifest, vectors_config={})
+        
+        collection = self._physical_name()
+        removed_sources = list(removed_sources)
+        if removed_sources:
+            self.sync_client.delete(
+                collection_name=manifest,
+                points_selector=models.FilterSelector(filter=self._manifest_filter(collection, removed_sources)),
+                wait=True,
+            )
+        if entries:
+            # Unchanged sources keep the timestamp of the run that actually embedded them
+            previous = {entry["source"]: entry for entry in self.get_manifest()}
+            for entry in entries:
+                before = previous.get(entry["source"])
+                if before and (before.get("content_hash"), before.get("embedding_model")) == (
+                    entry["content_hash"], entry["embedding_model"]
+                ):
+                    entry["ingested_at"] = before.get("ingested_at", entry["ingested_at"])
+            self.sync_client.upsert(
+                collection_name=manifest,
+                points=[
+                    models.PointStruct(
+                        id=str(uuid.uuid5(MANIFEST_NAMESPACE, f"{collection}|{entry['source']}")),
+                        vector={},
+                        payload={**entry, "collection": collection},
+                    )
+                    for entry in entries
+                ],
+                wait=True,
+            )
+        logging.info(f"[OK] Manifest updated for {collection}: {len(entries)} sources, {len(removed_sources)} removed")
+
+    def get_manifest(self) -> List[dict]:
+        """Manifest entries of the collection currently behind collection_name, sorted by source."""
+        manifest = settings.qdrant_manifest_collection
+        if not self.sync_client.collection_exists(manifest):
+            return []
+        
+        entries = []
+        offset = None
+        while True:
+            results, offset = self.sync_client.scroll(
+                collection_name=manifest,
+                scroll_filter=self._manifest_filter(self._physical_name()),
+                limit=256,
+                offset=offset,
+                with_payload=True,
+            )
+            entries.extend(point.payload for point in results if point.payload)
+            if offset is None:
+                break
+        return sorted(entries, key=lambda entry: entry.get("source") or "")
+
+    async def aget_manifest(self) -> List[dict]:
+        """get_manifest through the async client, for request handlers."""
+        manifest = settings.qdrant_manifest_collection
+        if not await self.client.collection_exists(manifest):
+            return []
+        
+        collection = await self.active_collection()
+        entries = []
+        offset = None
+        while True:
+            results, offset = await self.client.scroll(
+                collection_name=manifest,
+                scroll_filter=self._manifest_filter(collection),
+                limit=256,
+                offset=offset,
+                with_payload=True,
+            )
+            entries.extend(point.payload for point in results if point.payload)
+            if offset is None:
+                break
+        return sorted(entries, key=lambda entry: entry.get("source") or "")
+
+    def _delete_manifest_entries(self, collection: str) -> None:
+        manifest = settings.qdrant_manifest_collection
+        if self.sync_client.collection_exists(manifest):
+            self.sync_client.delete(
+                collection_name=manifest,
+                points_selector=models.FilterSelector(filter=self._manifest_filter(collection)),
+                wait=True,
+            )
+
+    def get_indexed_hashes(self, sources: Optional[Iterable[str]] = None) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """{point_id: (source, content_hash)} for the indexed points, optionally of some sources only."""
+        if not self.exists():
+            return {}
+        
+        scroll_filter = None
+        if sources is not None:
+            scroll_filter = models.Filter(must=[
+                models.FieldCondition(key="source", match=models.MatchAny(any=list(sources)))
+            ])
+        
+        indexed = {}
+        offset = None
+        while True:
+            results, offset = self.sync_client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                limit=1000,
+                offset=offset,
+                with_payload=["source", "content_hash"],
+            )
+            for point in results:
+                payload = point.payload or {}
+                indexed[str(point.id)] = (payload.get("source"), payload.get("content_hash"))
+            if offset is None:
+                break
+        return indexed
+
+    def delete_points(self, point_ids: List[str]) -> None:
+        if point_ids:
+            self.sync_client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.PointIdsList(points=point_ids),
+                wait=True,
+            )
+            logging.info(f"[OK] Deleted {len(point_ids)} stale points")
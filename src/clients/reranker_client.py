@@ -1,5 +1,6 @@
 from fastembed.rerank.cross_encoder import TextCrossEncoder
 from typing import Optional
+from src.core.settings import settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -8,12 +9,32 @@ logger = logging.getLogger(__name__)
 class RerankerClient:
     DEFAULT_MODEL = "jinaai/jina-reranker-v1-turbo-en"
     
-    def __init__(self, model_name: Optional[str] = None, cache_dir: str = "./model_cache"):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        cache_dir: str = "./model_cache",
+        max_tokens: Optional[int] = settings.reranker_max_tokens,
+    ):
         self.model_name = model_name or self.DEFAULT_MODEL
         logger.info(f"Loading reranker: {self.model_name}")
         
         self.model = TextCrossEncoder(model_name=self.model_name, cache_dir=cache_dir)
+        if max_tokens:
+            self._cap_tokens(max_tokens)
         logger.info("Reranker ready")
+
+    def _cap_tokens(self, max_tokens: int) -> None:
+        # Cross-encoder cost grows with pair length; (query, passage) pairs are truncated
+        # longest-first, so the query survives and the passage tail is dropped.
+        tokenizer = getattr(self.model.model, "tokenizer", None)
+        if tokenizer is None:
+            logger.warning("Reranker tokenizer not loaded, token cap not applied")
+            return
+        model_limit = (tokenizer.truncation or {}).get("max_length", max_tokens)
+        tokenizer.enable_truncation(max_length=min(max_tokens, model_limit))
     
     def rerank(self, query: str, documents: list[str]):
         return self.model.rerank(query, documents)
+
+    def rerank_pairs(self, pairs: list[tuple[str, str]]) -> list[float]:
+        return list(self.model.rerank_pairs(pairs, batch_size=max(len(pairs), 1)))
@@ -1,10 +1,13 @@
 from fastembed import SparseTextEmbedding
 from typing import List, Tuple
+from src.clients.token_batching import embed_bucketed, token_lengths
+import numpy as np
 import logging
 
 class SparseEmbeddingClient:  
     def __init__(self, model_name: str = "prithivida/Splade_PP_en_v1"):
         logging.info(f"Initializing SPLADE sparse embeddings ({model_name})...")
+        self.model_name = model_name
         self.model = SparseTextEmbedding(
             model_name=model_name,
             cache_dir="./model_cache",
@@ -12,11 +15,25 @@ class SparseEmbeddingClient:
         logging.info("Sparse embedding model loaded successfully")
     
     def embed_documents(self, documents: List[str]) -> Tuple[List[List[int]], List[List[float]]]:
-        embeddings = list(self.model.embed(documents))
-        all_indices = [emb.indices.tolist() for emb in embeddings]
-        all_values = [emb.values.tolist() for emb in embeddings]
-        return (all_indices, all_values)
+        indices, values = self.embed_document_arrays(documents)
+        return ([row.tolist() for row in indices], [row.tolist() for row in values])
+
+    def embed_document_arrays(self, documents: List[str]) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Per document, the indices and float32 values arrays of the ONNX output (no copies)."""
+        embeddings = embed_bucketed(
+            documents,
+            lambda batch: list(self.model.embed(batch, batch_size=len(batch))),
+            self.model.model.tokenizer,
+        )
+        return ([emb.indices for emb in embeddings], [emb.values for emb in embeddings])
     
+    def token_lengths(self, documents: List[str]) -> List[int]:
+        return token_lengths(documents, self.model.model.tokenizer)
+
     def embed_query(self, query: str) -> Tuple[List[int], List[float]]:
         embedding = list(self.model.query_embed(query))[0]
-        return (embedding.indices.tolist(), embedding.values.tolist())
\ No newline at end of file
+        return (embedding.indices.tolist(), embedding.values.tolist())
+
+    def embed_queries(self, queries: List[str]) -> Tuple[List[List[int]], List[List[float]]]:
+        embeddings = list(self.model.query_embed(queries))
+        return ([emb.indices.tolist() for emb in embeddings], [emb.values.tolist() for emb in embeddings])
@@ -0,0 +1,72 @@
+"""
+Token-budget batching for the ONNX embedding models.
+
+FastEmbed pads every batch to its longest member, so a batch that mixes a
+150 character chunk with a 1500 character table spends most of its compute on
+padding. Texts are therefore sorted by token length and packed greedily into
+batches whose padded size (items x longest member) stays within
+`max_tokens`, with at most `max_items` texts each. Results are returned in
+the original input order.
+"""
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from src.core.settings import settings
+
+T = TypeVar("T")
+
+# Rough characters per token for English legal text, used when no tokenizer is at hand
+CHARS_PER_TOKEN = 4
+
+
+def token_lengths(texts: Sequence[str], tokenizer=None) -> List[int]:
+    """
+    Token count per text (after the model's truncation). `tokenizer` is a
+    `tokenizers.Tokenizer` as loaded by FastEmbed; without one the count is
+    estimated from the character length.
+    """
+    if tokenizer is None:
+        return [len(text) // CHARS_PER_TOKEN + 2 for text in texts]
+    return [sum(encoding.attention_mask) for encoding in tokenizer.encode_batch(list(texts))]
+
+
+def plan_batches(
+    lengths: Sequence[int],
+    max_tokens: int = settings.embed_max_batch_tokens,
+    max_items: int = settings.embed_max_batch_size,
+) -> List[List[int]]:
+    """Indices into `lengths`, shortest first, cut into batches within the padded-token budget."""
+    batches: List[List[int]] = []
+    current: List[int] = []
+    for i in sorted(range(len(lengths)), key=lengths.__getitem__):
+        # Ascending order: the new text is the longest, so it sets the padded width
+        if current and (len(current) >= max_items or (len(current) + 1) * lengths[i] > max_tokens):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def padded_tokens(lengths: Sequence[int], batches: Sequence[Sequence[int]]) -> int:
+    """Tokens the model actually processes for `batches`, padding included."""
+    return sum(len(batch) * max(lengths[i] for i in batch) for batch in batches if batch)
+
+
+def embed_bucketed(
+    texts: Sequence[str],
+    embed_fn: Callable[[List[str]], Sequence[T]],
+    tokenizer=None,
+    max_tokens: int = settings.embed_max_batch_tokens,
+    max_items: int = settings.embed_max_batch_size,
+) -> List[T]:
+    """Run `embed_fn` over length-bucketed batches of `texts`; one result per text, in input order."""
+    if len(texts) <= 1:
+        # Single queries (e.g. the hybrid retriever's sparse_query_fn) skip the extra tokenization
+        return list(embed_fn(list(texts))) if texts else []
+    lengths = token_lengths(texts, tokenizer)
+    results: List[Optional[T]] = [None] * len(texts)
+    for batch in plan_batches(lengths, max_tokens, max_items):
+        for i, result in zip(batch, embed_fn([texts[i] for i in batch])):
+            results[i] = result
+    return results
@@ -0,0 +1,196 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TokenVectorStore:
+    """
+    Append-only, memory-mapped store of per-chunk token embeddings (late interaction).
+
+    Layout under `path`:
+      tokens.f16   all token vectors back to back, float16, shape (rows, dim)
+      index.json   {"model": ..., "dim": ..., "rows": ..., "chunks": {chunk_id: [offset, length]}}
+
+    Re-adding a chunk appends new rows and repoints the index; `compact()` drops
+    the orphaned rows. `add()` and `remove()` only update the in-memory index;
+    `flush()` publishes it (once per committed ingestion batch). Readers reload
+    the index when the file changes on disk, so the API picks up a fresh ingestion
+    without a restart.
+
+    The index is the source of truth: rows past `rows` are the tail of a writer
+    that died before flushing. Readers never look at them and the next writer
+    truncates them before appending, so offsets always match the file.
+    """
+
+    DATA_FILE = "tokens.f16"
+    INDEX_FILE = "index.json"
+
+    def __init__(self, path: str, model_name: Optional[str] = None, dim: Optional[int] = None):
+        self.path = Path(path)
+        self.model_name = model_name
+        self.dim = dim
+        self.rows = 0
+        self.chunks: Dict[str, Tuple[int, int]] = {}
+        self._matrix: Optional[np.memmap] = None
+        self._index_mtime: Optional[float] = None
+        self._dirty = False
+        self._writing = False
+        self._lock = threading.Lock()
+        self._load_index()
+
+    @property
+    def _data_path(self) -> Path:
+        return self.path / self.DATA_FILE
+
+    @property
+    def _index_path(self) -> Path:
+        return self.path / self.INDEX_FILE
+
+    def _load_index(self) -> None:
+        if not self._index_path.exists():
+            return
+        index = json.loads(self._index_path.read_text(encoding="utf-8"))
+        if self.model_name and index["model"] != self.model_name:
+            raise ValueError(
+                f"Token store at {self.path} was built with {index['model']}, not {self.model_name}"
+            )
+        self.model_name = index["model"]
+        self.dim = index["dim"]
+        self.rows = index["rows"]
+        self.chunks = {chunk_id: tuple(span) for chunk_id, span in index["chunks"].items()}
+        size = self._data_path.stat().st_size if self._data_path.exists() else 0
+        if size < self.rows * self.dim * 2:
+            raise ValueError(
+                f"Token store at {self.path} is truncated: index lists {self.rows} rows, data file has {size} bytes"
+            )
+        self._index_mtime = self._index_path.stat().st_mtime
+        self._matrix = None
+
+    def _save_index(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        index = {"model": self.model_name, "dim": self.dim, "rows": self.rows, "chunks": self.chunks}
+        tmp_path = self._index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(index), encoding="utf-8")
+        os.replace(tmp_path, self._index_path)
+        self._index_mtime = self._index_path.stat().st_mtime
+        self._matrix = None
+        self._dirty = False
+
+    def flush(self) -> None:
+        """Write the index if add()/remove() changed it."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def _truncate_tail(self) -> None:
+        """Before this writer's first append: drop rows a killed writer appended but never indexed."""
+        expected = self.rows * (self.dim or 0) * 2
+        if self._data_path.exists() and self._data_path.stat().st_size > expected:
+            logger.warning(f"Truncating unindexed rows from {self._data_path} (interrupted ingestion)")
+            with open(self._data_path, "r+b") as f:
+                f.truncate(expected)
+        self._writing = True
+
+    def refresh(self) -> None:
+        # Unflushed changes win; another writer's index is only picked up when clean
+        if self._dirty:
+            return
+        if self._index_path.exists() and self._index_path.stat().st_mtime != self._index_mtime:
+            self._load_index()
+
+    def _get_matrix(self) -> np.memmap:
+        if self._matrix is None:
+            self._matrix = np.memmap(self._data_path, dtype=np.float16, mode="r", shape=(self.rows, self.dim))
+        return self._matrix
+
+    def add(self, chunk_ids: Sequence[str], vectors: Sequence[np.ndarray]) -> None:
+        if not chunk_ids:
+            return
+        # Ingestion adds from its embed stage while its upsert stage flushes
+        with self._lock:
+            self.refresh()
+            if not self._writing:
+                self._truncate_tail()
+            if self.dim is None:
+                self.dim = int(vectors[0].shape[1])
+            self.path.mkdir(parents=True, exist_ok=True)
+
+            with open(self._data_path, "ab") as f:
+                for chunk_id, tokens in zip(chunk_ids, vectors):
+                    tokens = np.ascontiguousarray(tokens, dtype=np.float16)
+                    f.write(tokens.tobytes())
+                    self.chunks[chunk_id] = (self.rows, len(tokens))
+                    self.rows += len(tokens)
+            self._matrix = None
+            self._dirty = True
+
+    def remove(self, chunk_ids: Sequence[str]) -> None:
+        with self._lock:
+            self.refresh()
+            removed = [self.chunks.pop(chunk_id, None) for chunk_id in chunk_ids]
+            if any(span is not None for span in removed):
+                self._dirty = True
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self.chunks
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def gather(self, chunk_ids: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, List[int]]:
+        """
+        Token vectors of the known chunks as one contiguous float32 matrix.
+        Returns (matrix, segment start offsets, positions of the found ids in `chunk_ids`).
+        """
+        self.refresh()
+        found = [i for i, chunk_id in enumerate(chunk_ids) if chunk_id in self.chunks]
+        if not found:
+            return np.empty((0, self.dim or 0), dtype=np.float32), np.empty(0, dtype=np.int64), []
+
+        matrix = self._get_matrix()
+        spans = [self.chunks[chunk_ids[i]] for i in found]
+        lengths = np.fromiter((length for _, length in spans), dtype=np.int64, count=len(spans))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        tokens = np.concatenate([matrix[offset:offset + length] for offset, length in spans]).astype(np.float32)
+        return tokens, starts, found
+
+    def compact(self) -> None:
+        """Rewrite the data file without rows orphaned by re-adds and removals."""
+        if not self.chunks:
+            return
+        matrix = self._get_matrix()
+        tmp_path = self._data_path.with_suffix(".tmp")
+        rows = 0
+        chunks = {}
+        with open(tmp_path, "wb") as f:
+            for chunk_id, (offset, length) in self.chunks.items():
+                f.write(np.ascontiguousarray(matrix[offset:offset + length]).tobytes())
+                chunks[chunk_id] = (rows, length)
+                rows += length
+        self._matrix = None
+        os.replace(tmp_path, self._data_path)
+        logger.info(f"Compacted token store: {self.rows} -> {rows} rows")
+        self.rows, self.chunks = rows, chunks
+        self._save_index()
+
+
+def maxsim_scores(query: np.ndarray, tokens: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    ColBERT MaxSim for many documents at once.
+
+    query: (q, dim) query token vectors; tokens: (rows, dim) document token vectors
+    laid out contiguously, document i starting at starts[i]. Returns one score per
+    document: sum over query tokens of the best matching document token.
+    """
+    if len(starts) == 0:
+        return np.empty(0, dtype=np.float32)
+    similarities = tokens @ query.T                                  # (rows, q)
+    best = np.maximum.reduceat(similarities, starts, axis=0)         # (docs, q)
+    return best.sum(axis=1)
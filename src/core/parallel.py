@@ -0,0 +1,35 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional, TypeVar
+from src.core.settings import settings
+import logging
+import os
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_workers(workers: Optional[int], n_items: int) -> int:
+    """workers=None uses settings.ingest_workers; 0 means one per CPU core."""
+    workers = settings.ingest_workers if workers is None else workers
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, n_items))
+
+
+def process_map(fn: Callable[[T], R], items: Iterable[T], workers: Optional[int] = None) -> List[R]:
+    """
+    Map fn over items in a process pool, returning results in input order
+    (so callers get the same output as a serial loop). Runs in-process when a
+    single worker would be used. fn must be a module-level function and the
+    items and results picklable.
+    """
+    items = list(items)
+    workers = resolve_workers(workers, len(items))
+    if workers == 1:
+        return [fn(item) for item in items]
+
+    logger.info(f"Processing {len(items)} items on {workers} processes")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fn, items))
@@ -23,7 +23,55 @@ class Settings(BaseSettings):
     #reranker works but turned off for now due to performance issues
     reranker_model: str = "jinaai/jina-reranker-v1-turbo-en"
     reranker_top_k: int = 4  
+    reranker_backend: str = "cross-encoder"  # or "late-interaction"
+    late_interaction_model: str = "answerdotai/answerai-colbert-small-v1"
+    token_store_path: str = "./token_store"
+    reranker_fetch_k: int = 20
+    reranker_max_tokens: int = 256
+    reranker_deadline_ms: float = 250.0
+    reranker_cache_size: int = 10000
+    reranker_max_batch: int = 64
+    reranker_gate_enabled: bool = True
+    reranker_gate_min_margin: float = 0.1
+    reranker_gate_max_entropy: float = 0.85
+    reranker_gate_temperature: float = 0.05
     retrieval_top_k: int = 5
+    qdrant_collection: str = "emu_regulations"
+    qdrant_manifest_collection: str = "emu_index_manifest"
+    embedding_profile: str = "e5-large"
+    ingest_batch_size: int = 64
+    embed_max_batch_tokens: int = 8192  # padded tokens per ONNX call (items x longest text)
+    embed_max_batch_size: int = 64
+    ingest_queue_depth: int = 4
+    ingest_upsert_workers: int = 2
+    ingest_checkpoint_dir: str = "./ingest_checkpoints"
+    ingest_cache_dir: str = "./ingest_cache"
+    ingest_workers: int = 0  # parse/chunk processes, 0 = one per core
+    html_archive_dir: str = "./html_archive"
+    pdf_cache_dir: str = "./pdf_page_cache"  # converted markdown per PDF page content hash
+    document_store_dir: str = "./doc_store"  # compact rag_docs/ (python -m src.scrapers.document_store pack)
+    scrape_concurrency: int = 4
+    scrape_min_interval: float = 0.25
+    scraper_html_parser: str = "html.parser"  # or "lxml" (optional dependency)
+    embedding_cache_enabled: bool = True
+    embedding_cache_path: str = "./embedding_cache.sqlite"
+    embedding_cache_max_mb: int = 1024
+    inference_url: Optional[str] = None
+    inference_socket: Optional[str] = None
+    inference_timeout: float = 30.0
+    inference_max_batch: int = 32
+    inference_max_wait_ms: float = 5.0
+    singleflight_enabled: bool = True
+    singleflight_lock_ttl: int = 120
+    singleflight_wait_timeout: float = 30.0
+    alias_cache_ttl: float = 5.0  # seconds the API trusts its last alias lookup
+    warmup_enabled: bool = True
+    warmup_retry_deadline: float = 300.0  # seconds to keep retrying failed steps after boot
+    warmup_retry_base_delay: float = 1.0
+    job_max_attempts: int = 5
+    job_retry_base_delay: float = 2.0
+    job_visibility_timeout: int = 300
+    admin_emails: str = ""  # comma-separated
    
 
     model_config = SettingsConfigDict(
@@ -45,6 +93,10 @@ class Settings(BaseSettings):
                 url = base_url
         return url
 
+    @cached_property
+    def admin_email_set(self) -> frozenset:
+        return frozenset(e.strip().lower() for e in self.admin_emails.split(",") if e.strip())
+
     @cached_property
     def microsoft_redirect_uri(self) -> str:
         return f"{self.api_base_url}/api/v1/auth/microsoft/callback"
@@ -0,0 +1,88 @@
+from concurrent.futures import Executor
+from typing import Any, Callable, List
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into one model call.
+
+    Requests are queued; the worker drains the queue until `max_batch` items are
+    collected or `max_wait_ms` has passed, runs `fn` once on the flattened items
+    in `executor`, and hands each request its slice of the results.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], List[Any]],
+        executor: Executor,
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "batcher",
+    ):
+        self.fn = fn
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, items: List[Any]) -> List[Any]:
+        if not items:
+            return []
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((items, future))
+        return await future
+
+    async def _collect(self) -> list:
+        pending = [await self._queue.get()]
+        size = len(pending[0][0])
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while size < self.max_batch:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                request = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            pending.append(request)
+            size += len(request[0])
+        return pending
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = await self._collect()
+            flat = [item for items, _ in pending for item in items]
+            try:
+                results = await loop.run_in_executor(self.executor, self.fn, flat)
+            except Exception as e:
+                logger.error(f"[{self.name}] batch of {len(flat)} failed: {e}")
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for items, future in pending:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(items)])
+                offset += len(items)
@@ -0,0 +1,146 @@
+"""
+Shared inference server for multi-worker deployments.
+
+Owns a single copy of the dense, sparse and (optionally) reranker ONNX models and
+serves batched requests over localhost HTTP or a Unix socket. API workers talk to
+it through the thin clients in src/clients/inference_client.py when
+INFERENCE_URL or INFERENCE_SOCKET is set.
+
+Usage:
+    python -m src.inference.server --socket /tmp/emu-inference.sock
+    python -m src.inference.server --port 8500
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Literal
+import argparse
+import logging
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+import uvicorn
+
+from src.core.settings import settings
+from src.inference.batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+
+class EmbedRequest(BaseModel):
+    texts: List[str]
+    kind: Literal["query", "document"] = "document"
+
+
+class DenseEmbedResponse(BaseModel):
+    embeddings: List[List[float]]
+
+
+class SparseEmbedResponse(BaseModel):
+    indices: List[List[int]]
+    values: List[List[float]]
+
+
+class RerankRequest(BaseModel):
+    query: str
+    documents: List[str]
+
+
+class RerankResponse(BaseModel):
+    scores: List[float]
+
+
+def _sparse_rows(result) -> list:
+    indices, values = result
+    return list(zip(indices, values))
+
+
+def build_batchers(executor: ThreadPoolExecutor, enable_reranker: bool) -> dict[str, MicroBatcher]:
+    from src.clients.embedding_client import EmbeddingClient
+    from src.clients.sparse_embedding_client import SparseEmbeddingClient
+
+    dense = EmbeddingClient()
+    sparse = SparseEmbeddingClient()
+    options = {"max_batch": settings.inference_max_batch, "max_wait_ms": settings.inference_max_wait_ms}
+
+    batchers = {
+        "dense:document": MicroBatcher(dense.embed_documents, executor, name="dense:document", **options),
+        "dense:query": MicroBatcher(dense.embed_queries, executor, name="dense:query", **options),
+        "sparse:document": MicroBatcher(
+            lambda texts: _sparse_rows(sparse.embed_documents(texts)), executor, name="sparse:document", **options
+        ),
+        "sparse:query": MicroBatcher(
+            lambda texts: _sparse_rows(sparse.embed_queries(texts)), executor, name="sparse:query", **options
+        ),
+    }
+
+    if enable_reranker:
+        from src.clients.reranker_client import RerankerClient
+        reranker = RerankerClient(model_name=settings.reranker_model)
+        batchers["rerank"] = MicroBatcher(reranker.rerank_pairs, executor, name="rerank", **options)
+
+    return batchers
+
+
+def create_app(enable_reranker: bool = settings.reranker_enabled, threads: int = 1) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # One executor thread per model call: ONNX Runtime already parallelises inside a batch.
+        executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="inference")
+        app.state.batchers = build_batchers(executor, enable_reranker)
+        for batcher in app.state.batchers.values():
+            batcher.start()
+        logger.info("Inference server ready")
+        yield
+        for batcher in app.state.batchers.values():
+            await batcher.stop()
+        executor.shutdown(wait=False)
+
+    app = FastAPI(title="EMU RAG inference server", lifespan=lifespan)
+
+    @app.get("/health")
+    async def health():
+        return {"message": "OK", "models": sorted(app.state.batchers)}
+
+    @app.post("/embed/dense", response_model=DenseEmbedResponse)
+    async def embed_dense(request: EmbedRequest):
+        embeddings = await app.state.batchers[f"dense:{request.kind}"].submit(request.texts)
+        return DenseEmbedResponse(embeddings=embeddings)
+
+    @app.post("/embed/sparse", response_model=SparseEmbedResponse)
+    async def embed_sparse(request: EmbedRequest):
+        rows = await app.state.batchers[f"sparse:{request.kind}"].submit(request.texts)
+        return SparseEmbedResponse(
+            indices=[indices for indices, _ in rows],
+            values=[values for _, values in rows],
+        )
+
+    @app.post("/rerank", response_model=RerankResponse)
+    async def rerank(request: RerankRequest):
+        batcher = app.state.batchers.get("rerank")
+        if batcher is None:
+            raise HTTPException(status_code=404, detail="Reranker is not enabled on this inference server")
+        scores = await batcher.submit([(request.query, doc) for doc in request.documents])
+        return RerankResponse(scores=scores)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EMU RAG shared inference server")
+    parser.add_argument("--socket", default=settings.inference_socket, help="Unix socket path")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8500)
+    parser.add_argument("--reranker", action="store_true", default=settings.reranker_enabled)
+    parser.add_argument("--threads", type=int, default=1, help="Concurrent model calls")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    app = create_app(enable_reranker=args.reranker, threads=args.threads)
+    if args.socket:
+        uvicorn.run(app, uds=args.socket)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
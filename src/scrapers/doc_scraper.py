@@ -8,14 +8,17 @@ Includes normalization layer to recover structure from Word-exported HTML.
 
 Output: StructuredDocument with preserved block types.
 """
+import asyncio
+import logging
 import requests
-import time
 import re
 import json
+from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup, Tag, NavigableString
+from bs4 import BeautifulSoup, FeatureNotFound, Tag, NavigableString, PageElement
 
 from src.chunkers.models import (
     StructuredDocument,
@@ -25,6 +28,11 @@ from src.chunkers.models import (
     ListBlock,
     Block,
 )
+from src.scrapers.html_archive import AsyncFetcher, FetchResult, HtmlArchive
+from src.core.parallel import process_map
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
 
 
 BASE_URL = "https://mevzuat.emu.edu.tr/"
@@ -60,6 +68,36 @@ CHAPTER_RE = re.compile(r"^CHAPTER\s+[IVX\d]+", re.IGNORECASE)
 PART_RE = re.compile(r"^PART\s+[IVX\d]+", re.IGNORECASE)
 SECTION_RE = re.compile(r"^SECTION\s+[IVX\d]+", re.IGNORECASE)
 
+# Table row patterns (compiled once, used for every row of every layout table)
+CLAUSE_RE = re.compile(r"^\((\d+|[A-Za-z])\)$")  # (1), (A), (b)
+GRADE_RE = re.compile(r'^[A-FUWSINGa-f][+÷\-]?$|^\d+\.\d{2}$|^(SATISFACTORY|FAIL|PASS|INCOMPLETE|WITHDRAWAL)$', re.IGNORECASE)
+TITLE_REF_RE = re.compile(r'(VYK|SEN|R\.G\.|EK\s+\d|A\.E\.|^\d{2}\.\d{2}\.\d{4})')
+ROW_REF_RE = re.compile(r'^(VYK|SEN|R\.G\.)?\s*\d{2}[\./]\d{2}[\./]\d{2,4}')
+
+
+class RowType(str, Enum):
+    """Kind of a layout-table row, in the precedence _extract_from_table applies."""
+    EMPTY = "empty"
+    GRADE = "grade"
+    ARTICLE = "article"
+    CLAUSE = "clause"
+    TEXT = "text"
+
+
+@dataclass(frozen=True)
+class RowClass:
+    kind: RowType
+    is_article: bool  # article-shaped, whatever the precedence (used by _is_pure_data_table)
+    is_grade: bool
+    marker: Optional[str] = None  # article number or clause marker
+    title: Optional[str] = None
+    body: Optional[str] = None
+
+
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+# Elements whose presence inside a p/div means its text is extracted elsewhere
+BLOCK_TAGS = HEADING_TAGS | {'table', 'ul', 'ol'}
+
 # Disclaimer patterns to skip for title detection
 DISCLAIMER_PATTERNS = [
     r"in the event of.*absence.*mutual agreement",
@@ -172,9 +210,8 @@ class BlockNormalizer:
             # Filter out reference numbers and dates (VYK, SEN, etc.)
             if potential_title and len(potential_title) > 2:
                 # Check if it's mostly a reference (contains VYK, SEN, dates)
-                ref_patterns = r'(VYK|SEN|R\.G\.|EK\s+\d|A\.E\.|^\d{2}\.\d{2}\.\d{4})'
                 # If it's NOT just references, use it as title
-                cleaned_title = re.sub(ref_patterns, '', potential_title).strip()
+                cleaned_title = TITLE_REF_RE.sub('', potential_title).strip()
                 if cleaned_title and len(cleaned_title) > 2:
                     # Remove any leading/trailing punctuation
                     cleaned_title = cleaned_title.strip('.,;: ')
@@ -207,14 +244,12 @@ class BlockNormalizer:
             return False, None, None
         
         # Look for clause markers like (1), (2), (A), (B), (a), (b)
-        clause_re = re.compile(r"^\((\d+|[A-Za-z])\)$")
-        
         clause_marker = None
         clause_idx = None
         
         for i, cell in enumerate(row):
             cell_stripped = cell.strip()
-            if clause_re.match(cell_stripped):
+            if CLAUSE_RE.match(cell_stripped):
                 clause_marker = cell_stripped
                 clause_idx = i
                 break
@@ -243,18 +278,37 @@ class BlockNormalizer:
             return False
         
         # Grade patterns: letter grades, coefficients
-        grade_pattern = re.compile(r'^[A-FUWSINGa-f][+÷\-]?$|^\d+\.\d{2}$|^(SATISFACTORY|FAIL|PASS|INCOMPLETE|WITHDRAWAL)$', re.IGNORECASE)
-        
         grade_cells = 0
         for cell in row:
-            cell_stripped = cell.strip()
-            if grade_pattern.match(cell_stripped):
+            if GRADE_RE.match(cell.strip()):
                 grade_cells += 1
+                # If multiple cells look like grades/coefficients, it's a grade row
+                if grade_cells >= 2:
+                    return True
         
-        # If multiple cells look like grades/coefficients, it's a grade row
-        return grade_cells >= 2
+        return False
+    
+    def classify_row(self, row: List[str]) -> RowClass:
+        """Classify a table row once; both table passes read the result."""
+        is_grade = self._is_grade_row(row)
+        is_article, article_num, article_title, article_body = self._is_article_row(row)
+        
+        if self._is_empty_row(row):
+            return RowClass(RowType.EMPTY, is_article, is_grade)
+        if is_grade:
+            return RowClass(RowType.GRADE, is_article, is_grade)
+        if is_article:
+            return RowClass(RowType.ARTICLE, is_article, is_grade, article_num, article_title, article_body)
+        
+        is_clause, clause_marker, clause_body = self._is_sub_clause_row(row)
+        if is_clause and clause_body:
+            return RowClass(RowType.CLAUSE, is_article, is_grade, clause_marker, body=clause_body)
+        return RowClass(RowType.TEXT, is_article, is_grade)
     
-    def _is_pure_data_table(self, table: TableBlock) -> bool:
+    def classify_table(self, table: TableBlock) -> List[RowClass]:
+        return [self.classify_row(row) for row in table.rows]
+    
+    def _is_pure_data_table(self, table: TableBlock, rows: Optional[List[RowClass]] = None) -> bool:
         """
         Determine if a table is PURELY data (no articles inside).
         
@@ -263,14 +317,14 @@ class BlockNormalizer:
         if not table.rows or len(table.rows) < 2:
             return False
         
+        rows = rows if rows is not None else self.classify_table(table)
+        
         # Check if ANY row contains an article - if so, it's not a pure data table
-        for row in table.rows:
-            is_article, _, _, _ = self._is_article_row(row)
-            if is_article:
-                return False
+        if any(row.is_article for row in rows):
+            return False
         
         # Check if it looks like a grade/coefficient table
-        grade_rows = sum(1 for row in table.rows if self._is_grade_row(row))
+        grade_rows = sum(1 for row in rows if row.is_grade)
         if grade_rows >= 3:
             return True
         
@@ -303,12 +357,13 @@ class BlockNormalizer:
             
             elif isinstance(block, TableBlock):
                 # Process table - always try to extract articles, keep only pure data rows
-                if self._is_pure_data_table(block):
+                rows = self.classify_table(block)
+                if self._is_pure_data_table(block, rows):
                     # Pure data table with no articles - keep intact
                     normalized.append(block)
                 else:
                     # Extract articles and sub-clauses, keeping data rows as separate table
-                    extracted = self._extract_from_table(block)
+                    extracted = self._extract_from_table(block, rows)
                     normalized.extend(extracted)
             
             else:
@@ -317,58 +372,49 @@ class BlockNormalizer:
         
         return normalized
     
-    def _extract_from_table(self, table: TableBlock) -> List[Block]:
+    def _extract_from_table(self, table: TableBlock, rows: Optional[List[RowClass]] = None) -> List[Block]:
         """
         Extract articles and paragraphs from a layout table.
         Also preserves grade data rows as a separate table.
         """
         extracted: List[Block] = []
         data_rows: List[List[str]] = []  # Collect grade/data rows
-        current_article_num = None
+        rows = rows if rows is not None else self.classify_table(table)
         
-        for row in table.rows:
+        for row, info in zip(table.rows, rows):
             # Skip empty rows
-            if self._is_empty_row(row):
+            if info.kind is RowType.EMPTY:
                 continue
             
-            # Check if it's a grade/data row - collect separately
-            if self._is_grade_row(row):
+            # Grade/data rows are collected separately
+            if info.kind is RowType.GRADE:
                 data_rows.append(row)
                 continue
             
-            # Check if it's an article row
-            is_article, article_num, article_title, article_body = self._is_article_row(row)
-            
-            if is_article:
-                current_article_num = article_num
-                
+            if info.kind is RowType.ARTICLE:
                 # Create article heading
-                if article_title:
-                    heading_text = f"Article {article_num} – {article_title}"
+                if info.title:
+                    heading_text = f"Article {info.marker} – {info.title}"
                 else:
-                    heading_text = f"Article {article_num}"
+                    heading_text = f"Article {info.marker}"
                 
                 extracted.append(HeadingBlock(level=3, text=heading_text))
                 
                 # Add article body if present
-                if article_body:
-                    extracted.append(ParagraphBlock(text=article_body))
+                if info.body:
+                    extracted.append(ParagraphBlock(text=info.body))
                 continue
             
-            # Check if it's a sub-clause row
-            is_clause, clause_marker, clause_body = self._is_sub_clause_row(row)
-            
-            if is_clause and clause_body:
+            if info.kind is RowType.CLAUSE:
                 # Format as paragraph with clause marker
-                extracted.append(ParagraphBlock(text=f"{clause_marker} {clause_body}"))
+                extracted.append(ParagraphBlock(text=f"{info.marker} {info.body}"))
                 continue
             
             # Otherwise, join non-empty cells as a paragraph (or heading if it looks like one)
             non_empty = [c.strip() for c in row if c.strip() and len(c.strip()) > 2]
             if non_empty:
                 # Filter out pure reference cells (VYK, SEN dates only)
-                ref_pattern = r'^(VYK|SEN|R\.G\.)?\s*\d{2}[\./]\d{2}[\./]\d{2,4}'
-                meaningful = [c for c in non_empty if not re.match(ref_pattern, c)]
+                meaningful = [c for c in non_empty if not ROW_REF_RE.match(c)]
                 
                 if meaningful:
                     text = " ".join(meaningful)
@@ -388,6 +434,19 @@ class BlockNormalizer:
         return extracted
 
 
+def make_soup(html: str, parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse HTML with the configured backend. "lxml" is faster on large Word
+    exports but optional; without it, html.parser is used.
+    """
+    parser = parser or settings.scraper_html_parser
+    try:
+        return BeautifulSoup(html, parser)
+    except FeatureNotFound:
+        logger.warning(f"HTML parser '{parser}' is not installed, falling back to html.parser")
+        return BeautifulSoup(html, 'html.parser')
+
+
 class StructuredScraper:
     """
     Scrapes HTML and extracts structured blocks.
@@ -397,6 +456,7 @@ class StructuredScraper:
     def __init__(self, base_url: str = BASE_URL):
         self.base_url = base_url
         self.normalizer = BlockNormalizer()
+        self.fetch_results: List[FetchResult] = []
     
     def fetch_html(self, link: str) -> Optional[str]:
         """Fetch HTML content with Turkish encoding fix."""
@@ -467,8 +527,14 @@ class StructuredScraper:
         """
         Extract structural blocks from parsed HTML.
         Preserves block type information.
+        
+        Single depth-first pass over the tree:
+        - table/ul/ol subtrees are extracted and skipped in one step
+        - p/div reserve their output slot when entered and are resolved when
+          left, once it is known whether a heading/table/list was nested in
+          them; their text is joined from the strings collected meanwhile
         """
-        blocks: List[Block] = []
+        slots: List[Optional[Block]] = []
         
         # Remove garbage elements
         for element in soup(["script", "style", "meta", "link", "o:p", "head"]):
@@ -477,49 +543,70 @@ class StructuredScraper:
         # Find the body or main content
         body = soup.find('body') or soup
         
-        # Process all direct children and nested elements
-        for element in body.descendants:
+        strings: List[NavigableString] = []
+        # Open p/div elements: [element, slot, first string index, has block children]
+        open_blocks: List[list] = []
+        stack: List[Tuple[PageElement, bool]] = [(child, False) for child in reversed(body.contents)]
+        
+        while stack:
+            element, leaving = stack.pop()
+            
+            if leaving:
+                tag, slot, first, has_block_children = open_blocks.pop()
+                if has_block_children:
+                    # Nested block content is extracted on its own; propagate upwards
+                    if open_blocks:
+                        open_blocks[-1][3] = True
+                    continue
+                types = tag.interesting_string_types or Tag.MAIN_CONTENT_STRING_TYPES
+                text = self._clean_text("".join(
+                    string for string in strings[first:] if type(string) in types
+                ))
+                if text and len(text) > 2:  # Skip very short/empty
+                    slots[slot] = ParagraphBlock(text=text)
+                continue
+            
             if isinstance(element, NavigableString):
+                strings.append(element)
                 continue
             if not isinstance(element, Tag):
                 continue
             
-            # Skip if this element is inside another block-level element we'll process
-            if element.find_parent(['table', 'ul', 'ol']):
-                continue
-            
             tag_name = element.name.lower() if element.name else ""
             
-            # Headings (h1-h6)
-            if tag_name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                text = self._clean_text(element.get_text())
-                if text:
-                    level = self._get_heading_level(element)
-                    blocks.append(HeadingBlock(level=level, text=text))
+            if tag_name in BLOCK_TAGS and open_blocks:
+                open_blocks[-1][3] = True
             
             # Tables
-            elif tag_name == 'table':
+            if tag_name == 'table':
                 table_block = self._extract_table(element)
                 if table_block.rows:  # Only add non-empty tables
-                    blocks.append(table_block)
+                    slots.append(table_block)
+                continue
             
             # Lists
-            elif tag_name in ['ul', 'ol']:
+            if tag_name in ('ul', 'ol'):
                 list_block = self._extract_list(element)
                 if list_block.items:  # Only add non-empty lists
-                    blocks.append(list_block)
+                    slots.append(list_block)
+                continue
             
-            # Paragraphs and divs with direct text content
-            elif tag_name in ['p', 'div']:
-                # Only process if it has direct text (not just nested elements)
+            # Headings (h1-h6)
+            if tag_name in HEADING_TAGS:
                 text = self._clean_text(element.get_text())
-                if text and len(text) > 2:  # Skip very short/empty
-                    # Avoid duplicating content from child blocks
-                    has_block_children = element.find(['table', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                    if not has_block_children:
-                        blocks.append(ParagraphBlock(text=text))
+                if text:
+                    level = self._get_heading_level(element)
+                    slots.append(HeadingBlock(level=level, text=text))
+            
+            # Paragraphs and divs: decided when leaving (see docstring)
+            elif tag_name in ('p', 'div'):
+                open_blocks.append([element, len(slots), len(strings), False])
+                slots.append(None)
+                stack.append((element, True))
+            
+            stack.extend((child, False) for child in reversed(element.contents))
         
-        return blocks
+        return [block for block in slots if block is not None]
     
     def _is_disclaimer(self, text: str) -> bool:
         """Check if text is a disclaimer, not a title."""
@@ -602,7 +689,11 @@ class StructuredScraper:
         if not html:
             return None
         
-        soup = BeautifulSoup(html, 'html.parser')
+        return self.parse_document(link, html)
+    
+    def parse_document(self, link: str, html: str) -> Optional[StructuredDocument]:
+        """Steps 1a-1b on already fetched HTML (no network access)."""
+        soup = make_soup(html)
         
         # Step 1a: Extract raw blocks
         raw_blocks = self._extract_blocks(soup)
@@ -633,21 +724,46 @@ class StructuredScraper:
         
         return doc
     
-    def scrape_all(self, delay: float = 1.0) -> List[StructuredDocument]:
+    def fetch_all(self, links: List[str] = HTM_LINKS, replay: bool = False) -> Dict[str, str]:
+        """
+        Fetch pages concurrently through the HTML archive (conditional GET).
+        Unchanged pages answer 304 and are read back from the archive; with
+        replay=True nothing is fetched at all. Returns {link: html}.
+        """
+        archive = HtmlArchive()
+        if not replay:
+            fetcher = AsyncFetcher(archive, self.base_url)
+            self.fetch_results = asyncio.run(fetcher.fetch_all(links))
+        
+        pages = {}
+        for link in links:
+            html = archive.read(link)
+            if html is None:
+                print(f"[WARN] {link} is not in the archive")
+                continue
+            pages[link] = html
+        return pages
+    
+    def scrape_all(self, replay: bool = False) -> List[StructuredDocument]:
         """
         Scrape all regulation documents.
         Returns list of StructuredDocument objects.
         """
-        documents = []
-        
-        for link in HTM_LINKS:
-            doc = self.scrape_document(link)
-            if doc:
-                documents.append(doc)
-            time.sleep(delay)  # Respectful delay
-        
+        documents = self.parse_documents(self.fetch_all(HTM_LINKS, replay=replay))
         print(f"\n[OK] Scraped {len(documents)} documents")
         return documents
+    
+    def parse_documents(self, pages: Dict[str, str], workers: Optional[int] = None) -> List[StructuredDocument]:
+        """Parse {link: html} in a process pool; documents keep the order of `pages`."""
+        results = process_map(_parse_page, [(self.base_url, link, html) for link, html in pages.items()], workers)
+        return [doc for doc in results if doc]
+
+
+def _parse_page(job: Tuple[str, str, str]) -> Optional[StructuredDocument]:
+    """Process pool entry point: (base_url, link, html) -> document."""
+    base_url, link, html = job
+    print(f"Parsing: {link}...")
+    return StructuredScraper(base_url).parse_document(link, html)
 
 
 def detect_article_boundary(block: Block) -> Optional[str]:
@@ -668,57 +784,95 @@ def detect_article_boundary(block: Block) -> Optional[str]:
     return None
 
 
-def save_structured_documents(documents: List[StructuredDocument], output_dir: str = "rag_docs/"):
-    """Save structured documents to JSON files for inspection/debugging."""
+def document_filename(source: str) -> str:
+    """rag_docs/ file name of a scraped source."""
+    return re.sub(r'\.(htm|pdf)$', '.json', source).replace('%20', '_')
+
+
+def document_to_dict(doc: StructuredDocument) -> dict:
+    """Serializable form of a StructuredDocument, as written to rag_docs/."""
+    doc_dict = {
+        "source": doc.source,
+        "document_title": doc.document_title,
+        "blocks": []
+    }
+    
+    for block in doc.blocks:
+        if isinstance(block, HeadingBlock):
+            doc_dict["blocks"].append({
+                "type": "heading",
+                "level": block.level,
+                "text": block.text
+            })
+        elif isinstance(block, ParagraphBlock):
+            doc_dict["blocks"].append({
+                "type": "paragraph",
+                "text": block.text
+            })
+        elif isinstance(block, TableBlock):
+            doc_dict["blocks"].append({
+                "type": "table",
+                "rows": block.rows,
+                "has_header": block.has_header
+            })
+        elif isinstance(block, ListBlock):
+            doc_dict["blocks"].append({
+                "type": "list",
+                "items": block.items,
+                "ordered": block.ordered
+            })
+    
+    return doc_dict
+
+
+def save_structured_document(doc: StructuredDocument, output_dir: str = "rag_docs/") -> Path:
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
+    filepath = output_path / document_filename(doc.source)
+    
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(document_to_dict(doc), f, ensure_ascii=False, indent=2)
     
+    print(f"Saved: {filepath}")
+    return filepath
+
+
+def save_structured_documents(documents: List[StructuredDocument], output_dir: str = "rag_docs/"):
+    """Save structured documents to JSON files for inspection/debugging."""
     for doc in documents:
-        # Convert to serializable dict
-        doc_dict = {
-            "source": doc.source,
-            "document_title": doc.document_title,
-            "blocks": []
-        }
-        
-        for block in doc.blocks:
-            if isinstance(block, HeadingBlock):
-                doc_dict["blocks"].append({
-                    "type": "heading",
-                    "level": block.level,
-                    "text": block.text
-                })
-            elif isinstance(block, ParagraphBlock):
-                doc_dict["blocks"].append({
-                    "type": "paragraph",
-                    "text": block.text
-                })
-            elif isinstance(block, TableBlock):
-                doc_dict["blocks"].append({
-                    "type": "table",
-                    "rows": block.rows,
-                    "has_header": block.has_header
-                })
-            elif isinstance(block, ListBlock):
-                doc_dict["blocks"].append({
-                    "type": "list",
-                    "items": block.items,
-                    "ordered": block.ordered
-                })
-        
-        # Save to JSON
-        filename = doc.source.replace('.htm', '.json').replace('%20', '_')
-        filepath = output_path / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(doc_dict, f, ensure_ascii=False, indent=2)
-        
-        print(f"Saved: {filepath}")
+        save_structured_document(doc, output_dir)
+
+
+def document_from_dict(doc_dict: dict) -> StructuredDocument:
+    block_types = {
+        "heading": HeadingBlock,
+        "paragraph": ParagraphBlock,
+        "table": TableBlock,
+        "list": ListBlock,
+    }
+    return StructuredDocument(
+        source=doc_dict["source"],
+        document_title=doc_dict.get("document_title"),
+        blocks=[block_types[block["type"]](**block) for block in doc_dict["blocks"]],
+    )
 
 
+def iter_structured_documents(input_dir: str = "rag_docs/") -> Iterator[StructuredDocument]:
+    """Yield the documents written by save_structured_documents one at a time."""
+    for filepath in sorted(Path(input_dir).glob("*.json")):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            yield document_from_dict(json.load(f))
+
+
+def load_structured_documents(input_dir: str = "rag_docs/") -> List[StructuredDocument]:
+    """Load documents written by save_structured_documents (inverse operation)."""
+    return list(iter_structured_documents(input_dir))
+
 if __name__ == "__main__":
+    import sys
+    
     scraper = StructuredScraper()
-    documents = scraper.scrape_all()
+    documents = scraper.scrape_all(replay="--replay" in sys.argv)
     
     # Save to JSON for inspection
     save_structured_documents(documents)
@@ -0,0 +1,247 @@
+"""
+Compact on-disk store for StructuredDocuments, read lazily block by block.
+
+Layout of a store directory:
+
+    documents-<hash>.jsonl  first line is the format header, then per document
+                            one header line followed by one line per block
+    index.json              format header, the name of its data file and, per
+                            document, its byte offset, block count and content hash
+
+The data file is named after its content and only the index says which one is
+live, so replacing index.json is the single commit point of a write: a crash
+before it leaves the old index pointing at the old, untouched data file.
+
+Blocks are encoded as short JSON arrays instead of the pretty dicts in rag_docs/:
+
+    ["h", level, text]   ["p", text]   ["t", rows, has_header]   ["l", items, ordered]
+
+Opening a store only reads the index. `StoredDocument.blocks` seeks to the
+document and decodes one line at a time, so grouping a document never holds
+more than its current article, and a StoredDocument pickles as a few fields
+(process pool workers read their own blocks).
+
+Usage:
+    python -m src.scrapers.document_store pack rag_docs/ doc_store/
+    python -m src.scrapers.document_store unpack doc_store/ rag_docs/
+    python -m src.scrapers.document_store info doc_store/
+"""
+import argparse
+import hashlib
+import json
+import logging
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from src.chunkers.models import Block, HeadingBlock, ListBlock, ParagraphBlock, StructuredDocument, TableBlock
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+STORE_FORMAT = "emu-docstore"
+STORE_VERSION = 1
+DATA_FILE = "documents.jsonl"  # stores written before data files were content-named
+INDEX_FILE = "index.json"
+
+
+def encode_block(block: Block) -> list:
+    if isinstance(block, HeadingBlock):
+        return ["h", block.level, block.text]
+    if isinstance(block, ParagraphBlock):
+        return ["p", block.text]
+    if isinstance(block, TableBlock):
+        return ["t", block.rows, block.has_header]
+    if isinstance(block, ListBlock):
+        return ["l", block.items, block.ordered]
+    raise TypeError(f"Unknown block type: {type(block).__name__}")
+
+
+def decode_block(row: list) -> Block:
+    tag = row[0]
+    if tag == "h":
+        return HeadingBlock(level=row[1], text=row[2])
+    if tag == "p":
+        return ParagraphBlock(text=row[1])
+    if tag == "t":
+        return TableBlock(rows=row[1], has_header=row[2])
+    if tag == "l":
+        return ListBlock(items=row[1], ordered=row[2])
+    raise ValueError(f"Unknown block tag: {tag!r}")
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _check_header(header: dict, path: Path) -> None:
+    if header.get("format") != STORE_FORMAT:
+        raise ValueError(f"{path} is not a document store")
+    if header.get("version") != STORE_VERSION:
+        raise ValueError(
+            f"{path} has store version {header.get('version')}, expected {STORE_VERSION}; re-pack it from rag_docs/"
+        )
+
+
+@dataclass(slots=True)
+class StoredDocument:
+    """
+    Index entry of a stored document. Exposes the StructuredDocument fields,
+    with `blocks` decoded lazily from disk on each iteration.
+    """
+    path: str
+    offset: int
+    source: str
+    document_title: Optional[str]
+    block_count: int
+    content_hash: str
+
+    @property
+    def blocks(self) -> Iterator[Block]:
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            head = json.loads(f.readline())
+            if head.get("source") != self.source or head.get("blocks") != self.block_count:
+                raise ValueError(f"{self.path} does not hold {self.source} at offset {self.offset}")
+            for _ in range(self.block_count):
+                yield decode_block(json.loads(f.readline()))
+
+    def load(self) -> StructuredDocument:
+        return StructuredDocument(source=self.source, document_title=self.document_title, blocks=list(self.blocks))
+
+
+class DocumentStore:
+    """A store directory; see the module docstring for the format."""
+
+    def __init__(self, root: str = settings.document_store_dir):
+        self.root = Path(root)
+        self.index_path = self.root / INDEX_FILE
+
+    def _read_index(self) -> dict:
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        _check_header(index, self.index_path)
+        return index
+
+    @property
+    def data_path(self) -> Path:
+        """The data file the current index refers to."""
+        return self.root / self._read_index().get("data", DATA_FILE)
+
+    def exists(self) -> bool:
+        return self.index_path.exists() and self.data_path.exists()
+
+    def documents(self) -> List[StoredDocument]:
+        """Index entries in store order; reads index.json only."""
+        index = self._read_index()
+        data_path = self.root / index.get("data", DATA_FILE)
+        return [
+            StoredDocument(
+                path=str(data_path),
+                offset=entry["offset"],
+                source=entry["source"],
+                document_title=entry["document_title"],
+                block_count=entry["blocks"],
+                content_hash=entry["sha256"],
+            )
+            for entry in index["documents"]
+        ]
+
+    def get(self, source: str) -> Optional[StoredDocument]:
+        return next((doc for doc in self.documents() if doc.source == source), None)
+
+    def iter_documents(self) -> Iterator[StructuredDocument]:
+        """Materialize one document at a time."""
+        for doc in self.documents():
+            yield doc.load()
+
+    def write(self, documents: Iterable[StructuredDocument]) -> int:
+        """
+        Replace the store with `documents`, consumed one at a time. The data is
+        written to a new content-named file, then the index is swapped in to point
+        at it, and older data files are removed.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        header = {"format": STORE_FORMAT, "version": STORE_VERSION}
+        entries = []
+        file_digest = hashlib.sha256()
+        tmp_data = self.root / f"{DATA_FILE}.tmp"
+        with open(tmp_data, "wb") as f:
+            f.write(_dumps(header))
+            for doc in documents:
+                offset = f.tell()
+                block_lines = [_dumps(encode_block(block)) for block in doc.blocks]
+                head = _dumps({"source": doc.source, "document_title": doc.document_title, "blocks": len(block_lines)})
+                digest = hashlib.sha256(head)
+                f.write(head)
+                for line in block_lines:
+                    digest.update(line)
+                    f.write(line)
+                file_digest.update(digest.digest())
+                entries.append({
+                    "source": doc.source,
+                    "document_title": doc.document_title,
+                    "offset": offset,
+                    "blocks": len(block_lines),
+                    "sha256": digest.hexdigest(),
+                })
+
+        data_path = self.root / f"documents-{file_digest.hexdigest()[:16]}.jsonl"
+        tmp_data.replace(data_path)
+        tmp_index = self.index_path.with_suffix(".tmp")
+        with open(tmp_index, "w", encoding="utf-8") as f:
+            json.dump({**header, "data": data_path.name, "documents": entries}, f, ensure_ascii=False, indent=2)
+        tmp_index.replace(self.index_path)
+        for old in self.root.glob("documents*.jsonl"):
+            if old != data_path:
+                old.unlink()
+        logger.info(f"[OK] Wrote {len(entries)} documents to {self.root}")
+        return len(entries)
+
+    def verify(self) -> None:
+        """Check the data file header and every document offset against the index."""
+        data_path = self.data_path
+        with open(data_path, "rb") as f:
+            _check_header(json.loads(f.readline()), data_path)
+        for doc in self.documents():
+            with open(doc.path, "rb") as f:
+                f.seek(doc.offset)
+                head = json.loads(f.readline())
+            if head.get("source") != doc.source or head.get("blocks") != doc.block_count:
+                raise ValueError(f"{self.index_path} is out of sync with {data_path} at {doc.source}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.scrapers.doc_scraper import iter_structured_documents, save_structured_document
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    pack = sub.add_parser("pack", help="rag_docs/*.json -> store")
+    pack.add_argument("input_dir", nargs="?", default="rag_docs/")
+    pack.add_argument("store_dir", nargs="?", default=settings.document_store_dir)
+    unpack = sub.add_parser("unpack", help="store -> rag_docs/*.json")
+    unpack.add_argument("store_dir", nargs="?", default=settings.document_store_dir)
+    unpack.add_argument("output_dir", nargs="?", default="rag_docs/")
+    info = sub.add_parser("info", help="List the stored documents")
+    info.add_argument("store_dir", nargs="?", default=settings.document_store_dir)
+    args = parser.parse_args(argv)
+
+    store = DocumentStore(args.store_dir)
+    if args.command == "pack":
+        store.write(iter_structured_documents(args.input_dir))
+    elif args.command == "unpack":
+        for doc in store.iter_documents():
+            save_structured_document(doc, args.output_dir)
+    else:
+        store.verify()
+        docs = store.documents()
+        for doc in docs:
+            print(f"{doc.block_count:6d} blocks  {doc.source}")
+        print(f"{len(docs)} documents, {store.data_path.stat().st_size / 1024:.0f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Async page fetcher with conditional GET and a content-addressed raw HTML archive.
+
+Raw responses are stored once per content hash under `blobs/`. `index.json` maps
+each link to its current blob and the validators the server sent (ETag,
+Last-Modified). A later fetch sends If-None-Match / If-Modified-Since, so an
+unchanged page costs one 304 and no download. Because every parse input is in
+the archive, any scrape can be replayed offline.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin
+
+import httpx
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# The regulation pages are Word exports in Turkish code page
+HTML_ENCODING = "windows-1254"
+
+
+@dataclass
+class FetchResult:
+    link: str
+    status: str  # "new", "changed", "unchanged" (200, same bytes), "not-modified" (304) or "error"
+    sha256: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def downloaded(self) -> bool:
+        return self.status in ("new", "changed", "unchanged")
+
+
+class HtmlArchive:
+    """Content-addressed store of raw pages plus per-link validators."""
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, root: str = settings.html_archive_dir):
+        self.root = Path(root)
+        self.index_path = self.root / self.INDEX_FILE
+        self.index: Dict[str, dict] = {}
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / f"{sha256}.html"
+
+    def get_meta(self, link: str) -> Optional[dict]:
+        meta = self.index.get(link)
+        # An index entry without its blob cannot be replayed; treat as unknown
+        if meta and self._blob_path(meta["sha256"]).exists():
+            return meta
+        return None
+
+    def read(self, link: str) -> Optional[str]:
+        meta = self.get_meta(link)
+        if meta is None:
+            return None
+        return self._blob_path(meta["sha256"]).read_bytes().decode(HTML_ENCODING, errors="replace")
+
+    def store(self, link: str, content: bytes, etag: Optional[str], last_modified: Optional[str]) -> FetchResult:
+        sha256 = hashlib.sha256(content).hexdigest()
+        previous = self.index.get(link)
+        path = self._blob_path(sha256)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(content)
+            tmp.replace(path)
+        self.index[link] = {
+            "sha256": sha256,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if previous is None:
+            status = "new"
+        elif previous["sha256"] != sha256:
+            status = "changed"
+        else:
+            status = "unchanged"
+        return FetchResult(link, status, sha256)
+
+    def touch(self, link: str) -> FetchResult:
+        meta = self.index[link]
+        meta["checked_at"] = datetime.now(timezone.utc).isoformat()
+        return FetchResult(link, "not-modified", meta["sha256"])
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        tmp.replace(self.index_path)
+
+
+class AsyncFetcher:
+    """
+    Fetches pages concurrently with at most `concurrency` requests in flight
+    and at least `min_interval` seconds between request starts (politeness).
+    """
+
+    def __init__(
+        self,
+        archive: HtmlArchive,
+        base_url: str,
+        concurrency: int = settings.scrape_concurrency,
+        min_interval: float = settings.scrape_min_interval,
+        timeout: float = 30.0,
+    ):
+        self.archive = archive
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self._next_start = 0.0
+
+    async def _pace(self, lock: asyncio.Lock) -> None:
+        async with lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.min_interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _fetch_one(self, client: httpx.AsyncClient, link: str, semaphore: asyncio.Semaphore, lock: asyncio.Lock) -> FetchResult:
+        headers = {}
+        meta = self.archive.get_meta(link)
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        async with semaphore:
+            await self._pace(lock)
+            try:
+                response = await client.get(urljoin(self.base_url, link), headers=headers)
+                if response.status_code == 304 and meta:
+                    return self.archive.touch(link)
+                response.raise_for_status()
+            except Exception as e:
+                logger.error(f"[ERROR] Failed to fetch {link}: {e}")
+                return FetchResult(link, "error", error=str(e))
+
+        return self.archive.store(
+            link,
+            response.content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    async def fetch_all(self, links: Iterable[str]) -> List[FetchResult]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        lock = asyncio.Lock()
+        limits = httpx.Limits(max_connections=self.concurrency)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits, follow_redirects=True) as client:
+            results = await asyncio.gather(*(self._fetch_one(client, link, semaphore, lock) for link in links))
+        self.archive.save()
+
+        counts: Dict[str, int] = {}
+        for result in results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        logger.info(f"Fetched {len(results)} pages: {counts}")
+        return list(results)
@@ -0,0 +1,312 @@
+"""
+PDF to Markdown converter using pymupdf4llm.
+This library is specifically designed for LLM/RAG use cases.
+
+Conversion is page-parallel and incremental:
+- pymupdf4llm derives heading levels from the font sizes of the whole
+  document; that header map is computed once and shared by every page range,
+  so a page converts the same whether it is converted alone or in a full run
+- every page is hashed from its content streams, the resources they draw
+  (fonts with their ToUnicode maps, Form XObjects) and the header map; the
+  page's markdown is cached on disk under that hash. Image data is not
+  hashed, since it does not reach the markdown
+- only pages missing from the cache are converted, split into contiguous
+  page ranges across a process pool (one document open per range)
+- the document is reassembled from the cache in page order, and the output
+  file is only rewritten when it changed
+
+The result is also emitted as a StructuredDocument (rag_docs/ JSON), so the
+structured ingestion pipeline can index the statute like the HTML regulations.
+
+Usage:
+    python -m src.scrapers.pdf_converter
+    python -m src.scrapers.pdf_converter emu_rag_data/1-Statute-EmuStatute.pdf emu_rag_data/EMU_Statute.md --workers 4
+"""
+
+import argparse
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.chunkers.models import Block, HeadingBlock, ListBlock, ParagraphBlock, StructuredDocument, TableBlock
+from src.core.parallel import process_map, resolve_workers
+from src.core.settings import settings
+
+# Bump when the conversion options below change, so cached pages are redone
+PAGE_CACHE_VERSION = "2"
+
+HEADING_MD_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+LIST_ITEM_MD_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*)$")
+TABLE_SEPARATOR_RE = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$")
+PLACEHOLDER_HEADER_RE = re.compile(r"^Col\d+$")
+EMPHASIS_RE = re.compile(r"\*+|(?<!\w)_+|_+(?!\w)")
+
+
+def clean_markdown(md_text: str) -> str:
+    """Clean up the extracted markdown for better RAG usage."""
+
+    # Add a proper header
+    header = """# EMU STATUTE
+## Statute Establishing the North Cyprus Education Foundation and Eastern Mediterranean University
+
+*Combining statutes: 18/1986, 39/1992, 58/1992, 37/1997, 37/2011*
+
+---
+
+"""
+
+    # Clean up excessive whitespace
+    md_text = re.sub(r'\n{3,}', '\n\n', md_text)
+
+    # Remove page markers if any
+    md_text = re.sub(r'---\s*Page \d+\s*---', '', md_text)
+
+    return header + md_text
+
+
+def header_map(pdf_path: str):
+    """
+    pymupdf4llm.IdentifyHeaders over the whole document (font size -> heading
+    level). It only holds plain attributes, so it is passed to the workers as is.
+    """
+    import pymupdf4llm
+
+    return pymupdf4llm.IdentifyHeaders(pdf_path)
+
+
+def _page_resources(doc, page) -> List[int]:
+    """Xrefs of the fonts (and their ToUnicode maps) and Form XObjects the page draws, nested ones included."""
+    xrefs = []
+    for font in page.get_fonts(full=True):
+        xrefs.append(font[0])
+        kind, value = doc.xref_get_key(font[0], "ToUnicode")
+        if kind == "xref":
+            xrefs.append(int(value.split()[0]))
+    xrefs.extend(xobject[0] for xobject in page.get_xobjects())
+    return [xref for xref in xrefs if xref > 0]
+
+
+def page_hashes(pdf_path: str, headers) -> List[str]:
+    """
+    Content hash per page (content streams, referenced resources, page box and
+    the document header map), cheap compared to conversion.
+    """
+    import pymupdf
+    import pymupdf4llm
+
+    settings_key = (
+        f"{PAGE_CACHE_VERSION}|{pymupdf4llm.__version__}|{sorted(headers.header_id.items())}|{headers.body_limit}"
+    )
+    hashes = []
+    with pymupdf.open(pdf_path) as doc:
+        for page in doc:
+            digest = hashlib.sha256(f"{settings_key}|{tuple(page.rect)}".encode())
+            for xref in page.get_contents():
+                digest.update(doc.xref_stream(xref) or b"")
+            for xref in _page_resources(doc, page):
+                # Object dictionary (encoding, widths, ...) and, for streams, the data itself
+                digest.update(doc.xref_object(xref, compressed=True).encode())
+                if doc.xref_is_stream(xref):
+                    digest.update(doc.xref_stream_raw(xref) or b"")
+            hashes.append(digest.hexdigest())
+    return hashes
+
+
+def _convert_pages(job: Tuple[str, List[int], object]) -> List[str]:
+    """Process pool entry point: markdown of the given (0-based) pages, in order."""
+    import pymupdf4llm
+
+    pdf_path, pages, headers = job
+    chunks = pymupdf4llm.to_markdown(
+        pdf_path, pages=pages, hdr_info=headers, page_chunks=True, show_progress=False,
+    )
+    return [chunk["text"] for chunk in chunks]
+
+
+def _page_ranges(pages: List[int], parts: int) -> List[List[int]]:
+    """Split sorted page numbers into at most `parts` contiguous, similarly sized groups."""
+    size = -(-len(pages) // parts)
+    return [pages[i:i + size] for i in range(0, len(pages), size)]
+
+
+class PageCache:
+    """Markdown per page content hash, one file each."""
+
+    def __init__(self, root: str = settings.pdf_cache_dir):
+        self.root = Path(root)
+
+    def _path(self, page_hash: str) -> Path:
+        return self.root / f"{page_hash}.md"
+
+    def get(self, page_hash: str) -> Optional[str]:
+        path = self._path(page_hash)
+        return path.read_text(encoding="utf-8") if path.exists() else None
+
+    def put(self, page_hash: str, markdown: str) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._path(page_hash).with_suffix(".tmp")
+        tmp.write_text(markdown, encoding="utf-8")
+        tmp.replace(self._path(page_hash))
+
+
+def convert_pages(pdf_path: str, cache: Optional[PageCache] = None, workers: Optional[int] = None) -> Tuple[List[str], int]:
+    """Markdown of every page, converting only uncached pages. Returns (pages, converted count)."""
+    cache = cache or PageCache()
+    headers = header_map(pdf_path)
+    hashes = page_hashes(pdf_path, headers)
+    pages: Dict[int, str] = {}
+    missing = []
+    for number, page_hash in enumerate(hashes):
+        markdown = cache.get(page_hash)
+        if markdown is None:
+            missing.append(number)
+        else:
+            pages[number] = markdown
+
+    if missing:
+        ranges = _page_ranges(missing, resolve_workers(workers, len(missing)))
+        converted = process_map(_convert_pages, [(pdf_path, group, headers) for group in ranges], workers)
+        for group, markdowns in zip(ranges, converted):
+            for number, markdown in zip(group, markdowns):
+                cache.put(hashes[number], markdown)
+                pages[number] = markdown
+
+    return [pages[number] for number in range(len(hashes))], len(missing)
+
+
+def _clean_cell(cell: str) -> str:
+    cell = EMPHASIS_RE.sub("", cell.replace("<br>", " ")).strip()
+    if PLACEHOLDER_HEADER_RE.match(cell):
+        return ""
+    return re.sub(r"\s+", " ", cell)
+
+
+def _clean_inline(text: str) -> str:
+    return re.sub(r"\s+", " ", EMPHASIS_RE.sub("", text)).strip()
+
+
+def markdown_to_blocks(md_text: str) -> List[Block]:
+    """Headings, tables, lists and paragraphs from pymupdf4llm markdown."""
+    blocks: List[Block] = []
+    paragraph: List[str] = []
+    table_rows: List[List[str]] = []
+    list_items: List[str] = []
+
+    def flush():
+        if paragraph:
+            text = _clean_inline(" ".join(paragraph))
+            if text:
+                blocks.append(ParagraphBlock(text=text))
+            paragraph.clear()
+        if table_rows:
+            blocks.append(TableBlock(rows=[row[:] for row in table_rows]))
+            table_rows.clear()
+        if list_items:
+            blocks.append(ListBlock(items=list_items[:]))
+            list_items.clear()
+
+    for line in md_text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped == "---":
+            flush()
+            continue
+
+        if stripped.startswith("|"):
+            if paragraph or list_items:
+                flush()
+            if not TABLE_SEPARATOR_RE.match(stripped):
+                table_rows.append([_clean_cell(cell) for cell in stripped.strip("|").split("|")])
+            continue
+        if table_rows:
+            flush()
+
+        heading = HEADING_MD_RE.match(stripped)
+        if heading:
+            flush()
+            text = _clean_inline(heading.group(2))
+            if text:
+                blocks.append(HeadingBlock(level=len(heading.group(1)), text=text))
+            continue
+
+        item = LIST_ITEM_MD_RE.match(line)
+        if item:
+            if paragraph:
+                flush()
+            list_items.append(_clean_inline(item.group(1)))
+            continue
+        if list_items:
+            flush()
+
+        # Bold-only lines are standalone titles (PART ONE, Article 3: ...), not running text
+        if stripped.startswith("**") and stripped.endswith("**"):
+            flush()
+            blocks.append(ParagraphBlock(text=_clean_inline(stripped)))
+            continue
+        paragraph.append(stripped)
+
+    flush()
+    return blocks
+
+
+def markdown_to_document(md_text: str, source: str) -> StructuredDocument:
+    """Same normalization as scraped HTML: pseudo-headings, articles out of layout tables."""
+    from src.scrapers.doc_scraper import StructuredScraper
+
+    scraper = StructuredScraper()
+    blocks = scraper.normalizer.normalize_blocks(markdown_to_blocks(md_text))
+    return StructuredDocument(source=source, document_title=scraper._extract_document_title(blocks), blocks=blocks)
+
+
+def convert_pdf_to_markdown(
+    pdf_path: str,
+    output_md: str,
+    workers: Optional[int] = None,
+    rag_docs_dir: Optional[str] = "rag_docs/",
+) -> StructuredDocument:
+    """
+    Convert PDF to RAG-optimized markdown using pymupdf4llm.
+    This library properly handles:
+    - Tables
+    - Text structure
+    - Headers
+    - Lists
+    """
+    from src.scrapers.doc_scraper import save_structured_document
+
+    print(f"Converting: {pdf_path}")
+
+    # Extract to markdown page by page - this handles tables and structure automatically
+    pages, converted = convert_pages(pdf_path, workers=workers)
+    md_text = clean_markdown("".join(pages))
+
+    # Write output (only when something changed)
+    output = Path(output_md)
+    if not output.exists() or output.read_text(encoding="utf-8") != md_text:
+        output.write_text(md_text, encoding="utf-8")
+
+    doc = markdown_to_document(md_text, source=Path(pdf_path).name)
+    if rag_docs_dir:
+        save_structured_document(doc, rag_docs_dir)
+
+    # Stats
+    lines = md_text.count('\n')
+    tables = md_text.count('|---|')
+
+    print(f"\n[OK] Converted to: {output_md}")
+    print(f"  - Pages: {len(pages)} ({converted} converted, {len(pages) - converted} from cache)")
+    print(f"  - Lines: {lines}")
+    print(f"  - Tables detected: {tables}")
+    print(f"  - Blocks: {len(doc.blocks)}")
+    return doc
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf_path", nargs="?", default="emu_rag_data/1-Statute-EmuStatute.pdf")
+    parser.add_argument("output_md", nargs="?", default="emu_rag_data/EMU_Statute.md")
+    parser.add_argument("--workers", type=int, help="Conversion processes (default INGEST_WORKERS, 0 = one per core)")
+    parser.add_argument("--rag-docs", default="rag_docs/", help="Where to write the StructuredDocument JSON ('' to skip)")
+    args = parser.parse_args()
+
+    convert_pdf_to_markdown(args.pdf_path, args.output_md, workers=args.workers, rag_docs_dir=args.rag_docs or None)